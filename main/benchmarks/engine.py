@@ -0,0 +1,250 @@
+import json
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from factories.data_read_in     import GameDocuments, read_in_game
+from controls.game_control      import GameState
+from controls.character_control import ScriptedController, CommandLineController
+from controls.translate         import get_input_translator
+from models.actors              import Actor, Location, Target, LocationDetail, ItemLimit
+from models.response            import StaticResponse
+from models.requirement         import ItemsHeldRequirement, ItemPlacementRequirement, WearingRequirement, HappenedRequirement
+from utils.generate_game        import generate_game
+from utils.relator              import FlatNameFinder
+from utils.room_graph           import RoomGraph
+from controls.completion        import complete_input
+from utils.constants            import *
+
+# Generated worlds the suite runs against besides aagame1, as (rooms, items per room)
+WORLD_SIZES = [(100, 2), (1000, 2), (4000, 3)]
+THRESHOLD   = 0.25 # flag a benchmark whose median moves more than this fraction against the baseline
+
+class Benchmark:
+    """One hot path timed against one loaded world. setup gets the world and returns the function to time
+    """
+    def __init__(self, name:str, setup:Callable[[str,str,tuple],Callable[[],Any]], *, repeat:int=200):
+        self.name   = name
+        self.setup  = setup
+        self.repeat = repeat
+
+    def run(self, game:str, data_folder:str, world:tuple) -> dict[str,float]:
+        function = self.setup(game, data_folder, world)
+        function() # warm up
+        times = list[float]()
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            'median_us'  : statistics.median(times)*1e6,
+            'min_us'     : min(times)*1e6,
+            'max_us'     : max(times)*1e6,
+            'peak_kb'    : peak/1024,
+            'repeat'     : self.repeat,
+        }
+
+def __player(world:tuple) -> tuple[Actor,Location]:
+    name_space, _, _, controllers, _ = world
+    player = [actor for actor, controller in controllers.characters.items() if isinstance(controller, CommandLineController)][0]
+    return player, player.get_top_parent()
+
+def __nearby_item(world:tuple) -> Target:
+    name_space = world[0]
+    player, room = __player(world)
+    items = [item for item in name_space.get_from_name(category='target') if item.is_in(room) and not item.is_in(player)]
+    return items[0] if len(items) > 0 else name_space.get_from_name(category='target')[0]
+
+def __read_in(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    return lambda: read_in_game(game, documents=GameDocuments(game, data_folder=data_folder))
+
+def __interpret(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    translator = get_input_translator()
+    player, _ = __player(world)
+    command = f"take {__nearby_item(world).get_name()}"
+    controller = ScriptedController([])
+    return lambda: translator.interpret(command, world[0], player, controller)
+
+def __get_from_input(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    tokens = __nearby_item(world).get_name().lower().split(" ")
+    return lambda: world[0].get_from_input(tokens)
+
+def __get_from_name_in_room(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    _, room = __player(world)
+    return lambda: world[0].get_from_name(category='target', location=room)
+
+def __flat_get_from_input(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    flat = FlatNameFinder()
+    flat.add_many(list(world[0].by_id.values()))
+    tokens = __nearby_item(world).get_name().lower().split(" ")
+    return lambda: flat.get_from_input(tokens)
+
+def __complete_input(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    player, _ = __player(world)
+    line = f"take {__nearby_item(world).get_name().lower()[:2]}"
+    return lambda: complete_input(line, world[0], player)
+
+def __get_description(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    player, room = __player(world)
+    return lambda: room.get_description_to(player)
+
+def __can_interact_with(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    player, room = __player(world)
+    item = __nearby_item(world)
+    return lambda: room.can_interact_with(player, item)
+
+def __action(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    name_space, _, every_turn, controllers, details = world
+    game_state = GameState(details, name_space, [], controllers, every_turn)
+    player, _ = __player(world)
+    look = name_space.get_from_name('look', 'action')[0]
+    return lambda: game_state.action(player, look, tuple()).as_string()
+
+def __add_child(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    # a full, limited container a few containers deep: checking the limit used to sum everything in it
+    container = outer = LocationDetail('outer')
+    for depth in range(5):
+        inner = LocationDetail(f"inner {depth}", item_limit=ItemLimit(weight_limit=1e9, size_limit=1e9))
+        container.add_child(inner)
+        container = inner
+    for i in range(1000):
+        container.add_child(Target(f"thing {i}", StaticResponse(""), None))
+    item = Target("extra", StaticResponse(""), None)
+    return lambda: (container.add_child(item), container.remove_child(item), outer.get_weight())
+
+def __is_visible_to(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    # a room of details that are only visible depending on what the player holds, wears and where things are, as a look sees it
+    player, room = __player(world)
+    items = [Target(f"key {i}", StaticResponse(""), None) for i in range(10)]
+    details = [LocationDetail(f"secret {i}", visible_requirements=[ItemsHeldRequirement({item: (False, None) for item in items}),
+                                                                   WearingRequirement({item: (False, None) for item in items}),
+                                                                   ItemPlacementRequirement({item: [(room, False, None)] for item in items})])
+               for i in range(20)]
+    return lambda: [detail.is_visible_to(player) for detail in details]
+
+def __check_every_turn(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    # requirements that have not happened yet, with nothing they read changing: they used to be checked for every character every turn
+    name_space, _, every_turn, controllers, details = world
+    items = [named for named in name_space.get_from_name() if isinstance(named, Target)][:10]
+    waiting = [HappenedRequirement(ItemPlacementRequirement({item: [(item, True, None)] for item in items}), id=f"waiting {i}") for i in range(100)]
+    game_state = GameState(details, name_space, [], controllers, every_turn + waiting)
+    return game_state.check_every_turn
+
+def __many_targets(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    # one command naming thirty things, nearby or not: each of them used to be looked for from the room
+    name_space, _, every_turn, controllers, details = world
+    player, room = __player(world)
+    nearby = [item for item in name_space.get_from_name(category='target') if item.is_in(room) and not item.is_in(player) and not isinstance(item, Actor)]
+    elsewhere = [item for item in name_space.get_from_name(category='target') if not item.is_in(room) and not isinstance(item, Actor)]
+    items = (nearby + elsewhere)[:30]
+    game_state = GameState(details, name_space, [], controllers, every_turn)
+    drop = name_space.get_from_name('drop', 'action')[0]
+    return lambda: game_state.action(player, drop, tuple(items))
+
+def __farthest(world:tuple) -> tuple[Actor,Location,Location]:
+    player, room = __player(world)
+    distances = RoomGraph().get_distances(player, room)
+    return player, room, max(distances.keys(), key=lambda end: distances[end])
+
+def __get_route(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    # the way to the farthest room, after the first search
+    player, room, farthest = __farthest(world)
+    graph = RoomGraph()
+    return lambda: graph.get_route(player, room, farthest)
+
+def __get_route_searched(game:str, data_folder:str, world:tuple) -> Callable[[],Any]:
+    # the same searched again, as it is once a lock opens or shuts
+    player, room, farthest = __farthest(world)
+    graph = RoomGraph()
+    return lambda: (graph.forget(player), graph.get_route(player, room, farthest))
+
+BENCHMARKS = [
+    Benchmark('read_in_game',               __read_in, repeat=3),
+    Benchmark('Translator.interpret',       __interpret),
+    Benchmark('NameFinder.get_from_input',  __get_from_input),
+    Benchmark('NameFinder.get_from_name (room)', __get_from_name_in_room),
+    Benchmark('FlatNameFinder.get_from_input', __flat_get_from_input),
+    Benchmark('complete_input',             __complete_input),
+    Benchmark('Location.get_description_to',__get_description),
+    Benchmark('Location.can_interact_with', __can_interact_with),
+    Benchmark('GameState.action',           __action),
+    Benchmark('HasLocation.add_child',      __add_child),
+    Benchmark('HasLocation.is_visible_to',  __is_visible_to),
+    Benchmark('GameState.check_every_turn', __check_every_turn),
+    Benchmark('RoomGraph.get_route',        __get_route),
+    Benchmark('RoomGraph.get_route (searched)', __get_route_searched, repeat=20),
+    Benchmark('GameState.action (many targets)', __many_targets),
+]
+
+def run_suite(*, sizes:list[tuple[int,int]]=None, include_aagame1:bool=True, benchmarks:list[Benchmark]=None) -> dict[str,Any]:
+    """Runs every benchmark against aagame1 and a generated world of each size.
+    Returns {'meta': ..., 'results': {world: {benchmark: stats}}}
+    """
+    sizes = WORLD_SIZES if sizes is None else sizes
+    benchmarks = BENCHMARKS if benchmarks is None else benchmarks
+    results = dict[str,dict[str,dict[str,float]]]()
+    with tempfile.TemporaryDirectory() as folder:
+        worlds = [('aagame1', DATA_FOLDER)] if include_aagame1 else []
+        for rooms, items in sizes:
+            game = f"generated_{rooms}x{items}"
+            generate_game(folder, game, rooms=rooms, items_per_room=items)
+            worlds.append((game, folder))
+        for game, data_folder in worlds:
+            results[game] = dict[str,dict[str,float]]()
+            world = read_in_game(game, documents=GameDocuments(game, data_folder=data_folder)) # none of the benchmarks change the world
+            for benchmark in benchmarks:
+                results[game][benchmark.name] = benchmark.run(game, data_folder, world)
+                if DEBUG_READIN: print(f"{game} {benchmark.name}: {results[game][benchmark.name]['median_us']:.1f}us")
+    return {
+        'meta'    : {'time': time.strftime("%Y-%m-%dT%H:%M:%S"), 'python': platform.python_version(), 'machine': platform.machine()},
+        'results' : results
+    }
+
+def compare(results:dict[str,Any], baseline:dict[str,Any], *, threshold:float=THRESHOLD) -> list[tuple[str,str,float]]:
+    """Finds every benchmark whose median moved more than threshold (as a fraction) from the baseline, faster or slower.
+    Returns (world, benchmark, change) for each, change is new/old - 1
+    """
+    flagged = list[tuple[str,str,float]]()
+    for game, benchmarks in results['results'].items():
+        for name, stats in benchmarks.items():
+            old = baseline['results'].get(game, {}).get(name, None)
+            if old is None or old['median_us'] == 0:
+                continue
+            change = stats['median_us']/old['median_us'] - 1
+            if abs(change) > threshold:
+                flagged.append((game, name, change))
+    return flagged
+
+def save_results(results:dict[str,Any], file:str) -> None:
+    with open(file, 'w') as out:
+        json.dump(results, out, indent=4)
+
+def load_results(file:str) -> dict[str,Any]:
+    with open(file) as results:
+        return json.load(results)
+
+def run_benchmarks(output:str=None, baseline:str=None, *, threshold:float=THRESHOLD) -> list[tuple[str,str,float]]:
+    """Runs the suite, prints it, saves it to output (if given) and flags changes against baseline (if given)
+    """
+    results = run_suite()
+    for game, benchmarks in results['results'].items():
+        print(game)
+        for name, stats in benchmarks.items():
+            print(f"    {name:<28} median {stats['median_us']:>12.1f}us  min {stats['min_us']:>12.1f}us  peak {stats['peak_kb']:>10.1f}kB")
+    if output is not None:
+        save_results(results, output)
+    flagged = list[tuple[str,str,float]]()
+    if baseline is not None:
+        flagged = compare(results, load_results(baseline), threshold=threshold)
+        for game, name, change in flagged:
+            print(f"{'SLOWER' if change > 0 else 'FASTER'} {game} {name}: {change*100:+.0f}%")
+        if len(flagged) == 0:
+            print(f"No benchmark moved more than {threshold*100:.0f}% against {baseline}")
+    return flagged
@@ -0,0 +1,54 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from factories.data_read_in import GameDocuments, GAME_CATEGORIES
+from utils.constants        import *
+
+def write_synthetic_pack(folder:str, game:str, copies:int, *, template:str='aagame1') -> int:
+    """Writes a pack of `copies` renamed copies of every item, character and room json of template into folder/game.
+    Returns the number of files written
+    """
+    source = f"{DATA_FOLDER}/{template}"
+    shutil.copytree(source, f"{folder}/{game}")
+    written = 0
+    for category in ['items', 'characters', 'rooms']:
+        for file in os.listdir(f"{source}/{category}"):
+            if not file.endswith('.json'):
+                continue
+            with open(f"{source}/{category}/{file}") as contents:
+                document = json.load(contents)
+            name = document.get('name', '')
+            for copy in range(copies):
+                renamed = dict(document)
+                renamed['name'] = f"{name} {copy}"
+                with open(f"{folder}/{game}/{category}/{copy}_{file}", 'w') as out:
+                    json.dump(renamed, out, indent=4)
+                written += 1
+    return written
+
+def time_ingestion(folder:str, game:str, *, workers:int=1, processes:bool=False) -> tuple[float,GameDocuments]:
+    documents = GameDocuments(game, data_folder=folder, workers=workers, processes=processes)
+    start = time.perf_counter()
+    documents.prefetch(GAME_CATEGORIES)
+    return time.perf_counter() - start, documents
+
+def compare_ingestion(copies:int=100, workers:int=None) -> dict[str,float]:
+    """Times parsing a synthetic pack serially, on a thread pool and on a process pool
+    and checks that every mode gives exactly the same documents.
+    """
+    workers = os.cpu_count() if workers is None else workers
+    with tempfile.TemporaryDirectory() as folder:
+        files = write_synthetic_pack(folder, 'synthetic', copies)
+        serial, expected = time_ingestion(folder, 'synthetic')
+        threads, threaded = time_ingestion(folder, 'synthetic', workers=workers)
+        processes, processed = time_ingestion(folder, 'synthetic', workers=workers, processes=True)
+    assert threaded.documents == expected.documents
+    assert processed.documents == expected.documents
+    print(f"{files} synthetic files, {expected.stats['construct']['bytes']} bytes, {workers} workers")
+    print(f"serial:    {serial:.3f}s")
+    print(f"threads:   {threads:.3f}s ({serial/threads:.2f}x)")
+    print(f"processes: {processes:.3f}s ({serial/processes:.2f}x)")
+    return {'files': files, 'serial': serial, 'threads': threads, 'processes': processes}
@@ -0,0 +1,60 @@
+import random
+import statistics
+import string
+import tempfile
+import time
+import tracemalloc
+
+from factories.data_read_in import GameDocuments, read_in_game
+from utils.generate_game    import generate_game, GameSettings
+from utils.relator          import WordTree
+from utils.fuzzy            import FuzzyIndex
+
+def __allocated(build) -> tuple[object,int]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return built, size
+
+def compare_freeze(rooms:int=2000, items_per_room:int=5) -> dict[str,int]:
+    """Measures the memory the name space's WordTrees take before and after freezing, on a generated world with many shared aliases.
+    """
+    settings = GameSettings(rooms=rooms, items_per_room=items_per_room, alias_collision=0.5, documents_per_file=200)
+    with tempfile.TemporaryDirectory() as folder:
+        generate_game(folder, 'aliases', settings)
+        name_space = read_in_game('aliases', documents=GameDocuments('aliases', data_folder=folder))[0]
+    aliases = [(category, name.lower().split(" "), named.get_id()) for named in name_space.by_id.values()
+               for category in [name_space._category(named)] for name in named.get_aliases()]
+
+    def build() -> dict[str,WordTree[str]]:
+        trees = dict[str,WordTree[str]]()
+        for category, words, id in aliases:
+            trees.setdefault(category, WordTree[str]()).add(words, id)
+        return trees
+    trees, tree_bytes = __allocated(build)
+    _, frozen_bytes = __allocated(lambda: {category: tree.freeze() for category, tree in trees.items()})
+    print(f"{len(aliases)} aliases in {len(trees)} categories")
+    print(f"WordTree:       {tree_bytes/1024:10.1f}kB")
+    print(f"FrozenWordTree: {frozen_bytes/1024:10.1f}kB ({1 - frozen_bytes/tree_bytes:.0%} saved)")
+    return {'aliases': len(aliases), 'tree_bytes': tree_bytes, 'frozen_bytes': frozen_bytes}
+
+def time_fuzzy(aliases:int=100000, lookups:int=1000, *, seed:int=0) -> dict[str,float]:
+    """Times correcting single typos against a FuzzyIndex of random alias words"""
+    rng = random.Random(seed)
+    words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) for _ in range(aliases)]
+    start = time.perf_counter()
+    index = FuzzyIndex(words)
+    built = time.perf_counter() - start
+    times = list[float]()
+    for word in rng.sample(words, lookups):
+        position = rng.randrange(len(word))
+        typo = word[:position] + rng.choice(string.ascii_lowercase) + word[position+1:]
+        start = time.perf_counter()
+        index.correct(typo)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    print(f"{aliases} alias words indexed in {built:.2f}s")
+    print(f"correct: median {statistics.median(times)*1e6:.1f}us  p99 {times[int(len(times)*0.99)]*1e6:.1f}us")
+    return {'build_s': built, 'median_us': statistics.median(times)*1e6, 'p99_us': times[int(len(times)*0.99)]*1e6}
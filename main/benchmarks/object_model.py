@@ -0,0 +1,98 @@
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from factories.data_read_in import GameDocuments, read_in_game
+from models.named           import Named
+from models.actors          import HasLocation
+from utils.relator          import NameFinder, ChildCollection
+from utils.generate_game    import generate_game, GameSettings
+
+def __object_bytes(named:Named) -> int:
+    # the object itself plus its attribute dict, if it has one; what the attributes point to is the same either way
+    size = sys.getsizeof(named)
+    if hasattr(named, '__dict__'):
+        size += sys.getsizeof(named.__dict__)
+    return size
+
+def __allocated(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del built
+    return size
+
+def __read_in(rooms:int, items_per_room:int) -> tuple:
+    settings = GameSettings(rooms=rooms, items_per_room=items_per_room, documents_per_file=200)
+    with tempfile.TemporaryDirectory() as folder:
+        generate_game(folder, 'objects', settings)
+        return read_in_game('objects', documents=GameDocuments('objects', data_folder=folder), fuzzy=False)
+
+def compare_children(rooms:int=2000, items_per_room:int=5) -> dict[str,float]:
+    """Measures the memory the children of every container of a generated world take held in a NameFinder each
+    (as they used to be) and in a ChildCollection each.
+    """
+    name_space = __read_in(rooms, items_per_room)[0]
+    containers = [named for named in name_space.by_id.values() if isinstance(named, HasLocation)]
+    children = [list(container.children.get_from_name()) for container in containers]
+
+    def in_name_finders() -> list[NameFinder]:
+        finders = list[NameFinder]()
+        for held in children:
+            finders.append(NameFinder['HasLocation']())
+            finders[-1].add_many(held)
+        return finders
+
+    def in_collections() -> list[ChildCollection]:
+        collections = list[ChildCollection]()
+        for held in children:
+            collections.append(ChildCollection['HasLocation']())
+            collections[-1].add_many(held)
+        return collections
+    finder_bytes = __allocated(in_name_finders)
+    collection_bytes = __allocated(in_collections)
+    print(f"{len(containers)} containers holding {sum([len(held) for held in children])} children")
+    print(f"NameFinder:      {finder_bytes/1024:10.1f}kB ({finder_bytes/len(containers):.0f}B each)")
+    print(f"ChildCollection: {collection_bytes/1024:10.1f}kB ({collection_bytes/len(containers):.0f}B each, {1 - collection_bytes/finder_bytes:.0%} saved)")
+    return {'containers': len(containers), 'finder_bytes': finder_bytes, 'collection_bytes': collection_bytes}
+
+def compare_object_model(rooms:int=2000, items_per_room:int=5, repeats:int=20) -> dict[str,float]:
+    """Measures what the Named objects of a generated world cost: the memory reading it in takes, the size of the objects
+    themselves and how long using them as dict and set keys takes. Run it before and after changing Named to compare.
+    """
+    settings = GameSettings(rooms=rooms, items_per_room=items_per_room, documents_per_file=200)
+    with tempfile.TemporaryDirectory() as folder:
+        generate_game(folder, 'objects', settings)
+        tracemalloc.start()
+        game = read_in_game('objects', documents=GameDocuments('objects', data_folder=folder), fuzzy=False)
+        read_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    named = [one for one in game[0].by_id.values() if isinstance(one, Named)]
+    object_bytes = sum([__object_bytes(one) for one in named])
+
+    keys = {one: i for i, one in enumerate(named)}
+    members = set(named)
+    # equal but distinct objects, so lookups have to compare ids and not just identities
+    copies = [Named(one.name, one.aliases, one.id) for one in named]
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for one in named:
+            keys[one]
+    same_ns = (time.perf_counter() - start) / (repeats * len(named)) * 1e9
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for copy in copies:
+            keys[copy]
+            copy in members
+    equal_ns = (time.perf_counter() - start) / (repeats * len(copies) * 2) * 1e9
+
+    print(f"{len(named)} named objects")
+    print(f"read in:        {read_bytes/1024/1024:10.1f}MB")
+    print(f"objects:        {object_bytes/1024:10.1f}kB ({object_bytes/len(named):.0f}B each)")
+    print(f"same key:       {same_ns:10.1f}ns per lookup")
+    print(f"equal key:      {equal_ns:10.1f}ns per lookup")
+    return {'named': len(named), 'read_bytes': read_bytes, 'object_bytes': object_bytes, 'same_ns': same_ns, 'equal_ns': equal_ns}
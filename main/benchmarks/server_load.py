@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from controls.game_server  import GameServer
+from controls.batch_runner import percentile
+
+PROMPT = b"> "
+
+async def __read_response(reader:asyncio.StreamReader) -> bytes:
+    return await reader.readuntil(PROMPT)
+
+async def run_client(commands:list[str], *, host:str='127.0.0.1', port:int=8765, path:str=None, think_time:float=0.0) -> list[float]:
+    """Plays commands over one connection, waiting for the prompt after each.
+    Returns the latency of every command in seconds
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    latencies = list[float]()
+    try:
+        await __read_response(reader)
+        for command in commands:
+            if think_time > 0:
+                await asyncio.sleep(think_time)
+            start = time.perf_counter()
+            writer.write(f"{command}\n".encode())
+            await writer.drain()
+            await __read_response(reader)
+            latencies.append(time.perf_counter() - start)
+        writer.write(b"quit\n")
+        await writer.drain()
+    finally:
+        writer.close()
+    return latencies
+
+async def load_level(sessions:int, commands:list[str], *, host:str='127.0.0.1', port:int=8765, path:str=None, think_time:float=0.0) -> dict[str,float]:
+    """Runs `sessions` clients at once and summarises their command latencies
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(*[run_client(commands, host=host, port=port, path=path, think_time=think_time) for _ in range(sessions)], return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    latencies = [latency for result in results if not isinstance(result, BaseException) for latency in result]
+    return {
+        'sessions'     : sessions,
+        'errors'       : len([result for result in results if isinstance(result, BaseException)]),
+        'seconds'      : elapsed,
+        'commands/sec' : len(latencies)/elapsed if elapsed > 0 else 0.0,
+        'p50_ms'       : percentile(latencies, 50)*1000,
+        'p99_ms'       : percentile(latencies, 99)*1000,
+    }
+
+async def measure_capacity(game:str, commands:list[str], *, levels:list[int]=None, target_p99_ms:float=250, path:str=None, think_time:float=0.0) -> list[dict[str,float]]:
+    """Starts a GameServer in this process and runs increasing numbers of concurrent sessions against it
+    until a level has errors or its p99 command latency goes over target_p99_ms.
+    Returns the summary of every level run, the capacity is the last level that met the target
+    """
+    levels = [1, 10, 25, 50, 100, 200] if levels is None else levels
+    server = GameServer(game)
+    listener = await server.start(port=0, path=path)
+    port = listener.sockets[0].getsockname()[1] if path is None else None
+    results = list[dict[str,float]]()
+    try:
+        for sessions in levels:
+            result = await load_level(sessions, commands, port=port, path=path, think_time=think_time)
+            results.append(result)
+            print(" ".join([f"{key}: {value:.1f}" if isinstance(value, float) else f"{key}: {value}" for key, value in result.items()]))
+            if result['errors'] > 0 or result['p99_ms'] > target_p99_ms:
+                break
+    finally:
+        listener.close()
+        await listener.wait_closed()
+    capacity = max([result['sessions'] for result in results if result['errors'] == 0 and result['p99_ms'] <= target_p99_ms], default=0)
+    print(f"Capacity: {capacity} concurrent sessions with p99 <= {target_p99_ms}ms")
+    return results
+
+def run_load(game:str, *, levels:list[int]=None, target_p99_ms:float=250) -> list[dict[str,float]]:
+    return asyncio.run(measure_capacity(game, ['look', 'south', 'north', 'inventory', 'wait'], levels=levels, target_p99_ms=target_p99_ms))
@@ -0,0 +1,98 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from controls.game_control      import GameState
+from controls.character_control import CommandLineController, ScriptedController
+from factories.snapshot         import read_in_game_snapshot
+from factories.fork             import GameTemplate
+
+_template:GameTemplate = None # the template each batch worker process forks its sessions from
+# Transcripts get their own suffix so one written next to its script never overwrites it or is played as a script
+TRANSCRIPT_SUFFIX = ".transcript.txt"
+
+def read_script(file:str) -> list[str]:
+    """Reads a command script: one command per line, blank lines and lines starting with # are skipped
+    """
+    with open(file) as script:
+        lines = [line.strip() for line in script.readlines()]
+    return [line for line in lines if len(line) > 0 and not line.startswith('#')]
+
+def percentile(values:list[float], percent:float) -> float:
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered)-1, max(0, round(percent/100*len(ordered)+0.5)-1))
+    return ordered[index]
+
+def run_session(game:str, script_file:str, output_folder:str=None, *, template:GameTemplate=None) -> dict[str,object]:
+    """Plays one scripted session headless. Every user controlled Character plays the same script, NPCs play as usual.
+    The session is forked from template when given, otherwise the game is loaded from its snapshot.
+    Writes the transcript to output_folder (if given) as <script name>.transcript.txt and returns the number of turns and each turn's latency in seconds
+    """
+    start = time.perf_counter()
+    name_space, _, every_turn, controllers, details = read_in_game_snapshot(game) if template is None else template.fork()
+    commands = read_script(script_file)
+    scripted = list[ScriptedController]()
+    for character, controller in list(controllers.characters.items()):
+        if isinstance(controller, CommandLineController):
+            scripted.append(ScriptedController(commands))
+            controllers.create_character(character, scripted[-1])
+    game_state = GameState(details, name_space, [], controllers, every_turn)
+    game_state.start()
+    load_time = time.perf_counter() - start
+    latencies = list[float]()
+    while len(scripted) > 0:
+        controller = controllers.get_controller(game_state.whose_turn())
+        if isinstance(controller, ScriptedController) and controller.finished():
+            break
+        turn_start = time.perf_counter()
+        game_state.take_turn()
+        latencies.append(time.perf_counter() - turn_start)
+    if output_folder is not None:
+        name = os.path.splitext(os.path.basename(script_file))[0]
+        with open(f"{output_folder}/{name}{TRANSCRIPT_SUFFIX}", 'w') as transcript:
+            for i, controller in enumerate(scripted):
+                if i > 0:
+                    transcript.write("\n\n")
+                transcript.write("\n".join(controller.transcript))
+    return {'script': script_file, 'turns': len(latencies), 'latencies': latencies, 'load_time': load_time}
+
+def __start_worker(game:str) -> None:
+    global _template
+    _template = GameTemplate(read_in_game_snapshot(game))
+
+def __run_session(arguments:tuple[str,str,str]) -> dict[str,object]:
+    return run_session(*arguments, template=_template)
+
+def run_batch(game:str, scripts_folder:str, output_folder:str, *, workers:int=1) -> dict[str,float]:
+    """Plays every *.txt command script (but not the transcripts) in scripts_folder as its own session, on a process pool when workers > 1.
+    Writes one transcript per script to output_folder and returns (and prints) sessions/sec, turns/sec and turn latency percentiles
+    """
+    scripts = sorted([script for script in glob.glob(f"{scripts_folder}/*.txt") if not script.endswith(TRANSCRIPT_SUFFIX)])
+    os.makedirs(output_folder, exist_ok=True)
+    template = GameTemplate(read_in_game_snapshot(game)) # also builds the snapshot once up front instead of in every worker
+    start = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=__start_worker, initargs=(game,)) as executor:
+            results = list(executor.map(__run_session, [(game, script, output_folder) for script in scripts]))
+    else:
+        results = [run_session(game, script, output_folder, template=template) for script in scripts]
+    elapsed = time.perf_counter() - start
+    latencies = [latency for result in results for latency in result['latencies']]
+    summary = {
+        'sessions'     : len(results),
+        'turns'        : len(latencies),
+        'seconds'      : elapsed,
+        'sessions/sec' : len(results)/elapsed if elapsed > 0 else 0.0,
+        'turns/sec'    : len(latencies)/elapsed if elapsed > 0 else 0.0,
+        'p50_ms'       : percentile(latencies, 50)*1000,
+        'p90_ms'       : percentile(latencies, 90)*1000,
+        'p99_ms'       : percentile(latencies, 99)*1000,
+        'max_ms'       : max(latencies, default=0.0)*1000,
+        'load_ms'      : sum([result['load_time'] for result in results])/max(1, len(results))*1000
+    }
+    for key, value in summary.items():
+        print(f"{key:>12}: {value:.3f}" if isinstance(value, float) else f"{key:>12}: {value}")
+    return summary
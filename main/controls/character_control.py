@@ -1,9 +1,23 @@
 from dataclasses import dataclass
+from typing import Callable
+
+try:
+    import readline
+except ImportError: # not on every platform, input still works without tab completion
+    readline = None
 
 from models.response import ResponseString, Response
 import views.string_views as views
 from models.named import Named
 
+_readline_ready = False                   # whether readline has been set up for tab completion
+_reading:'CommandLineController' = None   # the controller whose user is typing, tab completes for them
+
+def _complete_reading(text:str, state:int) -> str|None:
+    if _reading is None or _reading.completer is None:
+        return None
+    return _reading.complete(text, state)
+
 #@dataclass(frozen=True)
 class Feedback:
     """This is a dataclass.
@@ -100,6 +114,36 @@ class CommandLineController(CharacterController):
         self.moves = 0
         self.turns = 0
         self.score = 0
+        self.completer:Callable[[str],list[str]] = None
+        self.completions = list[str]()
+
+    def set_completer(self, completer:Callable[[str],list[str]]) -> None:
+        """Turns on tab completion of the user's input
+
+        :param completer: Gets the input typed so far and returns the words its last word can be completed to
+        :type completer: Callable[[str],list[str]]
+        """
+        global _readline_ready
+        self.completer = completer
+        if readline is not None and not _readline_ready: # readline is set up once, it completes for whoever is reading
+            readline.set_completer_delims(" ")
+            readline.set_completer(_complete_reading)
+            readline.parse_and_bind("tab: complete")
+            _readline_ready = True
+
+    def complete(self, text:str, state:int) -> str|None:
+        """readline completer, returns the state-th completion of the word being typed
+
+        :param text: The word being typed
+        :type text: str
+        :param state: Which completion to return
+        :type state: int
+        :return: The completion, or None when there are no more
+        :rtype: str|None
+        """
+        if state == 0:
+            self.completions = self.completer(readline.get_line_buffer()[:readline.get_endidx()])
+        return self.completions[state] if state < len(self.completions) else None
 
     def make_move(self) -> str:
         """Prompts the user to enter their move into the command line and returns the user response
@@ -107,6 +151,8 @@ class CommandLineController(CharacterController):
         :return: The user's command line input
         :rtype: str
         """
+        global _reading
+        _reading = self
         return input(views.input_prompt(self.moves,self.turns,self.score))
     
     def decide(self, options:list[tuple[list[Named],list[str]]]) -> int:
@@ -153,3 +199,67 @@ class CommandLineController(CharacterController):
         self.turns += feedback.turns
         self.score += feedback.score
         print(feedback.as_string())
+
+class ScriptedController(CharacterController):
+    """Inherits from CharacterController.
+    Controller that plays a fixed list of commands without any user, for running sessions headless.
+    Everything the Character is told is recorded in a transcript instead of printed.
+    """
+
+    def __init__(self, commands:list[str]):
+        """Creates a ScriptedController
+
+        :param commands: The commands to make, in order
+        :type commands: list[str]
+        """
+        self.commands = commands
+        self.next_command = 0
+        self.transcript = list[str]()
+        self.moves = 0
+        self.turns = 0
+        self.score = 0
+
+    def finished(self) -> bool:
+        """Whether every command has been made
+
+        :return: True once there are no commands left
+        :rtype: bool
+        """
+        return self.next_command >= len(self.commands)
+
+    def make_move(self) -> str:
+        """Returns the next command in the script
+
+        :return: The next command or None if the script is finished
+        :rtype: str
+        """
+        if self.finished():
+            return None
+        command = self.commands[self.next_command]
+        self.next_command += 1
+        self.transcript.append(f"{views.input_prompt(self.moves,self.turns,self.score)}{command}")
+        return command
+
+    def decide(self, options:list[tuple[list[Named],list[str]]]) -> int:
+        """Always picks the first interpretation of an ambiguous move
+
+        :param options: The possible interpretations. Each tuple matches the ambiguous text to a possible interpretation
+        :type options: list[tuple[list[Named],list[str]]]
+        :return: 0
+        :rtype: int
+        """
+        self.transcript.append(f"(ambiguous, chose {" ".join([obj.get_id() for obj in options[0][0]])})")
+        return 0
+
+    def feedback(self, feedback:Feedback) -> None:
+        """Reads the moves, turns, and score from the Feedback and adds the rest to the transcript.
+
+        :param feedback: Feedback from a recently attempted Action.
+        :type feedback: Feedback
+        """
+        self.moves += feedback.moves
+        self.turns += feedback.turns
+        self.score += feedback.score
+        text = feedback.as_string()
+        if text is not None:
+            self.transcript.append(text)
@@ -0,0 +1,27 @@
+from models.actors  import Actor, HasLocation
+from utils.relator  import NameFinder
+
+# How many words back an alias being completed can start
+LONGEST_ALIAS = 4
+# Words the translator drops, they are skipped so "take the ru" completes like "take ru"
+SKIPPED = ['a', 'an', 'the', 'i']
+
+def complete_input(line:str, name_space:NameFinder, character:Actor) -> list[str]:
+    """The words the last, partly typed, word of line can be completed to.
+    The first word can be an action or a direction, later words anything in character's room that character can see.
+    Actions and directions come from the name indexes, everything else from the room, so huge worlds stay responsive.
+    Ranked: words continuing a longer alias come first, then what is in the room before directions,
+    each in the order NameFinder.complete ranks them.
+    """
+    words = line.lower().split(" ")
+    tokens = [word for word in words[:-1] if word not in SKIPPED] + words[-1:]
+    room = character.get_top_parent()
+    completions = list[str]()
+    for start in range(max(0, len(tokens)-LONGEST_ALIAS), len(tokens)):
+        text = " ".join(tokens[start:])
+        if start == 0:
+            completions.extend(name_space.complete(text, ['action', 'direction']))
+        else:
+            completions.extend(name_space.complete(text, HasLocation, location=room, allowed=lambda named: named.is_visible_to(character)))
+            completions.extend(name_space.complete(text, 'direction'))
+    return list(dict.fromkeys(completions))
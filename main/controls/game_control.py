@@ -1,14 +1,19 @@
+from functools import partial
 from typing import Any, Optional
 
-from models.actors              import Target, Actor, Location, LocationDetail
+from models.actors              import Target, Actor, Location, LocationDetail, HasLocation
 from models.named               import Action, Direction
 from factories.factories        import CharacterControlFactory
 from models.response            import ResponseString, Response, CombinationResponse, StaticResponse, ContentsResponse, BackupResponse
 from controls.character_control import CommandLineController, Feedback, CharacterController
 from controls.translate         import get_input_translator
+from controls.completion        import complete_input
 from utils.constants            import *
 from utils.relator              import NameFinder
-from models.requirement         import ActionRequirement
+from models.requirement         import ActionRequirement, HappenedRequirement
+from utils.change_log           import ChangeLog
+from utils.requirement_watcher  import RequirementWatcher
+from utils.interaction_scope    import InteractionScopes
 
 class GameAction:
     """This is an abstract class and should not be instantiated.
@@ -16,6 +21,8 @@ class GameAction:
     Verifies the Action inputs and determines the results of the Action
     """
 
+    scopes:InteractionScopes = None # set by the GameState, what each character can interact with
+
     def __init__(self, action:Action):
         """Creates a GameAction
 
@@ -78,6 +85,22 @@ class GameAction:
                 return True, response
         return False, BackupResponse([response, r2, StaticResponse("You are unable to perform this action.")])
 
+    def __can_interact__(self, character:Actor, target:HasLocation) -> bool:
+        """Whether character can reach target from where they are, from their InteractionScope when there is one.
+
+        :param character: The Character attempting to perform the GameAction
+        :type character: Actor
+        :param target: What character is attempting to use
+        :type target: HasLocation
+        :return: Whether character can interact with target
+        :rtype: bool
+        """
+        if self.scopes is not None:
+            return self.scopes.of(character).can_interact_with(target)
+        room = character.get_top_parent()
+        assert isinstance(room, Location)
+        return room.can_interact_with(character, target)
+
     def __verify_target__(self, character:Actor, target:Target) -> tuple[bool,ResponseString]:
         """Verifies that target can have the GameAction performed on it.
 
@@ -88,9 +111,7 @@ class GameAction:
         :return: A bool that describes whether target can have the GameAction performed on it and the target's response
         :rtype: tuple[bool,str]
         """
-        room = character.get_top_parent()
-        assert isinstance(room, Location)
-        if room.can_interact_with(character, target):
+        if self.__can_interact__(character, target):
             response = target.get_target_response(self.action)
             if self.action in target.get_actions_as_target():
                 return True, response
@@ -107,9 +128,7 @@ class GameAction:
         :return: A bool that describes whether tool can be used by character to perform the GameAction and the tool's response
         :rtype: tuple[bool,str]
         """
-        room = character.get_top_parent()
-        assert isinstance(room, Location)
-        if room.can_interact_with(character, tool):
+        if self.__can_interact__(character, tool):
             response = tool.get_tool_response(self.action)
             if self.action in tool.get_actions_as_target():
                 return True, response
@@ -302,9 +321,7 @@ class DropAction(GameAction):
                 can_be_dropped, target_response = self.__verify_target__(character, target)
                 response.append(target_response)
                 if can_be_dropped:
-                    room = character.get_top_parent()
-                    assert isinstance(room, Location)
-                    if placement is None or room.can_interact_with(character, placement):
+                    if placement is None or self.__can_interact__(character, placement):
                         dropped, r = character.remove_from_inventory(target, placement, inventory=self.inventory)
                         response.append(r)
                         if dropped:
@@ -404,6 +421,18 @@ class GameState:
             controllers.create_character(character, CommandLineController())
             character.set_location(start_room, origin=True)
             i += 1
+        for character, controller in controllers.characters.items():
+            if isinstance(controller, CommandLineController):
+                controller.set_completer(partial(complete_input, name_space=self.name_space, character=character))
+        self.change_log = ChangeLog()
+        self.change_log.attach([named for named in self.name_space.get_from_name() if isinstance(named, HasLocation)] + extra_characters + \
+                               [requirement for requirement in self.every_turn_requirement if isinstance(requirement, HappenedRequirement)])
+        self.requirement_watcher = RequirementWatcher(self.every_turn_requirement, self.character_order)
+        self.change_log.watchers.append(self.requirement_watcher.changed)
+        self.scopes = InteractionScopes()
+        self.change_log.watchers.append(self.scopes.changed)
+        for game_action in list(self.action_dict.values()) + [self.default_action]:
+            game_action.scopes = self.scopes
         
     ##########################################################################
     # Getters
@@ -436,7 +465,7 @@ class GameState:
         :return: A GameAction and its inputs or an error message
         :rtype: tuple[Action,list]
         """
-        return self.translator.interpret(user_input, self.name_space, character, controller)
+        return self.translator.interpret(user_input, self.name_space, character, controller, scope=self.scopes.of(character))
     
     ###########################################################################
     # Main driver
@@ -446,25 +475,53 @@ class GameState:
         Prompts Characters for input on their turn and performs the GameActions until the game is over
         """
         print(f"{self.game_details["welcome_text"]}\n")
-        # Initial look for all characters
+        self.start()
+        while not self.game_over():
+            self.take_turn()
+
+    def start(self) -> None:
+        """Gives every Character their initial look at the room they start in
+        """
         for character in self.character_order:
             controller = self.controllers.get_controller(character)
             feedback = self.action(character, self.name_space.get_from_name('look','action')[0], tuple())
             controller.feedback(feedback)
-        while not self.game_over():
-            # Check/update requirements that need to be checked every turn
-            for character in self.character_order:
-                for requirement in self.every_turn_requirement:
-                    requirement._check_every_turn(character)
-            # do the turn
-            character = self.whose_turn()
-            controller = self.controllers.get_controller(character)
-            user_input = controller.make_move()
-            action, inputs = self.translate(user_input, character, controller)
-            if DEBUG_INPUT:
-                print(f"{character}: {action} {inputs}")
-            feedback = self.action(character, action, inputs)
-            controller.feedback(feedback)
+
+    def check_every_turn(self) -> None:
+        """Check/update requirements that need to be checked every turn, only the ones something they read has changed for
+        """
+        self.requirement_watcher.check()
+
+    def respond(self, character:Actor, controller:CharacterController, user_input:str) -> Feedback:
+        """Translates and performs one input from character
+
+        :param character: The Character making the input
+        :type character: Actor
+        :param controller: The controller for character, for clarifications
+        :type controller: CharacterController
+        :param user_input: The input to perform
+        :type user_input: str
+        :return: The result of performing the input
+        :rtype: Feedback
+        """
+        action, inputs = self.translate(user_input, character, controller)
+        if DEBUG_INPUT:
+            print(f"{character}: {action} {inputs}")
+        return self.action(character, action, inputs)
+
+    def take_turn(self) -> Feedback:
+        """Asks the Character whose turn it is for their move, performs it and gives them the Feedback
+
+        :return: The result of the move
+        :rtype: Feedback
+        """
+        self.check_every_turn()
+        character = self.whose_turn()
+        controller = self.controllers.get_controller(character)
+        user_input = controller.make_move()
+        feedback = self.respond(character, controller, user_input)
+        controller.feedback(feedback)
+        return feedback
 
     ###########################################################################
     # Actions
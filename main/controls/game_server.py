@@ -0,0 +1,236 @@
+import asyncio
+import logging
+
+from models.named               import Named
+from models.actors              import Actor
+from controls.game_control      import GameState
+from controls.character_control import CharacterController, CommandLineController, NPCController, Feedback
+from factories.snapshot         import read_in_game_snapshot
+from factories.fork             import GameTemplate
+import views.string_views as views
+
+logger = logging.getLogger(__name__)
+
+class DecisionNeeded(Exception):
+    """Raised by an AsyncController when the Translator needs the player to disambiguate a move.
+    The move is translated again once the player has answered.
+    """
+    def __init__(self, options:list[tuple[list[Named],list[str]]]):
+        super().__init__()
+        self.options = options
+
+class AsyncController(CharacterController):
+    """Inherits from CharacterController.
+    Controller for a player connected to a GameServer over a line protocol.
+    Moves are read without blocking the event loop, Feedback is buffered on the connection and flushed by the session.
+    """
+
+    def __init__(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter, *, idle_timeout:float=None, write_timeout:float=None):
+        """Creates an AsyncController
+
+        :param reader: The connection to read moves from
+        :type reader: asyncio.StreamReader
+        :param writer: The connection to write Feedback to
+        :type writer: asyncio.StreamWriter
+        :param idle_timeout: Seconds to wait for a move before closing the connection, None to wait forever
+        :type idle_timeout: float
+        :param write_timeout: Seconds a client may take to accept output before it is disconnected, None to wait forever
+        :type write_timeout: float
+        """
+        self.reader = reader
+        self.writer = writer
+        self.idle_timeout = idle_timeout
+        self.write_timeout = write_timeout
+        self.answers = list[int]()
+        self.asked = 0
+        self.moves = 0
+        self.turns = 0
+        self.score = 0
+
+    def write(self, text:str) -> None:
+        self.writer.write(text.encode())
+
+    async def flush(self) -> None:
+        await asyncio.wait_for(self.writer.drain(), self.write_timeout)
+
+    async def read_line(self) -> str|None:
+        """Sends the prompt and waits for the next line
+
+        :return: The line without its newline or None if the connection closed
+        :rtype: str|None
+        """
+        await self.flush()
+        line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+        if len(line) == 0:
+            return None
+        return line.decode(errors='replace').strip()
+
+    async def read_move(self) -> str|None:
+        self.write(views.input_prompt(self.moves,self.turns,self.score))
+        return await self.read_line()
+
+    async def ask(self, options:list[tuple[list[Named],list[str]]]) -> int|None:
+        """Asks the player which interpretation of an ambiguous move they meant until they give a valid answer
+
+        :return: The index of the chosen interpretation or None if the connection closed
+        :rtype: int|None
+        """
+        texts = []
+        for _,words in options:
+            text = " ".join(words)
+            if text not in texts:
+                texts.append(text)
+        self.write(f"By \"{'"/"'.join(texts)}\" did you mean:\n")
+        for i, (objects,_) in enumerate(options):
+            self.write(f"[{i}] {" ".join([f"{obj.get_name()} ({obj.get_id()})" for obj in objects])}\n")
+        while True:
+            self.write("> ")
+            response = await self.read_line()
+            if response is None:
+                return None
+            try:
+                index = int(response)
+                if 0 <= index and index < len(options):
+                    return index
+            except ValueError:
+                for i, (objects,_) in enumerate(options):
+                    if any([response.lower() == obj.get_id() for obj in objects]):
+                        return i
+            self.write("Invalid response, please either give the index or id.\n")
+
+    def make_move(self) -> str:
+        raise RuntimeError("AsyncController moves are read by GameSession.read_move")
+
+    def decide(self, options:list[tuple[list[Named],list[str]]]) -> int:
+        """Replays the answers the player has already given for the current move, asks for a new answer by raising DecisionNeeded
+
+        :param options: The possible interpretations. Each tuple matches the ambiguous text to a possible interpretation
+        :type options: list[tuple[list[Named],list[str]]]
+        :return: The index of the correct interpretation
+        :rtype: int
+        """
+        if self.asked < len(self.answers):
+            self.asked += 1
+            return self.answers[self.asked-1]
+        raise DecisionNeeded(options)
+
+    def feedback(self, feedback:Feedback) -> None:
+        """Reads the moves, turns, and score from the Feedback and writes the rest to the connection.
+
+        :param feedback: Feedback from a recently attempted Action.
+        :type feedback: Feedback
+        """
+        self.moves += feedback.moves
+        self.turns += feedback.turns
+        self.score += feedback.score
+        text = feedback.as_string()
+        if text is not None:
+            self.write(f"{text}\n")
+
+class GameSession:
+    """One connection's game: its own GameState where the first user controlled Character is played by the connection.
+    Any other user controlled Characters wait like NPCs.
+    """
+
+    def __init__(self, game_state:GameState, character:Actor, controller:AsyncController):
+        self.game_state = game_state
+        self.character  = character
+        self.controller = controller
+
+    @staticmethod
+    def create(template:GameTemplate, controller:AsyncController) -> 'GameSession':
+        """Forks a new game from template, this is all CPU work so the server runs it off the event loop"""
+        name_space, _, every_turn, controllers, details = template.fork()
+        character = None
+        for actor, actor_controller in list(controllers.characters.items()):
+            if isinstance(actor_controller, CommandLineController):
+                if character is None:
+                    character = actor
+                    controllers.create_character(actor, controller)
+                else:
+                    controllers.create_character(actor, NPCController())
+        return GameSession(GameState(details, name_space, [], controllers, every_turn), character, controller)
+
+    async def respond(self, user_input:str) -> Feedback|None:
+        """Translates the input, asking the player to disambiguate it as often as needed, and performs it
+        """
+        self.controller.answers = list[int]()
+        while True:
+            self.controller.asked = 0
+            try:
+                action, inputs = self.game_state.translate(user_input, self.character, self.controller)
+                break
+            except DecisionNeeded as decision:
+                answer = await self.controller.ask(decision.options)
+                if answer is None:
+                    return None
+                self.controller.answers.append(answer)
+        return self.game_state.action(self.character, action, inputs)
+
+    async def play(self) -> None:
+        if self.character is None:
+            self.controller.write("This game has no playable characters.\n")
+            return
+        self.controller.write(f"{self.game_state.game_details["welcome_text"]}\n\n")
+        self.game_state.start()
+        while not self.game_state.game_over():
+            if self.game_state.whose_turn() != self.character:
+                self.game_state.take_turn()
+                await asyncio.sleep(0) # let other sessions run between NPC turns
+                continue
+            user_input = await self.controller.read_move()
+            if user_input is None or user_input.lower() == 'quit':
+                break
+            self.game_state.check_every_turn()
+            feedback = await self.respond(user_input)
+            if feedback is None:
+                break
+            self.controller.feedback(feedback)
+
+class GameServer:
+    """Hosts a separate game for every connection to a local TCP or Unix socket.
+    Every connection is its own coroutine, so idle or slow clients only ever wait on their own connection.
+    """
+
+    def __init__(self, game:str, *, idle_timeout:float=600, write_timeout:float=30):
+        self.game = game
+        self.idle_timeout = idle_timeout
+        self.write_timeout = write_timeout
+        self.sessions = 0
+        self.server = None
+        self.template:GameTemplate = None
+
+    async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        controller = AsyncController(reader, writer, idle_timeout=self.idle_timeout, write_timeout=self.write_timeout)
+        self.sessions += 1
+        try:
+            session = await asyncio.to_thread(GameSession.create, self.template, controller) # other sessions keep running while it forks
+            await session.play()
+            await controller.flush()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception:
+            logger.exception("Session ended by an error") # only this connection is closed, the server and the other sessions go on
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def start(self, *, host:str='127.0.0.1', port:int=8765, path:str=None) -> asyncio.AbstractServer:
+        """Starts listening on a Unix socket if path is given, otherwise on host:port
+        """
+        if self.template is None:
+            self.template = GameTemplate(read_in_game_snapshot(self.game))
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host=host, port=port)
+        return self.server
+
+    async def serve_forever(self, *, host:str='127.0.0.1', port:int=8765, path:str=None) -> None:
+        server = await self.start(host=host, port=port, path=path)
+        print(f"Serving {self.game} on {path if path is not None else f'{host}:{server.sockets[0].getsockname()[1]}'}")
+        async with server:
+            await server.serve_forever()
+
+def run_server(game:str, *, host:str='127.0.0.1', port:int=8765, path:str=None) -> None:
+    asyncio.run(GameServer(game).serve_forever(host=host, port=port, path=path))
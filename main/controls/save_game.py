@@ -0,0 +1,218 @@
+import struct
+from typing import BinaryIO
+
+from models.actors              import HasLocation, Target, Actor
+from models.state               import StateGraph, StateGroup, Skill, Achievement
+from models.requirement         import HappenedRequirement
+from controls.game_control      import GameState
+
+# Save file: MAGIC, version, current turn, moves, then one section per kind of change.
+# Every section is a count followed by that many entries, strings are utf-8 with a 2 byte length.
+MAGIC        = b"ZSAV"
+SAVE_VERSION = 2
+HEADER       = struct.Struct("<4sBII")
+COUNT        = struct.Struct("<I")
+SHORT        = struct.Struct("<H")
+INT          = struct.Struct("<i")
+
+class SaveError(Exception):
+    pass
+
+def __write_string(out:BinaryIO, string:str) -> None:
+    data = string.encode()
+    out.write(SHORT.pack(len(data)))
+    out.write(data)
+
+def __write_strings(out:BinaryIO, strings:list[str]) -> None:
+    out.write(SHORT.pack(len(strings)))
+    for string in strings:
+        __write_string(out, string)
+
+def __read(data:BinaryIO, format:struct.Struct) -> int:
+    raw = data.read(format.size)
+    if len(raw) != format.size:
+        raise SaveError("Save file is truncated")
+    return format.unpack(raw)[0]
+
+def __read_string(data:BinaryIO) -> str:
+    length = __read(data, SHORT)
+    raw = data.read(length)
+    if len(raw) != length:
+        raise SaveError("Save file is truncated")
+    return raw.decode()
+
+def __read_strings(data:BinaryIO) -> list[str]:
+    return [__read_string(data) for _ in range(__read(data, SHORT))]
+
+def __location_path(game_state:GameState, location:HasLocation) -> list[str]:
+    """The ids from the closest ancestor in the name space down to location, details like inventories are not in the name space"""
+    path = list[str]()
+    while location is not None:
+        path.append(location.get_id())
+        if game_state.name_space.by_id.get(location.get_id(), None) is location:
+            break
+        location = location.get_parent()
+    return path[::-1]
+
+def __lookup(name_space, id:str, category:str=None) -> object:
+    try:
+        return name_space.get_from_id(id, category)
+    except ValueError:
+        raise SaveError(f"The save has a{'' if category is None else ' ' + category} {id} this game doesn't")
+
+def __find_location(game_state:GameState, path:list[str]) -> HasLocation:
+    location = __lookup(game_state.name_space, path[0])
+    for child_id in path[1:]:
+        try:
+            location = location.get_child(child_id)
+        except ValueError:
+            raise SaveError(f"The save puts something in {" ".join(path)} which this game doesn't have")
+    return location
+
+def __state_groups(graph:StateGraph) -> dict[str,StateGroup]:
+    groups = dict[str,StateGroup]({graph.current_state.get_id(): graph.current_state})
+    for transitions in [graph.target_graph, graph.actor_graph, graph.tool_graph]:
+        for group, actions in transitions.items():
+            groups[group.get_id()] = group
+            for next_group in actions.values():
+                groups[next_group.get_id()] = next_group
+    for group, (_, next_group) in graph.time_graph.items():
+        groups[group.get_id()] = group
+        groups[next_group.get_id()] = next_group
+    return groups
+
+def save_game(game_state:GameState, out:BinaryIO) -> None:
+    """Writes everything that has changed in game_state since it was read in. Only the objects in its ChangeLog are visited.
+    """
+    change_log = game_state.change_log
+    out.write(HEADER.pack(MAGIC, SAVE_VERSION, game_state.current_turn, game_state.moves))
+
+    out.write(COUNT.pack(len(change_log.moved)))
+    for id, item in change_log.moved.items():
+        __write_string(out, id)
+        __write_strings(out, [] if item.get_parent() is None else __location_path(game_state, item.get_parent()))
+
+    out.write(COUNT.pack(len(change_log.states)))
+    for id, target in change_log.states.items():
+        __write_string(out, id)
+        out.write(SHORT.pack(len(target.states.state_graphs)))
+        for graph in target.states.state_graphs:
+            __write_string(out, graph.current_state.get_id())
+            out.write(COUNT.pack(graph.time_in_state))
+
+    out.write(COUNT.pack(len(change_log.skills)))
+    for id, actor in change_log.skills.items():
+        __write_string(out, id)
+        out.write(SHORT.pack(len(actor.skills.skills)))
+        for skill, proficiency in actor.skills.skills.items():
+            __write_string(out, skill.get_id())
+            out.write(INT.pack(proficiency))
+
+    out.write(COUNT.pack(len(change_log.achieved)))
+    for id, actor in change_log.achieved.items():
+        __write_string(out, id)
+        __write_strings(out, sorted([achievement.get_id() for achievement in actor.achievements]))
+
+    out.write(COUNT.pack(len(change_log.happened)))
+    for id, requirement in change_log.happened.items():
+        __write_string(out, id)
+        __write_strings(out, sorted([character.get_id() for character in requirement.already_happened]))
+
+def restore_game(game_state:GameState, data:BinaryIO) -> None:
+    """Applies a save to game_state, which must have just been read in (or forked) from the same game.
+    The whole save is read and checked against game_state before any of it is applied, a SaveError leaves game_state as it was.
+    Restored changes are recorded in game_state's ChangeLog so they are saved again.
+    """
+    header = data.read(HEADER.size)
+    if len(header) != HEADER.size:
+        raise SaveError("Not a save file")
+    magic, version, current_turn, moves = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise SaveError("Not a save file")
+    if version != SAVE_VERSION:
+        raise SaveError(f"Save version {version} is not supported, expected {SAVE_VERSION}")
+    name_space = game_state.name_space
+    change_log = game_state.change_log
+
+    moved = list[tuple[HasLocation,HasLocation|None]]()
+    for _ in range(__read(data, COUNT)):
+        item = __lookup(name_space, __read_string(data))
+        path = __read_strings(data)
+        if not isinstance(item, HasLocation):
+            raise SaveError(f"The save moves {item.get_id()} which can't be moved")
+        if len(path) == 0:
+            if isinstance(item.get_parent(), Target): # Targets don't give up what they hold (see Target.remove_child)
+                raise SaveError(f"The save takes {item.get_id()} out of {item.get_parent().get_id()} which can't be done")
+            moved.append((item, None))
+        elif item.get_parent() is None or __location_path(game_state, item.get_parent()) != path:
+            moved.append((item, __find_location(game_state, path)))
+
+    states = list[tuple[Target,list[tuple[StateGraph,StateGroup,int]]]]()
+    for _ in range(__read(data, COUNT)):
+        target = __lookup(name_space, __read_string(data))
+        if not isinstance(target, Target):
+            raise SaveError(f"The save changes the state of {target.get_id()} which has none")
+        graphs = target.states.state_graphs
+        if __read(data, SHORT) != len(graphs):
+            raise SaveError(f"{target.get_id()} has a different number of state graphs than when it was saved")
+        current = list[tuple[StateGraph,StateGroup,int]]()
+        for graph in graphs:
+            group_id = __read_string(data)
+            groups = __state_groups(graph)
+            if group_id not in groups:
+                raise SaveError(f"{target.get_id()} has no state {group_id}")
+            current.append((graph, groups[group_id], __read(data, COUNT)))
+        states.append((target, current))
+
+    skills = list[tuple[Actor,list[tuple[Skill,int]]]]()
+    for _ in range(__read(data, COUNT)):
+        actor = __lookup(name_space, __read_string(data), 'actor')
+        skills.append((actor, [(__lookup(name_space, __read_string(data), 'skill'), __read(data, INT)) for _ in range(__read(data, SHORT))]))
+
+    achieved = list[tuple[Actor,list[Achievement]]]()
+    for _ in range(__read(data, COUNT)):
+        actor = __lookup(name_space, __read_string(data), 'actor')
+        achieved.append((actor, [__lookup(name_space, achievement_id, 'achievement') for achievement_id in __read_strings(data)]))
+
+    requirements = {requirement.id: requirement for requirement in game_state.every_turn_requirement if isinstance(requirement, HappenedRequirement)}
+    happened = list[tuple[HappenedRequirement,list[Actor]]]()
+    for _ in range(__read(data, COUNT)):
+        requirement_id = __read_string(data)
+        if requirement_id not in requirements:
+            raise SaveError(f"The save has a requirement {requirement_id} this game doesn't")
+        happened.append((requirements[requirement_id], [__lookup(name_space, character_id, 'actor') for character_id in __read_strings(data)]))
+
+    # everything checked out, apply it
+    game_state.current_turn = current_turn
+    game_state.moves = moves
+    for item, location in moved:
+        if location is not None:
+            item.set_location(location)
+        elif item.get_parent() is None:
+            change_log.moved_item(item)
+        elif not item.get_parent().remove_child(item)[0]:
+            raise SaveError(f"{item.get_id()} couldn't be taken out of {item.get_parent().get_id()}")
+    for target, current in states:
+        for graph, group, time_in_state in current:
+            graph.current_state = group
+            graph.time_in_state = time_in_state
+        target.version += 1
+        change_log.changed_state(target)
+    for actor, proficiencies in skills:
+        for skill, proficiency in proficiencies:
+            actor.skills.skills[skill] = proficiency
+        change_log.changed_skill(actor)
+    for actor, achievements in achieved:
+        for achievement in achievements:
+            actor.complete_achievement(achievement)
+    for requirement, characters in happened:
+        for character in characters:
+            requirement._happened(character)
+
+def save_game_to_file(game_state:GameState, file:str) -> None:
+    with open(file, 'wb') as out:
+        save_game(game_state, out)
+
+def restore_game_from_file(game_state:GameState, file:str) -> None:
+    with open(file, 'rb') as data:
+        restore_game(game_state, data)
@@ -3,9 +3,25 @@ from typing import Any
 from models.named    import Action, Named
 from models.actors   import HasLocation, LocationDetail, Actor
 from controls.character_control import CharacterController
+from utils.interaction_scope import InteractionScope
 from utils.relator   import NameFinder
 from utils.constants import *
 
+def _corrected(tokens:list[str], context:NameFinder, edges:dict[str,'TranslateNode']) -> list[str]|None:
+    """tokens with the word the match failed on swapped for the closest alias word, None when there is nothing to correct.
+    That is tokens[0], or a later word when the known words before it start a longer alias ("honey jra"),
+    a known word no alias goes on from ("lamp xyzzy") is where the match failed and isn't a typo.
+    """
+    for i, token in enumerate(tokens):
+        if token == '\n' or token in edges:
+            return None
+        if not context.knows(token):
+            correction = context.correct(token)
+            return None if correction is None else tokens[:i] + [correction] + tokens[i+1:]
+        if len(context.complete(" ".join(tokens[:i+1]) + " ")) == 0:
+            return None
+    return None
+
 class Node:
     def add_edge(self, edge:str, end:'TranslateNode') -> None:
         pass
@@ -50,6 +66,9 @@ class TranslateNode(Node):
         if not matched and tokens[0] in self.edges:
             matches.append((tokens[0], None, [tokens[0]], tokens[1:], self.edges[tokens[0]]))
         elif not matched:
+            corrected = _corrected(tokens, context, self.edges)
+            if corrected is not None:
+                return self.interpret(corrected, context)
             return [('error', [TranslateError(f"Unexpected or unknown word: \"{tokens[0]}\".")], [tokens[0]], tokens[1:], None)]
         return matches
     
@@ -75,6 +94,9 @@ class TranslatePlacementNode(Node):
                     matches.append((edge,[('placement',match)],tokens_used,tokens_left,self.edges[edge]))
         matched = len(matches) > 0
         if not matched:
+            corrected = _corrected(tokens, context, self.edges)
+            if corrected is not None:
+                return self.interpret(corrected, context)
             return [('error', [TranslateError(f"Unexpected or unkown word: \"{tokens[0]}\" or you can't place anything {self.state} {tokens[0]}.")], [tokens[0]], tokens[1:], None)]
         return matches
 
@@ -91,18 +113,18 @@ class Translator:
         cleaned.append('\n')
         return cleaned
 
-    def interpret(self, input:str, name_space:NameFinder, character:Actor, controller:CharacterController) -> tuple[Action,tuple]:
+    def interpret(self, input:str, name_space:NameFinder, character:Actor, controller:CharacterController, *, scope:InteractionScope=None) -> tuple[Action,tuple]:
         tokens = self.__clean(input)
         translation = list[Named]()
         result = self.head.interpret(tokens, name_space)
         while len(result) > 0:
             if len(result) > 1:
-                # pick one
+                # pick one, preferring what the character can reach when the scope is known
                 room = character.get_top_parent()
                 in_room = []
                 for edge,translated_tokens,tokens_used,tokens_left,next_node in result:
                     for token in translated_tokens:
-                        if room.contains_item(token):
+                        if scope.can_interact_with(token) if scope is not None else room.contains_item(token):
                             in_room.append((edge,translated_tokens,tokens_used,tokens_left,next_node))
                             break
                 if len(in_room) >= 1:
@@ -1,6 +1,8 @@
 import glob
 import json
-from typing import Any
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Iterable
 
 from utils.relator      import NameFinder
 from models.named       import Action, Direction
@@ -10,36 +12,126 @@ from models.requirement import ActionRequirement
 from utils.constants    import *
 
 from factories.factories import CharacterControlFactory
+from factories.room_pager import RoomPager
 import factories.factories as factories
 
-def __read_in_json(file:str) -> dict:
+# Every folder read_in_game reads. Their jsons don't depend on each other so they can all be parsed at once,
+# only building the objects has to happen in order.
+GAME_CATEGORIES = ['directions', 'actions', 'achievements', 'states', 'state_graphs', 'items', 'skills', 'skill_sets', 'characters', 'rooms', 'character_control']
+
+def _read_in_json(file:str) -> dict:
     with open(file) as contents:
         data = json.load(contents)
     return data
 
-def __read_in_folder(folder:str) -> list[dict[str,Any]]:
-    files = glob.glob(f"main/{folder}/*.json")
+def _read_in_file(file:str) -> tuple[list[dict[str,Any]],int]:
+    try:
+        to_add = _read_in_json(file)
+        size = os.path.getsize(file)
+        if isinstance(to_add, list):
+            return to_add, size
+        return [to_add], size
+    except json.JSONDecodeError as e:
+        print(e)
+        print(f"ERROR reading {file}")
+    except UnicodeDecodeError as e:
+        print(e)
+        print(f"ERROR reading {file}")
+    return [], 0
+
+def _list_folder(folder:str) -> list[str]:
+    # sorted so the documents (and so the order objects are added to the NameFinder) don't depend on the file system
+    files = sorted(glob.glob(f"{folder}/*.json"))
     if len(files) == 0:
         print(f"Folder {folder} doesn't exist")
+    return files
+
+def _merge(results:Iterable[tuple[list[dict[str,Any]],int]]) -> tuple[list[dict[str,Any]],int,int]:
     output = []
-    for file in files:
-        try:
-            to_add = __read_in_json(file)
-            if isinstance(to_add, list):
-                output.extend(to_add)
-            else:
-                output.append(to_add)
-        except json.JSONDecodeError as e:
-            print(e)
-            print(f"ERROR reading {file}")
-        except UnicodeDecodeError as e:
-            print(e)
-            print(f"ERROR reading {file}")
-    return output
-
-def read_in_directions(game:str, name_space:NameFinder) -> None:
-    folder     = f"data/{game}/directions"
-    data       = __read_in_folder(folder)
+    total_bytes = 0
+    files = 0
+    for documents, size in results:
+        output.extend(documents)
+        total_bytes += size
+        files += 1
+    return output, files, total_bytes
+
+def _read_in_folder(folder:str) -> tuple[list[dict[str,Any]],int,int]:
+    return _merge(map(_read_in_file, _list_folder(folder)))
+
+class GameDocuments:
+    """Parses the jsons of data/<game> once and keeps the parsed documents so the construction phase
+    and the update phase share them instead of reading the items, characters and rooms twice.
+    Tracks how many files and bytes each phase read from disk and how many documents it reused.
+    With more than 1 worker, prefetch parses the files of many folders at the same time on a thread (or process) pool.
+    The documents are merged back in sorted file order so the result is the same as reading them one at a time.
+    """
+
+    def __init__(self, game:str, *, data_folder:str=DATA_FOLDER, workers:int=1, processes:bool=False):
+        self.game   = game
+        self.folder = f"{data_folder}/{game}"
+        self.documents = dict[str,list[dict[str,Any]]]()
+        self.phase  = 'construct'
+        self.stats  = dict[str,dict[str,int]]()
+        self.workers   = max(1, workers)
+        self.processes = processes
+
+    def __phase_stats(self) -> dict[str,int]:
+        if self.phase not in self.stats:
+            self.stats[self.phase] = {'files': 0, 'bytes': 0, 'documents': 0, 'reused': 0}
+        return self.stats[self.phase]
+
+    def __store(self, category:str, data:list[dict[str,Any]], files:int, size:int) -> None:
+        stats = self.__phase_stats()
+        self.documents[category] = data
+        stats['files']     += files
+        stats['bytes']     += size
+        stats['documents'] += len(data)
+
+    def set_phase(self, phase:str) -> None:
+        self.phase = phase
+
+    def prefetch(self, categories:list[str]) -> None:
+        """Parses every file in the given folders, using the worker pool if there is more than 1 worker
+        """
+        categories = [category for category in categories if category not in self.documents]
+        folder_files = [_list_folder(f"{self.folder}/{category}") for category in categories]
+        if self.workers == 1:
+            for category, files in zip(categories, folder_files):
+                self.__store(category, *_merge(map(_read_in_file, files)))
+            return
+        all_files = [file for files in folder_files for file in files]
+        pool = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        with pool(max_workers=self.workers) as executor:
+            results = list(executor.map(_read_in_file, all_files, chunksize=max(1, len(all_files)//(self.workers*4))))
+        start = 0
+        for category, files in zip(categories, folder_files):
+            self.__store(category, *_merge(results[start:start+len(files)]))
+            start += len(files)
+
+    def get(self, category:str) -> list[dict[str,Any]]:
+        if category in self.documents:
+            self.__phase_stats()['reused'] += len(self.documents[category])
+        else:
+            self.__store(category, *_read_in_folder(f"{self.folder}/{category}"))
+        return self.documents[category]
+
+    def get_file(self, file:str) -> Any:
+        stats = self.__phase_stats()
+        path = f"{self.folder}/{file}"
+        stats['files'] += 1
+        stats['bytes'] += os.path.getsize(path)
+        return _read_in_json(path)
+
+    def release(self) -> None:
+        """Drops the parsed documents once the game is built"""
+        self.documents.clear()
+
+    def report(self) -> str:
+        return "\n".join([f"{phase}: {stats['files']} files, {stats['bytes']} bytes, {stats['documents']} documents parsed, {stats['reused']} reused" for phase, stats in self.stats.items()])
+
+def read_in_directions(documents:GameDocuments, name_space:NameFinder) -> None:
+    data       = documents.get('directions')
     inputs     = factories.many_from_dict_named(data)
     directions = [Direction(**kwargs) for kwargs in inputs]
     success    = name_space.add_many(directions)
@@ -48,9 +140,8 @@ def read_in_directions(game:str, name_space:NameFinder) -> None:
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
     
-def read_in_actions(game:str, name_space:NameFinder) -> None:
-    folder  = f"data/{game}/actions"
-    data    = __read_in_folder(folder)
+def read_in_actions(documents:GameDocuments, name_space:NameFinder) -> None:
+    data    = documents.get('actions')
     inputs  = factories.many_from_dict_action(data)
     actions = [Action(**kwargs) for kwargs in inputs]
     success = name_space.add_many(actions)
@@ -59,9 +150,8 @@ def read_in_actions(game:str, name_space:NameFinder) -> None:
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def read_in_achievements(game:str, name_space:NameFinder) -> None:
-    folder  = f"data/{game}/achievements"
-    data    = __read_in_folder(folder)
+def read_in_achievements(documents:GameDocuments, name_space:NameFinder) -> None:
+    data    = documents.get('achievements')
     inputs  = factories.many_from_dict_named(data)
     achievements = [Achievement(**kwargs) for kwargs in inputs]
     success = name_space.add_many(achievements)
@@ -70,9 +160,8 @@ def read_in_achievements(game:str, name_space:NameFinder) -> None:
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def read_in_states(game:str, name_space:NameFinder) -> None:
-    folder  = f"data/{game}/states"
-    data    = __read_in_folder(folder)
+def read_in_states(documents:GameDocuments, name_space:NameFinder) -> None:
+    data    = documents.get('states')
     inputs  = factories.many_from_dict_state(data, name_space)
     states  = [State.create_state(**kwargs) for kwargs in inputs]
     success = name_space.add_many(states)
@@ -81,9 +170,8 @@ def read_in_states(game:str, name_space:NameFinder) -> None:
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def read_in_state_graphs(game:str, name_space:NameFinder, setup_space:NameFinder) -> None:
-    folder  = f"data/{game}/state_graphs"
-    data    = __read_in_folder(folder)
+def read_in_state_graphs(documents:GameDocuments, name_space:NameFinder, setup_space:NameFinder) -> None:
+    data    = documents.get('state_graphs')
     groups_data  = [sgdict for gdict in data if 'state_groups' in gdict for sgdict in gdict['state_groups']]
     group_inputs = factories.many_from_dict_state_group(groups_data, name_space)
     groups  = [StateGroup(**kwargs) for kwargs in group_inputs]
@@ -99,9 +187,8 @@ def read_in_state_graphs(game:str, name_space:NameFinder, setup_space:NameFinder
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def read_in_items(game:str, name_space:NameFinder, setup_space:NameFinder) -> None:
-    folder  = f"data/{game}/items"
-    data    = __read_in_folder(folder)
+def read_in_items(documents:GameDocuments, name_space:NameFinder, setup_space:NameFinder) -> None:
+    data    = documents.get('items')
     inputs  = factories.many_from_dict_item(data, name_space, setup_space)
     items   = [Target(**kwargs) for kwargs in inputs]
     success = name_space.add_many(items)
@@ -110,9 +197,8 @@ def read_in_items(game:str, name_space:NameFinder, setup_space:NameFinder) -> No
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def read_in_skills(game:str, name_space:NameFinder) -> None:
-    folder  = f"data/{game}/skills"
-    data    = __read_in_folder(folder)
+def read_in_skills(documents:GameDocuments, name_space:NameFinder) -> None:
+    data    = documents.get('skills')
     inputs  = factories.many_from_dict_named(data)
     skills  = [Skill(**kwargs) for kwargs in inputs]
     success = name_space.add_many(skills)
@@ -121,9 +207,8 @@ def read_in_skills(game:str, name_space:NameFinder) -> None:
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def read_in_skill_sets(game:str, name_space:NameFinder) -> None:
-    folder  = f"data/{game}/skill_sets"
-    data    = __read_in_folder(folder)
+def read_in_skill_sets(documents:GameDocuments, name_space:NameFinder) -> None:
+    data    = documents.get('skill_sets')
     inputs  = factories.many_from_dict_named(data)
     skill_sets = [SkillSet(**kwargs) for kwargs in inputs]
     success = name_space.add_many(skill_sets)
@@ -132,9 +217,8 @@ def read_in_skill_sets(game:str, name_space:NameFinder) -> None:
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def read_in_characters(game:str, name_space:NameFinder, setup_space:NameFinder) -> None:
-    folder  = f"data/{game}/characters"
-    data    = __read_in_folder(folder)
+def read_in_characters(documents:GameDocuments, name_space:NameFinder, setup_space:NameFinder) -> None:
+    data    = documents.get('characters')
     inputs  = factories.many_from_dict_character(data, name_space, setup_space)
     characters = [Actor(**kwargs) for kwargs in inputs]
     success = name_space.add_many(characters)
@@ -143,9 +227,8 @@ def read_in_characters(game:str, name_space:NameFinder, setup_space:NameFinder)
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def read_in_rooms(game:str, name_space:NameFinder, setup_space:NameFinder) -> None:
-    folder  = f"data/{game}/rooms"
-    data    = __read_in_folder(folder)
+def read_in_rooms(documents:GameDocuments, name_space:NameFinder, setup_space:NameFinder) -> None:
+    data    = documents.get('rooms')
     inputs  = factories.many_from_dict_location(data, name_space, setup_space)
     rooms   = [Location(**kwargs) for kwargs in inputs]
     success = name_space.add_many(rooms)
@@ -154,48 +237,85 @@ def read_in_rooms(game:str, name_space:NameFinder, setup_space:NameFinder) -> No
     if len(fails) > 0: print(f"Failed to add: {fails}")
     assert all(success)
 
-def updates(game:str, name_space:NameFinder, setup_space:NameFinder, every_turn:list[ActionRequirement]) -> None:
-    folder = f"data/{game}/items"
-    data   = __read_in_folder(folder)
+def read_in_rooms_lazy(documents:GameDocuments, name_space:NameFinder, pager:RoomPager) -> None:
+    data    = documents.get('rooms')
+    rooms   = [pager.add_room(location_dict) for location_dict in data]
+    success = name_space.add_many(rooms)
+    if DEBUG_READIN: print(f"Found {len(success)} rooms")
+    fails = [room.get_name() for s,room in zip(success,rooms) if not s]
+    if len(fails) > 0: print(f"Failed to add: {fails}")
+    assert all(success)
+
+def load_occupied_rooms(name_space:NameFinder, pager:RoomPager) -> None:
+    """Loads every room a character starts in so all characters have a location"""
+    characters = {character.get_id() for character in name_space.get_from_name(category='actor')}
+    for id, location_dict in pager.room_dicts.items():
+        if any([child_id.lower() in characters for child_id in location_dict.get('contents', [])]):
+            pager.load(name_space.get_from_id(id, 'location'))
+
+def updates(documents:GameDocuments, name_space:NameFinder, setup_space:NameFinder, every_turn:list[ActionRequirement], *, lazy:bool=False) -> None:
+    data    = documents.get('items')
     factories.update_items(data, name_space, every_turn)
     if DEBUG_READIN: print("Items updated")
-    folder = f"data/{game}/characters"
-    data   = __read_in_folder(folder)
+    data    = documents.get('characters')
     factories.update_characters(data, name_space, every_turn)
     if DEBUG_READIN: print("Characters updated")
-    folder = f"data/{game}/rooms"
-    data   = __read_in_folder(folder)
+    if lazy:
+        return
+    data    = documents.get('rooms')
     factories.update_locations(data, name_space, every_turn)
     if DEBUG_READIN: print("Locations updated")
 
-def read_in_character_control(game:str, name_space:NameFinder) -> CharacterControlFactory:
+def read_in_character_control(documents:GameDocuments, name_space:NameFinder) -> CharacterControlFactory:
     factory = CharacterControlFactory()
-    folder  = f"data/{game}/character_control"
-    data    = __read_in_folder(folder)
+    data    = documents.get('character_control')
     factory.many_from_dict(data, name_space)
     return factory
 
-def read_in_game_details(game:str) -> Any:
-    file = f"main/data/{game}/game_details.json"
-    return __read_in_json(file)
+def read_in_game_details(documents:GameDocuments) -> Any:
+    return documents.get_file("game_details.json")
 
-def read_in_game(game:str) -> tuple[NameFinder, NameFinder, CharacterControlFactory, dict[str,Any]]:
-    name_space  = NameFinder()
-    setup_space = NameFinder()
+def read_in_game(game:str, *, documents:GameDocuments=None, lazy:bool=False, max_loaded_rooms:int=None, name_finder:type[NameFinder]=NameFinder, cache:bool=True, fuzzy:bool=True) -> tuple[NameFinder, NameFinder, list[ActionRequirement], CharacterControlFactory, dict[str,Any]]:
+    """Reads in every json in data/<game> and links them into a playable game.
+    Each json is parsed once, pass in documents to read from another data folder, to parse the files in parallel
+    or to inspect the per phase read counts afterwards. name_finder is the NameFinder class the name spaces are built with,
+    cache turns on the name space's query cache and fuzzy its index of alias words for correcting typos.
+    When lazy, rooms are only built when first used (see RoomPager) and at most max_loaded_rooms untouched rooms are kept loaded.
+    """
+    if documents is None:
+        documents = GameDocuments(game)
+    name_space  = name_finder(cache=cache)
+    setup_space = name_finder()
     every_turn  = list[ActionRequirement]()
-    read_in_directions  (game, name_space)
-    read_in_actions     (game, name_space)
-    read_in_achievements(game, name_space)
-    read_in_states      (game, name_space)
-    read_in_state_graphs(game, name_space, setup_space)
-    read_in_items       (game, name_space, setup_space)
-    read_in_skills      (game, name_space)
-    read_in_skill_sets  (game, name_space)
-    read_in_characters  (game, name_space, setup_space)
-    read_in_rooms       (game, name_space, setup_space)
-    updates             (game, name_space, setup_space, every_turn)
-
-    controllers  = read_in_character_control(game, name_space)
-    game_details = read_in_game_details(game)
+    documents.set_phase('construct')
+    if documents.workers > 1:
+        documents.prefetch(GAME_CATEGORIES)
+    read_in_directions  (documents, name_space)
+    read_in_actions     (documents, name_space)
+    read_in_achievements(documents, name_space)
+    read_in_states      (documents, name_space)
+    read_in_state_graphs(documents, name_space, setup_space)
+    read_in_items       (documents, name_space, setup_space)
+    read_in_skills      (documents, name_space)
+    read_in_skill_sets  (documents, name_space)
+    read_in_characters  (documents, name_space, setup_space)
+    if lazy:
+        pager = RoomPager(name_space, setup_space, every_turn, max_loaded=max_loaded_rooms)
+        read_in_rooms_lazy(documents, name_space, pager)
+    else:
+        read_in_rooms   (documents, name_space, setup_space)
+    documents.set_phase('update')
+    updates             (documents, name_space, setup_space, every_turn, lazy=lazy)
+    if lazy:
+        load_occupied_rooms(name_space, pager)
+
+    documents.set_phase('finish')
+    controllers  = read_in_character_control(documents, name_space)
+    game_details = read_in_game_details(documents)
     game_details['playable_characters'] = controllers.playable_characters()
+    if fuzzy:
+        name_space.enable_fuzzy()
+    name_space.freeze()
+    documents.release()
+    if DEBUG_READIN: print(documents.report())
     return name_space, setup_space, every_turn, controllers, game_details
@@ -3,7 +3,7 @@ from typing import Optional, Any
 from utils.relator      import NameFinder
 from models.named       import Action, Direction
 from models.actors      import ItemLimit, HasLocation, Location, Path, Target, Actor, LocationDetail, SingleEndPath, MultiEndPath, Achievement
-from models.requirement import ActionRequirement, CharacterAchievementRequirement, CharacterStateRequirement, ItemsHeldRequirement, WearingRequirement, ItemStateRequirement, ItemPlacementRequirement, HappenedRequirement
+from models.requirement import ActionRequirement, AllRequirement, CharacterAchievementRequirement, CharacterStateRequirement, ItemsHeldRequirement, WearingRequirement, ItemStateRequirement, ItemPlacementRequirement, HappenedRequirement
 from models.state       import State, StateGroup, StateGraph, Skill, StateDisconnectedGraph
 from models.response    import ResponseString, StaticResponse, CombinationResponse, ItemStateResponse, ContentsResponse, RandomResponse, ContentsWithStateResponse
 from controls.character_control import CharacterController, CommandLineController, NPCController
@@ -33,7 +33,7 @@ def character_achievement_requirements_from_dict(name:str, requirement_dict:dict
 def item_state_requirements_from_dict(name:str, requirement_dict:dict[str,Any], name_space:NameFinder) -> ItemStateRequirement:
     item_states = dict[Target,dict[State,tuple[bool,ResponseString]]]()
     for item_id, states_needed_raw in requirement_dict.items():
-        item = name_space.get_from_id(item_id, ['target','actor'])
+        item = name_space.get_from_id(item_id, Target)
         states_needed = dict[State,tuple[bool,str]]()
         for state_id, needed in states_needed_raw.items():
             state = name_space.get_from_id(state_id, 'state')
@@ -47,7 +47,7 @@ def item_state_requirements_from_dict(name:str, requirement_dict:dict[str,Any],
 def item_placement_requirements_from_dict(name:str, requirement_dict:dict[str,Any], name_space:NameFinder) -> ItemPlacementRequirement:
     item_placements = dict[Target,list[tuple[Location,bool,ResponseString]]]()
     for item_id, location_info in requirement_dict.items():
-        item = name_space.get_from_id(item_id, ['target','actor'])
+        item = name_space.get_from_id(item_id, Target)
         placements = list[tuple[Location,bool,ResponseString]]()
         for location_id, needed, response in location_info:
             location = name_space.get_from_id(location_id, ['location', 'locationdetail'])
@@ -58,7 +58,7 @@ def item_placement_requirements_from_dict(name:str, requirement_dict:dict[str,An
 def items_held_requirement_from_dict(name:str, requirement_dict:dict[str,Any], name_space:NameFinder) -> ItemsHeldRequirement:
     items_needed = dict[Target,tuple[bool,ResponseString]]()
     for item_id, needed in requirement_dict.items():
-        item = name_space.get_from_id(item_id, ['target', 'actor'])
+        item = name_space.get_from_id(item_id, Target)
         if isinstance(needed, bool):
             items_needed[item] = (needed,None)
         else:
@@ -68,25 +68,39 @@ def items_held_requirement_from_dict(name:str, requirement_dict:dict[str,Any], n
 def wearing_requirements_from_dict(name:str, requirement_dict:dict[str,dict], name_space:NameFinder) -> WearingRequirement:
     items_needed = dict[Target,tuple[bool,ResponseString]]()
     for item_id, item_info in requirement_dict.items():
-        item = name_space.get_from_id(item_id, ['target', 'actor'])
+        item = name_space.get_from_id(item_id, Target)
         needed   = item_info['needed']
         response = response_from_input(name, item_info['response'], name_space) if 'response' in item_info else None
         items_needed[item] = (needed, response)
     return ItemsHeldRequirement(items_needed)
 
-def happened_requirements_from_dict(name:str, requirement_dict:dict[str,Any], name_space:NameFinder, every_turn:list[ActionRequirement]) -> HappenedRequirement:
-    requirement = requirements_from_dict(name, requirement_dict, name_space)
+def happened_requirement_id(owner:str, ordinals:dict[str,int]) -> str:
+    """The id of the next HappenedRequirement of owner (an id): owner and how many of its HappenedRequirements were read before it,
+    counted in ordinals. Everything of one owner is read in one go with one ordinals,
+    so it is the same whether its room is read eagerly or by the RoomPager.
+    """
+    ordinal = ordinals.get(owner, 0)
+    ordinals[owner] = ordinal + 1
+    return f"{owner.lower()} happened {ordinal}"
+
+def happened_requirements_from_dict(name:str, requirement_dict:dict[str,Any], name_space:NameFinder, every_turn:list[ActionRequirement], *, owner:str=None, ordinals:dict[str,int]=None) -> HappenedRequirement:
+    owner    = name if owner is None else owner
+    ordinals = dict[str,int]() if ordinals is None else ordinals
+    requirements = requirements_from_dict(name, requirement_dict, name_space, every_turn, owner=owner, ordinals=ordinals)
+    requirement = requirements[0] if len(requirements) == 1 else AllRequirement(requirements)
     yes_response = None
     if 'yes_response' in requirement_dict:
         yes_response = response_from_input(name, requirement_dict['yes_response'], name_space)
     no_response = None
     if 'no_response' in requirement_dict:
         no_response = response_from_input(name, requirement_dict['no_response'], name_space)
-    req = HappenedRequirement(requirement, yes_response=yes_response, no_response=no_response)
+    req = HappenedRequirement(requirement, yes_response=yes_response, no_response=no_response, id=happened_requirement_id(owner, ordinals))
     every_turn.append(req)
     return req
 
-def requirements_from_dict(name:str, requirements_dict:dict[str,Any], name_space:NameFinder, every_turn:list[ActionRequirement]) -> list[ActionRequirement]:
+def requirements_from_dict(name:str, requirements_dict:dict[str,Any], name_space:NameFinder, every_turn:list[ActionRequirement], *, owner:str=None, ordinals:dict[str,int]=None) -> list[ActionRequirement]:
+    """ordinals counts the HappenedRequirements read for each owner so far (see happened_requirement_id),
+    pass the same one to every call for one owner"""
     requirements = list[ActionRequirement]()
     if 'character_state_requirements' in requirements_dict:
         states_needed_raw = requirements_dict['character_state_requirements']
@@ -105,18 +119,19 @@ def requirements_from_dict(name:str, requirements_dict:dict[str,Any], name_space
         requirements.append(item_placement_requirements_from_dict(name, item_placements_raw, name_space))
     if 'happened_requirements' in requirements_dict:
         happened_raw = requirements_dict['happened_requirements']
-        requirements.append(happened_requirements_from_dict(name, happened_raw, name_space, every_turn))
+        requirements.append(happened_requirements_from_dict(name, happened_raw, name_space, every_turn, owner=owner, ordinals=ordinals))
     if 'wearing_requirements' in requirements_dict:
         requirements.append(wearing_requirements_from_dict(name, requirements_dict['wearing_requirements'], name_space))
     return requirements
 
 # REQUIREMENT RELATED
 
-def action_restrictions_from_dict(name:str, restrictions_dict:dict[str,dict], name_space:NameFinder, every_turn:list[ActionRequirement]) -> dict[Action,list[ActionRequirement]]:
+def action_restrictions_from_dict(name:str, restrictions_dict:dict[str,dict], name_space:NameFinder, every_turn:list[ActionRequirement], *, owner:str=None, ordinals:dict[str,int]=None) -> dict[Action,list[ActionRequirement]]:
     restrictions = dict[Action,list[ActionRequirement]]()
+    ordinals     = dict[str,int]() if ordinals is None else ordinals
     for action_id, requirements_dict in restrictions_dict.items():
         action = name_space.get_from_id(action_id, 'action')
-        requirements = requirements_from_dict(name, requirements_dict, name_space, every_turn)
+        requirements = requirements_from_dict(name, requirements_dict, name_space, every_turn, owner=owner, ordinals=ordinals)
         restrictions[action] = requirements
     return restrictions
 
@@ -124,14 +139,14 @@ def action_restrictions_from_dict(name:str, restrictions_dict:dict[str,dict], na
 
 def contents_response_from_dict(name:str, response_dict:dict[str,str], name_space:NameFinder) -> ContentsResponse:
     target_id = response_dict['target'] if 'target' in response_dict else name
-    target = name_space.get_from_id(target_id, ['target', 'actor', 'locationdetail'])
+    target = name_space.get_from_id(target_id, [Target, LocationDetail])
     full_response  = response_from_input(name, response_dict['full'], name_space)
     empty_response = response_from_input(name, response_dict['empty'], name_space)
     return ContentsResponse(full_response, empty_response, target)
 
 def contents_with_state_response_from_dict(name:str, response_dict:dict[str,str|dict[str,str]], name_space:NameFinder) -> ItemStateResponse:
     target_id = response_dict['target'] if 'target' in response_dict else name
-    target = name_space.get_from_id(target_id, ['target', 'actor'])
+    target = name_space.get_from_id(target_id, Target)
     responses = dict[State,str]()
     for state_id, response in response_dict['responses'].items():
         state = name_space.get_from_id(state_id, 'state')
@@ -141,7 +156,7 @@ def contents_with_state_response_from_dict(name:str, response_dict:dict[str,str|
 
 def item_state_response_from_dict(name:str, response_dict:dict[str,str|dict[str,str]], name_space:NameFinder) -> ItemStateResponse:
     target_id = response_dict['target'] if 'target' in response_dict else name
-    target = name_space.get_from_id(target_id, ['target', 'actor'])
+    target = name_space.get_from_id(target_id, Target)
     responses = dict[State,str]()
     for state_id, response in response_dict['responses'].items():
         state = name_space.get_from_id(state_id)
@@ -195,7 +210,7 @@ def response_from_input(name:str, input:str|dict[str,Any]|list, name_space:NameF
 def item_responses_from_dict(name:str, response_dict:dict[str,Any], name_space:NameFinder) -> dict['HasLocation',str]:
     responses = dict[HasLocation,ResponseString]()
     for item_id, response in response_dict:
-        item = name_space.get_from_id(item_id, ['target', 'actor'])
+        item = name_space.get_from_id(item_id, Target)
         responses[item] = response_from_input(name, response, name_space)
     return responses
 
@@ -225,7 +240,7 @@ def direction_responses_from_dict(name:str, response_dict:dict[str,Any], name_sp
 def children_from_dict(name, children_dict:dict[str,Any], name_space:NameFinder) -> list[HasLocation]:
     children = list[HasLocation]()
     for item_id in children_dict:
-        item = name_space.get_from_id(item_id, ['target', 'actor', 'locationdetail'])
+        item = name_space.get_from_id(item_id, [Target, LocationDetail])
         children.append(item)
     return children
 
@@ -412,7 +427,7 @@ def update_item(item_dict:dict[str,Any], name_space:NameFinder, every_turn:list[
             item._set_children(new_details)
             update_details(item_dict['details'], name_space, every_turn, parent_id=name)
         if 'visible_requirements' in item_dict:
-            item.visible_requirements = requirements_from_dict(name, item_dict['visible_requirements'], name_space, every_turn)
+            item.visible_requirements = requirements_from_dict(name, item_dict['visible_requirements'], name_space, every_turn, owner=id)
         if 'target_responses' in item_dict:
             item.target_responses = action_responses_from_dict(name, item_dict['target_responses'], name_space)
         if 'tool_responses' in item_dict:
@@ -477,6 +492,7 @@ def update_character(character_dict:dict[str,Any], name_space:NameFinder, every_
                 assert character.children.remove(inv)
             inventory.parent = character
             assert character.children.add(inventory)
+            character._forget_contents()
             assert character.get_inventory() is not None
     except ValueError as e:
         print(f"Error in character update {name}: {e}")
@@ -519,7 +535,7 @@ def update_detail(detail_dict:dict[str,Any], name_space:NameFinder, every_turn:l
         if 'contents' in detail_dict:
             detail._set_children(children_from_dict(id, detail_dict['contents'], name_space))
         if 'visible_requirements' in detail_dict:
-            detail.visible_requirements = requirements_from_dict(id, detail_dict['visible_requirements'], name_space, every_turn)
+            detail.visible_requirements = requirements_from_dict(id, detail_dict['visible_requirements'], name_space, every_turn, owner=id)
     except ValueError as e:
         print(f"Error in detail '{name}' ({id}) update: {e}")
 
@@ -559,15 +575,16 @@ def update_path(path_dict:dict[str,Any], name_space:NameFinder, room_name:str, d
     id   = path_id(path_dict.get('id',None), name, direction_name, room_name)
     path = name_space.get_from_id(id)
     assert isinstance(path, Path)
+    ordinals = dict[str,int]()
     try:
         path._set_end(name_space)
         if 'exit_response' in path_dict:
             path.exit_response = response_from_input(name, path_dict['exit_response'], name_space)
         path.description = response_from_input(name, path_dict['description'], name_space)
         if 'visible_requirements' in path_dict:
-            path.visible_requirements = requirements_from_dict(name, path_dict['visible_requirements'], name_space, every_turn)
+            path.visible_requirements = requirements_from_dict(name, path_dict['visible_requirements'], name_space, every_turn, owner=id, ordinals=ordinals)
         if 'passing_requirements' in path_dict:
-            path.passing_requirements = requirements_from_dict(name, path_dict['passing_requirements'], name_space, every_turn)
+            path.passing_requirements = requirements_from_dict(name, path_dict['passing_requirements'], name_space, every_turn, owner=id, ordinals=ordinals)
         if 'path_items' in path_dict:
             path._set_children(children_from_dict(name, path_dict['path_items'], name_space))
         if 'item_responses' in path_dict:
@@ -603,7 +620,7 @@ def one_from_dict_location(location_dict:dict[str,Any|dict], name_space:NameFind
         contents = details
         if 'contents' in location_dict:
             for child_id in location_dict['contents']:
-                child = name_space.get_from_id(child_id, ['target', 'actor', 'locationdetail'])
+                child = name_space.get_from_id(child_id, [Target, LocationDetail])
                 contents.append(child)
         inputs['children'] = contents
         inputs['start_location'] = location_dict.get('start', False)
@@ -622,6 +639,7 @@ def update_location(location_dict:dict[str,Any|dict], name_space:NameFinder, eve
     id   = id.lower()
     location = name_space.get_from_id(id)
     assert isinstance(location, Location)
+    ordinals = dict[str,int]()
     try:
         if 'details' in location_dict:
             update_details(location_dict['details'], name_space, every_turn, parent_id=name)
@@ -630,7 +648,7 @@ def update_location(location_dict:dict[str,Any|dict], name_space:NameFinder, eve
                 direction = name_space.get_from_id(direction_id)
                 update_path(path_dict, name_space, name, direction.get_name(), every_turn)
         if 'visible_requirements' in location_dict:
-            location.visible_requirements = requirements_from_dict(name, location_dict['visible_requirements'], name_space, every_turn)
+            location.visible_requirements = requirements_from_dict(name, location_dict['visible_requirements'], name_space, every_turn, owner=id, ordinals=ordinals)
         if 'item_responses' in location_dict:
             location.item_responses = item_responses_from_dict(name, location_dict['item_responses'], name_space)
         if 'description' in location_dict:
@@ -638,7 +656,7 @@ def update_location(location_dict:dict[str,Any|dict], name_space:NameFinder, eve
         if 'direction_responses' in location_dict:
             location.direction_responses = direction_responses_from_dict(name, location_dict['direction_responses'], name_space)
         if 'action_restrictions' in location_dict:
-            location.action_restrictions = action_restrictions_from_dict(name, location_dict['action_restrictions'], name_space, every_turn)
+            location.action_restrictions = action_restrictions_from_dict(name, location_dict['action_restrictions'], name_space, every_turn, owner=id, ordinals=ordinals)
     except ValueError as e:
         print(f"Error in location update {name}: {e}")
 
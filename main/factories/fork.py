@@ -0,0 +1,109 @@
+import io
+import pickle
+from typing import Any
+
+from utils.relator      import NameFinder, WordTree, FrozenWordTree
+from models.named       import Action, Direction, attributes_of, slot_names
+from models.state       import State, StateGroup, Skill, Achievement, Effect
+from models.actors      import ItemLimit
+from models.requirement import ActionRequirement
+from models.response    import ResponseString, StaticResponse
+from factories.factories import CharacterControlFactory
+
+# Content that is never changed once a game is read in, these are shared by every fork instead of copied
+SHARED_TYPES = (Action, Direction, State, StateGroup, Skill, Achievement, Effect, StaticResponse, ItemLimit, FrozenWordTree)
+# Attributes that only ever hold content, shared whenever everything they hold is shareable
+SHARED_ATTRIBUTES = ['aliases', 'description', 'exit_response', 'target_graph', 'actor_graph', 'tool_graph', 'time_graph',
+                     'target_responses', 'tool_responses', 'state_responses', 'actor_responses', 'direction_responses', 'room_dicts']
+ATOMIC_TYPES = (str, int, float, bool, type(None))
+
+class _ForkPickler(pickle.Pickler):
+    """Writes shared content as a reference into the template instead of copying it"""
+    def __init__(self, file:io.BytesIO, shared:dict[int,int]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = shared
+
+    def persistent_id(self, obj:Any) -> int|None:
+        return self.shared.get(id(obj), None)
+
+class _ForkUnpickler(pickle.Unpickler):
+    def __init__(self, file:io.BytesIO, shared:list[Any]):
+        super().__init__(file)
+        self.shared = shared
+
+    def persistent_load(self, index:int) -> Any:
+        return self.shared[index]
+
+class GameTemplate:
+    """A read in game that new sessions are forked from instead of reading the game in again.
+    Content (States, StateGroups and their transition tables, Actions, Directions, static ResponseStrings, aliases
+    and the name space indexes that only hold content) is shared by every fork, only the per session state
+    (locations, contents, current states, skills, achievements, happened requirements and controllers) is copied.
+    The per session state is pickled once, with the shared content pickled as references, and every fork unpickles it.
+    The template itself must not be played, play its forks.
+    """
+
+    def __init__(self, game:tuple[NameFinder, NameFinder, list[ActionRequirement], CharacterControlFactory, dict[str,Any]]):
+        self.game = game
+        self.shared = dict[int,Any]()
+        self.__find_shared()
+        self.shared_content = list(self.shared.values())
+        state = io.BytesIO()
+        _ForkPickler(state, {key: i for i, key in enumerate(self.shared.keys())}).dump(game)
+        self.state = state.getvalue()
+
+    def __is_shareable(self, value:Any, checked:dict[int,bool]) -> bool:
+        if isinstance(value, ATOMIC_TYPES) or isinstance(value, SHARED_TYPES):
+            return True
+        if id(value) in checked:
+            return checked[id(value)]
+        checked[id(value)] = False # anything that refers back to itself is not content
+        if isinstance(value, dict):
+            shareable = all([self.__is_shareable(key, checked) and self.__is_shareable(item, checked) for key, item in value.items()])
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            shareable = all([self.__is_shareable(item, checked) for item in value])
+        elif isinstance(value, (ResponseString, WordTree)):
+            shareable = all([self.__is_shareable(item, checked) for attribute, item in vars(value).items() if attribute != '__orig_class__'])
+        else:
+            shareable = False
+        checked[id(value)] = shareable
+        return shareable
+
+    def __share(self, value:Any, checked:dict[int,bool]) -> None:
+        if not isinstance(value, ATOMIC_TYPES) and self.__is_shareable(value, checked):
+            self.shared[id(value)] = value
+
+    def __find_shared(self) -> None:
+        checked = dict[int,bool]()
+        _, _, _, _, details = self.game
+        self.__share(details, checked)
+        seen = set[int]()
+        to_visit = list[Any]([self.game])
+        while len(to_visit) > 0:
+            value = to_visit.pop()
+            if isinstance(value, ATOMIC_TYPES) or id(value) in seen:
+                continue
+            seen.add(id(value))
+            if isinstance(value, SHARED_TYPES):
+                self.shared[id(value)] = value
+            elif isinstance(value, dict):
+                to_visit.extend(value.keys())
+                to_visit.extend(value.values())
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                to_visit.extend(value)
+            elif isinstance(value, NameFinder):
+                for index in value.shared_indexes():
+                    self.__share(index, checked)
+                to_visit.extend(vars(value).values())
+            elif hasattr(value, '__dict__') or len(slot_names(type(value))) > 0:
+                if isinstance(value, ResponseString):
+                    self.__share(value, checked)
+                for attribute, item in attributes_of(value).items():
+                    if attribute in SHARED_ATTRIBUTES:
+                        self.__share(item, checked)
+                    to_visit.append(item)
+
+    def fork(self) -> tuple[NameFinder, NameFinder, list[ActionRequirement], CharacterControlFactory, dict[str,Any]]:
+        """Creates a new, independent copy of the game's per session state. Returns the same tuple as read_in_game
+        """
+        return _ForkUnpickler(io.BytesIO(self.state), self.shared_content).load()
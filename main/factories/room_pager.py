@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Any
+
+from utils.relator      import NameFinder
+from models.named       import attributes_of
+from models.actors      import HasLocation, Location, LocationDetail, Actor
+from models.requirement import ActionRequirement, HappenedRequirement
+from utils.constants    import *
+
+import factories.factories as factories
+
+# Everything an unloaded Location keeps, the rest is rebuilt from its json by RoomPager.load
+UNLOADED_ATTRIBUTES = ['name', 'aliases', 'id', '_hash', 'start_location', 'pager', 'change_log', 'version']
+
+class RoomPager:
+    """Builds Locations from their json only when they are first used and can evict rooms nobody has touched back to that json.
+    Unloaded Locations stay in the name space (created by Location.unloaded) so they can still be found by name or id
+    and used as a Path end without being built.
+    """
+
+    def __init__(self, name_space:NameFinder, setup_space:NameFinder, every_turn:list[ActionRequirement], *, max_loaded:int=None):
+        self.name_space  = name_space
+        self.setup_space = setup_space
+        self.every_turn  = every_turn
+        self.max_loaded  = max_loaded
+        self.room_dicts  = dict[str,dict[str,Any]]()
+        # loaded rooms in the order they were loaded, with what loading them added and the contents they started with
+        self.loaded = OrderedDict[Location,tuple[list[HasLocation],list[ActionRequirement],dict[str,set[str]]]]()
+
+    def add_room(self, location_dict:dict[str,Any]) -> Location:
+        inputs = factories.one_from_dict_named(location_dict)
+        room = Location.unloaded(inputs['name'], self, start_location=location_dict.get('start', False), aliases=inputs['aliases'], id=inputs['id'])
+        self.room_dicts[room.get_id()] = location_dict
+        return room
+
+    def is_loaded(self, room:Location) -> bool:
+        return room in self.loaded
+
+    def __contents(self, room:Location) -> dict[str,set[str]]:
+        holders = [room] + [child for child in room.children.get_from_name() if isinstance(child, LocationDetail)] + list(room.paths.values())
+        return {holder.get_id(): {child.get_id() for child in holder.children.get_from_name()} for holder in holders}
+
+    def load(self, room:Location) -> None:
+        if room in self.loaded:
+            return
+        location_dict = self.room_dicts[room.get_id()]
+        inputs = factories.one_from_dict_location(location_dict, self.name_space, self.setup_space)
+        change_log, version = room.change_log, room.version
+        Location.__init__(room, **inputs)
+        room.change_log, room.version = change_log, version + 1
+        every_turn = list[ActionRequirement]()
+        factories.update_location(location_dict, self.name_space, every_turn)
+        self.every_turn.extend(every_turn)
+        added = list[HasLocation](room.paths.values()) + [child for child in inputs['children'] if isinstance(child, LocationDetail)]
+        if change_log is not None:
+            change_log.attach(added + [requirement for requirement in every_turn if isinstance(requirement, HappenedRequirement)])
+        self.loaded[room] = (added, every_turn, self.__contents(room))
+        if DEBUG_READIN: print(f"Loaded room {room.get_name()}")
+        if self.max_loaded is not None and len(self.loaded) > self.max_loaded:
+            self.evict_untouched(self.max_loaded)
+
+    def is_touched(self, room:Location) -> bool:
+        """A room is touched while a character is in it, once its contents differ from what it was loaded with
+        or once one of its HappenedRequirements has happened (loading it again would start them over)
+        """
+        _, every_turn, contents = self.loaded[room]
+        if self.__contents(room) != contents:
+            return True
+        if any([len(requirement.already_happened) > 0 for requirement in every_turn if isinstance(requirement, HappenedRequirement)]):
+            return True
+        to_check = list(room.children.get_from_name())
+        while len(to_check) > 0:
+            child = to_check.pop()
+            if isinstance(child, Actor):
+                return True
+            to_check.extend(child.children.get_from_name())
+        return False
+
+    def evict(self, room:Location) -> bool:
+        if room not in self.loaded or self.is_touched(room):
+            return False
+        added, every_turn, _ = self.loaded.pop(room)
+        for holder in [room] + added:
+            for child in holder.children.get_from_name():
+                if not child in added:
+                    child.parent = None
+                    child.version += 1
+        for named in added:
+            self.name_space.remove(named)
+        for requirement in every_turn:
+            self.every_turn.remove(requirement)
+        for attribute in attributes_of(room):
+            if attribute not in UNLOADED_ATTRIBUTES:
+                delattr(room, attribute)
+        if DEBUG_READIN: print(f"Evicted room {room.get_name()}")
+        return True
+
+    def evict_untouched(self, keep:int=0) -> int:
+        """Evicts the least recently loaded untouched rooms until at most keep rooms are loaded.
+        Returns the number of rooms evicted
+        """
+        evicted = 0
+        for room in list(self.loaded.keys()):
+            if len(self.loaded) <= keep:
+                break
+            if self.evict(room):
+                evicted += 1
+        return evicted
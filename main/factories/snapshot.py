@@ -0,0 +1,80 @@
+import hashlib
+import os
+import pickle
+from typing import Any
+
+from utils.relator      import NameFinder
+from models.requirement import ActionRequirement
+from utils.constants    import *
+
+from factories.factories    import CharacterControlFactory
+from factories.data_read_in import read_in_game
+
+# Bump whenever the engine classes change shape so old snapshots are rebuilt instead of loaded
+SNAPSHOT_VERSION = 9
+# Where snapshots are kept unless a snapshot_folder is given, the SNAPSHOT_FOLDER environment variable moves it
+SNAPSHOT_FOLDER  = os.environ.get('SNAPSHOT_FOLDER', "main/cache")
+
+def content_hash(game:str) -> str:
+    """Hashes every file in data/<game> (paths and contents) so any edit to the game produces a new key.
+    """
+    folder = f"{DATA_FOLDER}/{game}"
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for file in sorted(files):
+            path = os.path.join(root, file)
+            digest.update(os.path.relpath(path, folder).replace(os.sep, "/").encode())
+            with open(path, 'rb') as contents:
+                digest.update(hashlib.sha256(contents.read()).digest())
+    return digest.hexdigest()
+
+def snapshot_path(game:str, snapshot_folder:str=None) -> str:
+    return f"{SNAPSHOT_FOLDER if snapshot_folder is None else snapshot_folder}/{game}.snapshot"
+
+def __load_snapshot(path:str, digest:str) -> tuple[NameFinder, NameFinder, list[ActionRequirement], CharacterControlFactory, dict[str,Any]]|None:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as snapshot:
+            version, saved_digest = pickle.load(snapshot)
+            if version != SNAPSHOT_VERSION or saved_digest != digest:
+                if DEBUG_READIN: print(f"Snapshot {path} is stale")
+                return None
+            return pickle.load(snapshot)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError) as e:
+        print(f"Could not load snapshot {path}: {e}")
+        return None
+
+def __save_snapshot(path:str, digest:str, game:tuple) -> bool:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as snapshot:
+            pickle.dump((SNAPSHOT_VERSION, digest), snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(game, snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return True
+    except (RecursionError, pickle.PicklingError, OSError) as e:
+        print(f"Could not save snapshot {path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+def read_in_game_snapshot(game:str, *, rebuild:bool=False, snapshot_folder:str=None) -> tuple[NameFinder, NameFinder, list[ActionRequirement], CharacterControlFactory, dict[str,Any]]:
+    """Loads a game from its compiled snapshot, reading in the jsons and saving a new snapshot when
+    the snapshot is missing, was made by a different SNAPSHOT_VERSION, or data/<game> has changed since.
+    Snapshots are kept in snapshot_folder, SNAPSHOT_FOLDER when it isn't given.
+    Returns the same tuple as read_in_game.
+    """
+    digest = content_hash(game)
+    path = snapshot_path(game, snapshot_folder)
+    if not rebuild:
+        loaded = __load_snapshot(path, digest)
+        if loaded is not None:
+            if DEBUG_READIN: print(f"Loaded {game} from snapshot {path}")
+            return loaded
+    loaded = read_in_game(game)
+    if __save_snapshot(path, digest, loaded):
+        if DEBUG_READIN: print(f"Saved snapshot {path}")
+    return loaded
@@ -2,17 +2,62 @@ import sys
 
 from utils.visualize_game   import visualize_game
 from controls.game_control  import GameState
-from factories.data_read_in import read_in_game
+from factories.snapshot     import read_in_game_snapshot
 from models.actors          import Actor
 
 def main(args:list[str]):
+    # the tools below are imported only when asked for so playing doesn't pay for loading them
     if len(args) > 0:
         if args[0] in ['visualize','v','vis']:
             visualize_game(args[1])
             return
+        if args[0] in ['batch']:
+            from controls.batch_runner import run_batch
+            run_batch(args[1], args[2], args[3], workers=int(args[4]) if len(args) > 4 else 1)
+            return
+        if args[0] in ['serve']:
+            from controls.game_server import run_server
+            if len(args) > 2 and not args[2].isdigit():
+                run_server(args[1], path=args[2])
+            else:
+                run_server(args[1], port=int(args[2]) if len(args) > 2 else 8765)
+            return
+        if args[0] in ['load']:
+            from benchmarks.server_load import run_load
+            run_load(args[1], levels=[int(arg) for arg in args[2:]] if len(args) > 2 else None)
+            return
+        if args[0] in ['bench', 'benchmark']:
+            from benchmarks.engine import run_benchmarks
+            flagged = run_benchmarks(args[1] if len(args) > 1 else None, args[2] if len(args) > 2 else None)
+            sys.exit(1 if len(flagged) > 0 else 0)
+        if args[0] in ['generate']:
+            from utils.generate_game import generate_game, STRESS_SETTINGS
+            from utils.constants     import DATA_FOLDER
+            print(generate_game(DATA_FOLDER, args[1], STRESS_SETTINGS, seed=int(args[2]) if len(args) > 2 else 0))
+            return
+        if args[0] in ['freeze']:
+            from benchmarks.name_index import compare_freeze
+            compare_freeze(*[int(arg) for arg in args[1:3]])
+            return
+        if args[0] in ['objects']:
+            from benchmarks.object_model import compare_object_model
+            compare_object_model(*[int(arg) for arg in args[1:3]])
+            return
+        if args[0] in ['children']:
+            from benchmarks.object_model import compare_children
+            compare_children(*[int(arg) for arg in args[1:3]])
+            return
+        if args[0] in ['fuzzy']:
+            from benchmarks.name_index import time_fuzzy
+            time_fuzzy(*[int(arg) for arg in args[1:3]])
+            return
+        if args[0] in ['ingestion']:
+            from benchmarks.ingestion import compare_ingestion
+            compare_ingestion(*[int(arg) for arg in args[1:3]])
+            return
     #game_name = input("Which game do you want to play? ")
     game_name = 'aagame1'
-    name_space, _, every_turn, controllers, details = read_in_game(game_name)
+    name_space, _, every_turn, controllers, details = read_in_game_snapshot(game_name)
     players = 1
     while 0 and (players < details['min_players'] or players > details['max_players']):
         players = int(input("How many players are playing? "))
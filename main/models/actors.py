@@ -1,12 +1,16 @@
 from typing import Optional, TYPE_CHECKING
 import random
 
+if TYPE_CHECKING:
+    from factories.room_pager import RoomPager
+
 from models.state       import State, Skill, FullState, SkillSet, Achievement
 from models.named       import Named, Action, Direction
-from models.requirement import ActionRequirement, ItemPlacementRequirement
+from models.requirement import ActionRequirement, ItemPlacementRequirement, dependencies_of, placement_dependencies
 from models.response    import ResponseString, StaticResponse, CombinationResponse
 from utils.constants    import *
-from utils.relator      import NameFinder
+from utils.relator      import NameFinder, ChildCollection
+from utils.change_log   import ChangeLog
 
 # HELPERS
 
@@ -35,15 +39,22 @@ class ItemLimit:
                (self.weight_limit is None or self.weight_limit >= get_total_weight(items)) and \
                (self.value_limit  is None or self.value_limit  >= get_total_value(items))
 
-    def can_add(self, item:'HasLocation', items:list['HasLocation']):
-        return (self.size_limit   is None or self.size_limit   >= get_total_size(items)   + item.get_size())   and \
-               (self.weight_limit is None or self.weight_limit >= get_total_weight(items) + item.get_weight()) and \
-               (self.value_limit  is None or self.value_limit  >= get_total_value(items)  + item.get_value())
+    def can_add(self, item:'HasLocation', holder:'HasLocation'):
+        weight, value, size = holder._contents_totals()
+        return (self.size_limit   is None or self.size_limit   >= size   + item.get_size())   and \
+               (self.weight_limit is None or self.weight_limit >= weight + item.get_weight()) and \
+               (self.value_limit  is None or self.value_limit  >= value  + item.get_value())
 
 class HasLocation(Named):
+    __slots__ = ('parent', 'children', 'origin_parent', 'hidden', 'item_limit', 'visible_requirements', 'item_responses', 'change_log', '_contents',
+                 'version', '_visible')
 
     def __init__(self, name:str, *, hidden=False, parent:'HasLocation'=None, children:'list[HasLocation]'=None, origin:bool=False, item_limit:ItemLimit=None, visible_requirements:list[ActionRequirement]=None, item_responses:dict['HasLocation',str]=None, aliases:list[str]=None, id:str=None):
         super().__init__(name, aliases, id)
+        self.change_log:ChangeLog = None
+        self._contents:list[float] = None
+        self.version = 0 # goes up whenever the state, place or achievements of self change
+        self._visible:dict[Actor,tuple[bool,tuple]] = None
         self.parent = parent
         self._set_children(children)
         self.origin_parent = parent if origin else None
@@ -53,6 +64,11 @@ class HasLocation(Named):
         self.visible_requirements = list[ActionRequirement]() if visible_requirements is None else visible_requirements
         self.item_responses = dict[HasLocation,ResponseString]() if item_responses is None else item_responses
 
+    def __getstate__(self) -> tuple[dict|None,dict]:
+        state, slots = super().__getstate__()
+        slots['_visible'] = None # remembered again as it is needed
+        return state, slots
+
     # GETTERS
 
     def get_description_to(self, character:'Actor') -> ResponseString:
@@ -66,55 +82,99 @@ class HasLocation(Named):
         return self.children.get_from_id(child_id)
     
     def get_special_child(self, child_name:str) -> 'HasLocation':
-        if child_name in ['on','inside','inventory','wearing']:
-            try:
-                found = self.children.get_from_name(child_name)
-            except KeyError:
-                found = []
-            if len(found) == 1:
-                return found[0]
-        return None
+        return self.children.get_special(child_name)
     
     def get_top_parent(self) -> 'HasLocation':
-        if self.parent is None:
-            return self
-        return self.parent.get_top_parent()
+        holder = self
+        while holder.parent is not None:
+            holder = holder.parent
+        return holder
     
     def is_in(self, location:'HasLocation') -> bool:
-        if self == location:
-            return True
-        if self.parent is None:
-            return False
-        return self.parent.is_in(location)
+        holder = self
+        while holder is not None:
+            if holder == location:
+                return True
+            holder = holder.parent
+        return False
     
     def get_weight(self) -> float:
-        return sum([child.get_weight() for child in self.children.get_from_name()])
+        return self._contents_totals()[0]
     
     def get_value(self) -> float:
-        return sum([child.get_value() for child in self.children.get_from_name()])
+        return self._contents_totals()[1]
     
     def get_size(self) -> float:
-        return sum([child.get_size() for child in self.children.get_from_name()])
+        return self._contents_totals()[2]
+
+    # CONTENTS TOTALS
+
+    def _contents_totals(self) -> list[float]:
+        """The weight, value and size of everything in children. Summed the first time they are needed, after that
+        every move adds its difference to the totals of the containers above it (see _add_to_contents).
+        """
+        if self._contents is None:
+            self._contents = [0.0, 0.0, 0.0]
+            for child in self.children.get_from_name():
+                self._contents[0] += child.get_weight()
+                self._contents[1] += child.get_value()
+                self._contents[2] += child.get_size()
+        return self._contents
+
+    def _add_to_contents(self, weight:float, value:float, size:float) -> None:
+        # once a container has its totals so does everything in it, so there is nothing above one without them to update
+        holder = self
+        while holder is not None and holder._contents is not None and (weight != 0 or value != 0 or size != 0):
+            holder._contents[0] += weight
+            holder._contents[1] += value
+            holder._contents[2] += size
+            if isinstance(holder, Target): # a Target's size is its own, whatever it holds
+                size = 0
+            holder = holder.parent
+
+    def _child_added(self, child:'HasLocation') -> None:
+        if self._contents is not None:
+            self._add_to_contents(child.get_weight(), child.get_value(), child.get_size())
+
+    def _child_removed(self, child:'HasLocation') -> None:
+        if self._contents is not None:
+            self._add_to_contents(-child.get_weight(), -child.get_value(), -child.get_size())
+
+    def _forget_contents(self) -> None:
+        """For when children is changed directly, the totals of self and everything above it are summed again when next needed"""
+        holder = self
+        while holder is not None and holder._contents is not None:
+            holder._contents = None
+            holder = holder.parent
 
     # SET LOCATION
 
     def _set_children(self, children:list['HasLocation']=None) -> None:
-        self.children = NameFinder['HasLocation']()
+        self.children = ChildCollection['HasLocation']()
         if children is not None:
             self.children.add_many(children)
         for child in self.children.get_from_name():
+            # something is only ever in one place, the parents are what containment checks follow
+            if child.parent is not None and child.parent is not self and child.parent.children.remove(child):
+                child.parent._forget_contents()
             child.parent = self
+            child.version += 1
+        self._forget_contents()
 
     def set_location(self, parent:'HasLocation', *, origin=False) -> None:
         if self.parent is not None:
             self.parent.remove_child(self)
         self.parent = parent
-        self.parent.children.add(self)
+        self.version += 1
+        if self.parent.children.add(self):
+            self.parent._child_added(self)
         if origin:
             self.origin_parent = parent
+        if self.change_log is not None:
+            self.change_log.moved_item(self)
 
     def add_child(self, child:'HasLocation') -> tuple[bool,ResponseString]:
-        if self.item_limit.can_add(child, list(self.children.get_from_name())):
+        if self.item_limit.can_add(child, self):
             response=[]
             if not child.parent == self:
                 success=True
@@ -125,6 +185,10 @@ class HasLocation(Named):
                 if success:
                     self.children.add(child)
                     child.parent = self
+                    child.version += 1
+                    self._child_added(child)
+                    if child.change_log is not None:
+                        child.change_log.moved_item(child)
                     r2 = self.item_responses.get(child, None)
                     if r2 is not None:
                         response.append(r2)
@@ -134,44 +198,70 @@ class HasLocation(Named):
         return False, StaticResponse(f"The {child.get_name()} doesn't fit.")
 
     def remove_child(self, child:'HasLocation') -> tuple[bool,ResponseString]:
-        return self.children.remove(child), None
+        if self.children.remove(child):
+            self._child_removed(child)
+            if child.parent is self:
+                child.parent = None
+            child.version += 1
+            if child.change_log is not None:
+                child.change_log.moved_item(child)
+            return True, None
+        return False, None
     
     # VISIBILITY
+    # Whether self is visible to a character is remembered with the version of everything its requirements read
+    # (see ActionRequirement.dependencies) and used again until one of those changes
     
     def is_visible_to(self, character:'Actor') -> bool:
         if self.hidden:
             return False
-        if len(self.visible_requirements) == 0:
+        if not self._visibility_varies():
             return True
+        remembered = None if self._visible is None else self._visible.get(character, None)
+        if remembered is not None and all([needed.version == version for needed, version in remembered[1]]):
+            return remembered[0]
+        visible = self._check_visible(character)
+        dependencies = self._visibility_dependencies(character)
+        if dependencies is not None:
+            if self._visible is None:
+                self._visible = dict[Actor,tuple[bool,tuple]]()
+            self._visible[character] = (visible, tuple([(needed, needed.version) for needed in dependencies]))
+        return visible
+
+    def _visibility_varies(self) -> bool:
+        return len(self.visible_requirements) > 0
+
+    def _check_visible(self, character:'Actor') -> bool:
         return all([requirement.meets_requirement(character)[0] for requirement in self.visible_requirements])
+
+    def _visibility_dependencies(self, character:'Actor') -> list|None:
+        return dependencies_of(self.visible_requirements, character)
     
     # CHECK CONTENTS
+    # The parents are the containment index (set_location/add_child/remove_child keep them matching the children),
+    # so whether something is inside self is found by walking up from it, which costs as much as it is deep
+
+    def _path_from(self, item:'HasLocation') -> list['HasLocation']|None:
+        """item and the holders between it and self, None when item is not inside self"""
+        path = list[HasLocation]()
+        holder = item if isinstance(item, HasLocation) else None
+        while holder is not None and holder is not self:
+            path.append(holder)
+            holder = holder.parent
+        return None if holder is None else path
 
     def contains_item(self, item:'HasLocation') -> bool:
-        if self.children.contains(item):
-            return True
-        for child in self.children.get_from_name():
-            if child.contains_item(item):
-                return True
-        return False
+        path = self._path_from(item)
+        return path is not None and len(path) > 0
     
     def contains_item_visible_to(self, item:'HasLocation', character:'Actor') -> bool:
-        if self.is_visible_to(character):
-            if item == self:
-                return True
-            for child in self.children.get_from_name():
-                if child.contains_item_visible_to(item, character):
-                    return True
-        return False
+        path = self._path_from(item)
+        return path is not None and self.is_visible_to(character) and all([holder.is_visible_to(character) for holder in path])
     
     def list_contents_visible_to(self, character:'Actor') -> list['HasLocation']:
         if self.is_visible_to(character):
-            try:
-                inside = self.children.get_from_name('inside')
-            except KeyError:
-                inside = []
-            if len(inside) == 1:
-                inside = inside[0]
+            inside = self.children.get_special('inside')
+            if inside is not None:
                 if inside.is_visible_to(character):
                     return [grandchild for grandchild in inside.children.get_from_name() if grandchild.is_visible_to(character)]
             else:
@@ -179,6 +269,7 @@ class HasLocation(Named):
         return list[HasLocation]()
 
 class LocationDetail(HasLocation):
+    __slots__ = ('description',)
 
     def __init__(self, name:str="default", description:ResponseString=None, *, hidden:bool=False, parent:'HasLocation'=None, children:list[HasLocation]=None, origin:bool=False, item_limit:ItemLimit=None, visible_requirements:list[ActionRequirement]=None, item_responses:dict['HasLocation',ResponseString]=None, aliases:list[str]=None, id:str=None):
         super().__init__(name, hidden=hidden, parent=parent, children=children, origin=origin, item_limit=item_limit, visible_requirements=visible_requirements, item_responses=item_responses, aliases=aliases, id=id)
@@ -198,6 +289,8 @@ class LocationDetail(HasLocation):
 # PATHS/LOCATION DETAILS
 
 class Path(HasLocation):
+    __slots__ = ('description', 'exit_response', 'passing_requirements', 'hidden_when_locked')
+
     def __init__(self, name:str, description:ResponseString, *, parent:'HasLocation'=None, children:list[HasLocation]=None, origin:bool=False, item_limit:ItemLimit=None, visible_requirements:list[ActionRequirement]=None, item_responses:dict['HasLocation',str]=None, passing_requirements:list[ActionRequirement]=None, hidden_when_locked:bool=False, exit_response:ResponseString=None, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, parent=parent, children=children, origin=origin, item_limit=item_limit, visible_requirements=visible_requirements, item_responses=item_responses, aliases=aliases, id=id)
         self.description = description
@@ -219,12 +312,22 @@ class Path(HasLocation):
     def get_end(self, character:'Actor') -> 'Location':
         pass
     
-    def is_visible_to(self, character) -> bool:
-        if not super().is_visible_to(character):
-            return False
-        if self.hidden_when_locked and not self.can_pass(character):
-            return False
-        return True
+    def _visibility_varies(self) -> bool:
+        return super()._visibility_varies() or self.hidden_when_locked
+
+    def _check_visible(self, character:'Actor') -> bool:
+        return super()._check_visible(character) and not (self.hidden_when_locked and not self.can_pass(character)[0])
+
+    def _visibility_dependencies(self, character:'Actor') -> list|None:
+        dependencies = super()._visibility_dependencies(character)
+        if dependencies is None or not self.hidden_when_locked:
+            return dependencies
+        passing = self._passing_dependencies(character)
+        return None if passing is None else dependencies + passing
+
+    def _passing_dependencies(self, character:'Actor') -> list|None:
+        """What can_pass (and get_end) read for character, see ActionRequirement.dependencies"""
+        return dependencies_of(self.passing_requirements, character)
     
     def _set_end(self, name_space:NameFinder) -> None:
         for requirement in self.passing_requirements:
@@ -243,11 +346,17 @@ class Path(HasLocation):
         return True, self.exit_response
 
 class MultiEndPath(Path):
+    __slots__ = ('multi_end', 'default_end')
+
     def __init__(self, name:str, description:ResponseString, *, end:'Location', multi_end:dict['Target','Location'], parent:'HasLocation'=None, children:list[HasLocation]=None, origin:bool=False, item_limit:ItemLimit=None, visible_requirements:list[ActionRequirement]=None, item_responses:dict['HasLocation',ResponseString]=None, passing_requirements:list[ActionRequirement]=None, hidden_when_locked:bool=False, exit_response:ResponseString=None, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, description, parent=parent, children=children, origin=origin, item_limit=item_limit, passing_requirements=passing_requirements, visible_requirements=visible_requirements, item_responses=item_responses, hidden_when_locked=hidden_when_locked, exit_response=exit_response, aliases=aliases, id=id)
         self.multi_end = multi_end
         self.default_end = end
 
+    def _passing_dependencies(self, character:'Actor') -> list|None:
+        dependencies = super()._passing_dependencies(character)
+        return None if dependencies is None else dependencies + [holder for item in self.multi_end.keys() for holder in placement_dependencies(item)]
+
     def _list_ends(self) -> list['Location']:
         ends = list(self.multi_end.values())
         if self.default_end is not None:
@@ -277,6 +386,7 @@ class MultiEndPath(Path):
         return None
 
 class SingleEndPath(Path):
+    __slots__ = ('end',)
 
     def __init__(self, name:str, description:ResponseString, *, end:'Location', parent:'HasLocation'=None, children:list[HasLocation]=None, origin:bool=False, item_limit:ItemLimit=None, visible_requirements:list[ActionRequirement]=None, item_responses:dict['HasLocation',ResponseString]=None, passing_requirements:list[ActionRequirement]=None, hidden_when_locked:bool=False, exit_response:ResponseString=None, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, description, parent=parent, children=children, origin=origin, item_limit=item_limit, passing_requirements=passing_requirements, visible_requirements=visible_requirements, item_responses=item_responses, hidden_when_locked=hidden_when_locked, exit_response=exit_response, aliases=aliases, id=id)
@@ -299,6 +409,7 @@ class SingleEndPath(Path):
 # TARGETS
 
 class Target(HasLocation):
+    __slots__ = ('description', 'states', 'weight', 'size', 'value', 'target_responses', 'tool_responses', 'state_responses')
 
     def __init__(self, name:str, description:ResponseString, states:FullState, *, weight:float=None, size:float=None, value:float=None, target_responses:Optional[dict[Action,ResponseString]]=None, tool_responses:Optional[dict['Action',ResponseString]]=None, state_responses:Optional[dict[State,ResponseString]]=None, parent:'HasLocation'=None, children:list[HasLocation]=None, origin:bool=False, visible_requirements:list[ActionRequirement]=None, item_responses:dict['HasLocation',ResponseString]=None, aliases:Optional[str]=None, id:str=None):
         super().__init__(name, parent=parent, children=children, origin=origin, visible_requirements=visible_requirements, item_responses=item_responses, aliases=aliases, id=id)
@@ -327,7 +438,7 @@ class Target(HasLocation):
     def remove_child(self, child:HasLocation) -> tuple[bool,ResponseString]:
         return False, None
 
-    def get_weight(self):
+    def get_weight(self) -> float:
         return super().get_weight() + self.weight
 
     def get_value(self) -> float:
@@ -372,6 +483,9 @@ class Target(HasLocation):
     def perform_action_as_target(self, action:Action) -> ResponseString:
         response = list[ResponseString]()
         new_states = self.states.perform_action_as_target(action)
+        self.version += 1
+        if self.change_log is not None:
+            self.change_log.changed_state(self)
         for new_state in new_states:
             if DEBUG_RESPONSE: print(f"Target: {self.name} {action} {new_state} {self.state_responses}")
             if new_state in self.state_responses:
@@ -381,12 +495,16 @@ class Target(HasLocation):
     def perform_action_as_tool(self, action:Action) -> list[ResponseString]:
         response = list[ResponseString]()
         new_states = self.states.perform_action_as_tool(action)
+        self.version += 1
+        if self.change_log is not None:
+            self.change_log.changed_state(self)
         for new_state in new_states:
             if new_state in self.state_responses:
                 response.append(self.state_responses[new_state])
         return CombinationResponse(response, joiner="\n")
 
 class Actor(Target):
+    __slots__ = ('actor_responses', 'type', 'skills', 'achievements')
 
     def __init__(self, name:str, description:ResponseString, type:str, states:FullState, skills:SkillSet, *, achievements:set[Achievement]=None, weight:float=None, size:float=None, value:float=None, actor_responses:Optional[dict['Action',ResponseString]]=None, target_responses:Optional[dict['Action',ResponseString]]=None, tool_responses:Optional[dict['Action',ResponseString]]=None, state_responses:Optional[dict[State,ResponseString]]=None, aliases:Optional[list[str]]=None, parent:'HasLocation'=None, children:list[HasLocation]=None, origin:bool=False, visible_requirements:list[ActionRequirement]=None, item_responses:dict['HasLocation',ResponseString]=None, id:str=None):
         super().__init__(name, description, states, weight=weight, size=size, value=value, target_responses=target_responses, tool_responses=tool_responses, state_responses=state_responses, parent=parent, children=children, origin=origin, visible_requirements=visible_requirements, item_responses=item_responses, aliases=aliases, id=id)
@@ -396,9 +514,9 @@ class Actor(Target):
         self.achievements = set[Achievement]() if achievements is None else achievements
 
         if self.get_inventory() is None:
-            self.children.add(LocationDetail(name='inventory', description=StaticResponse(f"{name}'s inventory"), hidden=True))
+            self.children.add(LocationDetail(name='inventory', description=StaticResponse(f"{name}'s inventory"), hidden=True, parent=self))
         if self.get_inventory(inventory='wearing') is None:
-            self.children.add(LocationDetail(name='wearing', description=StaticResponse(f"{name}'s wearing"), hidden=True))
+            self.children.add(LocationDetail(name='wearing', description=StaticResponse(f"{name}'s wearing"), hidden=True, parent=self))
 
     def __repr__(self):
         return f"[Actor {self.name}]"
@@ -414,9 +532,13 @@ class Actor(Target):
         return self.skills.get_proficiency(skill)
     
     def practice_skill(self, skill:Skill, amount:int=1) -> int:
+        if self.change_log is not None:
+            self.change_log.changed_skill(self)
         return self.skills.practice_skill(skill, amount)
     
     def lose_proficiency(self, skill:Skill, amount:int=1) -> int:
+        if self.change_log is not None:
+            self.change_log.changed_skill(self)
         return self.skills.lose_proficiency(skill, amount)
 
     # ACTIONS
@@ -434,6 +556,9 @@ class Actor(Target):
         if action in self.actor_responses:
             response.append(self.actor_responses[action])
         new_states = self.states.perform_action_as_actor(action)
+        self.version += 1
+        if self.change_log is not None:
+            self.change_log.changed_state(self)
         for new_state in new_states:
             if new_state in self.actor_responses:
                 response.append(self.actor_responses[new_state])
@@ -446,6 +571,9 @@ class Actor(Target):
     
     def complete_achievement(self, achievement:Achievement) -> None:
         self.achievements.add(achievement)
+        self.version += 1
+        if self.change_log is not None:
+            self.change_log.completed_achievement(self)
 
     # INVENTORY
 
@@ -473,6 +601,7 @@ class Actor(Target):
 # LOCATIONS
 
 class Location(HasLocation):
+    __slots__ = ('description', 'paths', 'direction_responses', 'action_restrictions', 'start_location', 'pager')
 
     def __init__(self, name:str, description:ResponseString, paths:dict[Direction,Path], *, action_restrictions:dict[Action,list[ActionRequirement]]=None, direction_responses:dict[Direction,ResponseString]=None, start_location:bool=False, parent:'HasLocation'=None, children:list[HasLocation]=None, origin:bool=False, item_limit:ItemLimit=None, visible_requirements:list[ActionRequirement]=None, item_responses:dict['HasLocation',ResponseString]=None, aliases:Optional[str]=None, id:str=None):
         super().__init__(name, parent=parent, children=children, origin=origin, item_limit=item_limit, visible_requirements=visible_requirements, item_responses=item_responses, aliases=aliases, id=id)
@@ -485,6 +614,29 @@ class Location(HasLocation):
     def __repr__(self):
         return f"[Location {self.name}]"
 
+    @staticmethod
+    def unloaded(name:str, pager:'RoomPager', *, start_location:bool=False, aliases:Optional[list[str]]=None, id:str=None) -> 'Location':
+        """Creates a Location that only knows its names. Its paths, details and contents are built by pager the first time anything else is used.
+        """
+        location = Location.__new__(Location)
+        Named.__init__(location, name, aliases, id)
+        location.start_location = start_location
+        location.pager = pager
+        location.change_log = None
+        location.version = 0
+        return location
+
+    def __getattr__(self, attribute:str):
+        # Only called when attribute is missing: the Location is unloaded (or was evicted) so load it first
+        try:
+            pager = object.__getattribute__(self, 'pager')
+        except AttributeError:
+            pager = None
+        if pager is None or attribute.startswith('__'):
+            raise AttributeError(f"'Location' object has no attribute '{attribute}'")
+        pager.load(self)
+        return object.__getattribute__(self, attribute)
+
     def action_allowed(self, character:Actor, action:Action) -> tuple[bool,ResponseString]:
         if action in self.action_restrictions:
             for requirement in self.action_restrictions[action]:
@@ -511,9 +663,10 @@ class Location(HasLocation):
     def can_interact_with(self, character:Actor, item:Target) -> bool:
         if character.contains_item(item):
             return True
-        for child in self.children.get_from_name():
-            if DEBUG_TAKE: print(f"{child} has {item}?")
-            if child.contains_item_visible_to(item, character):
+        path = self._path_from(item)
+        if path is not None and len(path) > 0:
+            if DEBUG_TAKE: print(f"{path[-1]} has {item}?")
+            if path[-1].contains_item_visible_to(item, character):
                 if DEBUG_TAKE: print("yes")
                 return True
             if DEBUG_TAKE: print("no")
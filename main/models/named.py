@@ -1,23 +1,62 @@
 from typing import Optional, Any
+from functools import cache
+import sys
+
+def _restore_named(cls:type, id:str) -> 'Named':
+    """Recreates a Named with its id already set so it can be hashed while the rest of its state is being unpickled."""
+    named = cls.__new__(cls)
+    named.id = sys.intern(id)
+    named._hash = hash(named.id)
+    return named
+
+@cache
+def slot_names(cls:type) -> tuple[str,...]:
+    """Every attribute the __slots__ of cls and its bases declare"""
+    return tuple(name for base in reversed(cls.__mro__) for name in base.__dict__.get('__slots__', ()))
+
+def _set_slots(obj:Any) -> dict[str,Any]:
+    slots = dict[str,Any]()
+    for name in slot_names(type(obj)):
+        try:
+            slots[name] = object.__getattribute__(obj, name)
+        except AttributeError:
+            pass
+    return slots
+
+def attributes_of(obj:Any) -> dict[str,Any]:
+    """The attributes obj has set, vars only sees the ones that are not in __slots__"""
+    return getattr(obj, '__dict__', {}) | _set_slots(obj)
 
 class Named:
+    # Named objects are dict and set keys everywhere, so their ids are interned and lowercased once and their hash is kept
+    __slots__ = ('name', 'aliases', 'id', '_hash')
 
     def __init__(self, name:str, aliases:Optional[list[str]]=None, id:str=None):
         self.name = name
         self.aliases = [name.lower()] if aliases is None else [alias.lower() for alias in aliases]
         if name.lower() not in self.aliases:
             self.aliases.append(name.lower())
-        self.id = name if id is None else id # f"{name} ({str(type(self)).split(".")[-1][:-2]})" if id is None else id
-        self.id = self.id.lower()
+        self.id = sys.intern((name if id is None else id).lower())
+        self._hash = hash(self.id)
 
     def __repr__(self):
         return f"[Named: {self.name}]"
 
     def __eq__(self, other):
-        return isinstance(other, Named) and other.id.lower() == self.id.lower()
+        return self is other or isinstance(other, Named) and other.id == self.id
     
     def __hash__(self):
-        return hash(self.id.lower())
+        return self._hash
+
+    def __getstate__(self) -> tuple[dict|None,dict]:
+        slots = _set_slots(self)
+        # _restore_named sets the id and hash, string hashes differ between processes so the hash is never pickled
+        slots.pop('id', None)
+        slots.pop('_hash', None)
+        return getattr(self, '__dict__', None), slots
+
+    def __reduce_ex__(self, protocol):
+        return _restore_named, (type(self), self.id), self.__getstate__()
 
     def get_name(self) -> str:
         return self.name
@@ -31,6 +70,7 @@ class Named:
 class Action(Named):
     """Base class for an Action that a Character can make
     """
+    __slots__ = ('is_default',)
 
     def __init__(self, name:str, *, aliases:Optional[list[str]]=None, is_default:bool=False, id:str=None):
         super().__init__(name, aliases, id)
@@ -45,6 +85,8 @@ class Action(Named):
 class Direction(Named):
     """The Directions a Character can move to get from Room to Room.
     """
+    __slots__ = ()
+
     def __init__(self, name:str, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, aliases, id)
 
@@ -3,35 +3,92 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from models.actors import Actor, Target, HasLocation
     from models.state  import State, Achievement
+    from utils.change_log import ChangeLog
 from models.response   import ResponseString
 
+def placement_dependencies(item:'HasLocation') -> list['HasLocation']:
+    """item and everything it is in, where item is depends on where each of them is"""
+    holders = list['HasLocation']()
+    while item is not None:
+        holders.append(item)
+        item = item.parent
+    return holders
+
+def dependencies_of(requirements:list['ActionRequirement'], character:'Actor') -> list|None:
+    """Everything the requirements read for character (see ActionRequirement.dependencies), None when any of them doesn't know"""
+    dependencies = list()
+    for requirement in requirements:
+        needs = requirement.dependencies(character)
+        if needs is None:
+            return None
+        dependencies.extend(needs)
+    return dependencies
+
 class ActionRequirement():
     def meets_requirement(self, character:'Actor') -> tuple[bool,ResponseString]:
         pass
 
+    def dependencies(self, character:'Actor') -> list|None:
+        """The objects meets_requirement reads for character, each has a version that goes up whenever it changes.
+        None when they are not known, then nothing that depends on this requirement can be remembered.
+        """
+        return None
+
     def _check_every_turn(self, character:'Actor') -> None:
         pass
 
+class AllRequirement(ActionRequirement):
+    """Met when every one of requirements is, answers with the response of the first that isn't"""
+    def __init__(self, requirements:list[ActionRequirement]):
+        self.requirements = requirements
+
+    def meets_requirement(self, character:'Actor') -> tuple[bool,ResponseString]:
+        for requirement in self.requirements:
+            met, response = requirement.meets_requirement(character)
+            if not met:
+                return False, response
+        return True, None
+
+    def dependencies(self, character:'Actor') -> list|None:
+        return dependencies_of(self.requirements, character)
+
 class HappenedRequirement(ActionRequirement):
-    def __init__(self, requirement:ActionRequirement, *, yes_response:ResponseString=None, no_response:ResponseString=None):
+    change_log:'ChangeLog' = None
+
+    def __init__(self, requirement:ActionRequirement, *, yes_response:ResponseString=None, no_response:ResponseString=None, id:str=None):
         self.requirement = requirement
         self.already_happened = set['Actor']()
         self.yes_response = yes_response
         self.no_response = no_response
+        self.id = id
+        self.version = 0
+
+    def _happened(self, character:'Actor') -> None:
+        if character in self.already_happened:
+            return
+        self.already_happened.add(character)
+        self.version += 1
+        if self.change_log is not None:
+            self.change_log.requirement_happened(self)
 
     def _check_every_turn(self, character:'Actor') -> None:
-        if self.requirement.meets_requirement(character):
-            self.already_happened.add(character)
+        if character not in self.already_happened and self.requirement.meets_requirement(character)[0]:
+            self._happened(character)
 
     def meets_requirement(self, character:'Actor') -> tuple[bool,ResponseString]:
-        # TODO: how do I check this every turn - idea 1: make requirement item state -> don't need character, idea 2: check for each character
         if character in self.already_happened:
             return True, self.yes_response
-        if self.requirement.meets_requirement(character):
-            self.already_happened.add(character)
+        if self.requirement.meets_requirement(character)[0]:
+            self._happened(character)
             return True, self.yes_response
         return False, self.no_response
 
+    def dependencies(self, character:'Actor') -> list|None:
+        if character in self.already_happened:
+            return [self]
+        dependencies = self.requirement.dependencies(character)
+        return None if dependencies is None else [self] + dependencies
+
 class CharacterStateRequirement(ActionRequirement):
     def __init__(self, states_needed:dict['State',tuple[bool,ResponseString]]):
         self.states_needed = states_needed
@@ -42,6 +99,9 @@ class CharacterStateRequirement(ActionRequirement):
             if not (state in character.get_current_state()) == needed:
                 return False, response
         return True, None
+
+    def dependencies(self, character:'Actor') -> list|None:
+        return [character]
     
 class CharacterAchievementRequirement(ActionRequirement):
     def __init__(self, achievements_needed:dict['Achievement',tuple[bool,ResponseString]]):
@@ -53,6 +113,9 @@ class CharacterAchievementRequirement(ActionRequirement):
             if not character.has_completed_achievement(achievement) == needed:
                 return False, response
         return True, None
+
+    def dependencies(self, character:'Actor') -> list|None:
+        return [character]
     
 class ItemStateRequirement(ActionRequirement):
     def __init__(self, item_states:dict['Target',dict['State',tuple[bool,ResponseString]]]):
@@ -65,6 +128,9 @@ class ItemStateRequirement(ActionRequirement):
                 if not (state in item.get_current_state()) == needed:
                     return False, response
         return True, None
+
+    def dependencies(self, character:'Actor') -> list|None:
+        return list(self.item_states_needed.keys())
     
 class ItemsHeldRequirement(ActionRequirement):
     def __init__(self, items_needed:dict['Target',tuple[bool,ResponseString]]):
@@ -76,6 +142,9 @@ class ItemsHeldRequirement(ActionRequirement):
             if not character.contains_item(item) == needed:
                 return False, response
         return True, None
+
+    def dependencies(self, character:'Actor') -> list|None:
+        return [holder for item in self.items_needed.keys() for holder in placement_dependencies(item)]
     
 class WearingRequirement(ActionRequirement):
     def __init__(self, items_needed:dict['Target',tuple[bool,ResponseString]]):
@@ -87,6 +156,9 @@ class WearingRequirement(ActionRequirement):
             if not character.is_wearing(item) == needed:
                 return False, response
         return True, None
+
+    def dependencies(self, character:'Actor') -> list|None:
+        return [holder for item in self.items_needed.keys() for holder in placement_dependencies(item)]
     
 class ItemPlacementRequirement(ActionRequirement):
     def __init__(self, item_placements:dict['Target',list[tuple['HasLocation',bool,ResponseString]]]):
@@ -98,3 +170,6 @@ class ItemPlacementRequirement(ActionRequirement):
                 if not (item.is_in(location) == needed):
                     return False, response
         return True, None
+
+    def dependencies(self, character:'Actor') -> list|None:
+        return [holder for item in self.item_placements.keys() for holder in placement_dependencies(item)]
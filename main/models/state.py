@@ -7,7 +7,8 @@ from models.named import Action, Named
 # To add update: class, factory, json, other classes
 
 class Effect(Named):
-    
+    __slots__ = ()
+
     def __init__(self, name:str, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, aliases, id)
 
@@ -15,6 +16,8 @@ class Effect(Named):
         return f"[Effect {self.name}]"
     
 class Achievement(Named):
+    __slots__ = ()
+
     def __init__(self, name:str, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, aliases, id)
 
@@ -71,6 +74,7 @@ class State:
         return action in self.actions_as_tool
 
 class StateGroup(Named):
+    __slots__ = ('states',)
 
     def __init__(self, name:str, states:list[State], aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, aliases, id)
@@ -107,6 +111,7 @@ class StateGroup(Named):
         return any([state.can_act_as_tool(action) for state in self.states])
 
 class StateGraph(Named):
+    __slots__ = ('current_state', 'time_in_state', 'target_graph', 'actor_graph', 'tool_graph', 'time_graph')
 
     def __init__(self, name:str, current_state:StateGroup, target_graph:dict[StateGroup,dict[Action,StateGroup]]=None, tool_graph:dict[StateGroup,dict[Action,StateGroup]]=None, actor_graph:dict[StateGroup,dict[Action,StateGroup]]=None, time_graph:dict[StateGroup,tuple[int,StateGroup]]=None, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, aliases, id)
@@ -176,6 +181,7 @@ class StateGraph(Named):
         return []
 
 class FullState(Named):
+    __slots__ = ()
 
     def time_passes(self, time:int) -> list[tuple[bool,State]]:
         pass
@@ -220,6 +226,7 @@ class FullState(Named):
         pass
 
 class StateDisconnectedGraph(FullState):
+    __slots__ = ('state_graphs',)
 
     def __init__(self, name:str, state_graphs:list[StateGraph], aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, aliases, id)
@@ -268,7 +275,8 @@ class StateDisconnectedGraph(FullState):
         return [state for graph in self.state_graphs for state in graph.perform_action_as_tool(action)]
 
 class Skill(Named):
-    
+    __slots__ = ()
+
     def __init__(self, name:str, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, aliases, id)
 
@@ -276,6 +284,7 @@ class Skill(Named):
         return f"[Skill {self.name}]"
 
 class SkillSet(Named):
+    __slots__ = ('skills', 'default_proficiency')
 
     def __init__(self, name:str, skills:Optional[dict[Skill,int]]=None, default_proficiency:int=0, aliases:Optional[list[str]]=None, id:str=None):
         super().__init__(name, aliases, id)
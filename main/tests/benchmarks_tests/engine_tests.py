@@ -0,0 +1,37 @@
+import json
+
+from benchmarks.engine      import run_suite, compare, BENCHMARKS
+from utils.generate_game    import generate_game, GameSettings
+from factories.data_read_in import GameDocuments, read_in_game
+
+def test_generate_game_is_reproducible(tmp_path):
+    generate_game(str(tmp_path / "a"), 'generated', rooms=9, items_per_room=2, seed=3)
+    generate_game(str(tmp_path / "b"), 'generated', rooms=9, items_per_room=2, seed=3)
+    for file in (tmp_path / "a" / "generated" / "items").iterdir():
+        assert file.read_text() == (tmp_path / "b" / "generated" / "items" / file.name).read_text()
+    name_space = read_in_game('generated', documents=GameDocuments('generated', data_folder=str(tmp_path / "a")))[0]
+    assert len(name_space.get_from_name(category='location')) == 9
+    assert len(name_space.get_from_name(category='target')) == 18
+
+def test_generate_game_settings(tmp_path):
+    settings = GameSettings(rooms=16, items_per_room=1, nesting_depth=3, nesting_rate=1.0, alias_collision=1.0,
+                            requirement_density=1.0, state_chain_length=4, state_chain_rate=1.0, documents_per_file=10)
+    generate_game(str(tmp_path), 'generated', settings, seed=1)
+    name_space = read_in_game('generated', documents=GameDocuments('generated', data_folder=str(tmp_path)))[0]
+    deepest = name_space.get_from_id('box 5 2')
+    assert deepest.get_parent().get_parent() == name_space.get_from_id('box 5 1')
+    assert deepest.get_top_parent() == name_space.get_from_id('room 5')
+    keys = [target for target in name_space.get_from_name(category='target') if target.get_id().startswith('key')]
+    assert len(keys) == 48 # every path of the 4x4 grid is locked
+    assert all(['chain' in [graph.get_id() for graph in target.states.state_graphs] for target in keys])
+    assert sum([len(name_space.get_from_name(alias, 'target')) for alias in ['thing', 'box', 'jar']]) > 3
+
+def test_run_suite_and_compare():
+    results = run_suite(sizes=[(4, 1)], include_aagame1=False)
+    benchmarks = results['results']['generated_4x1']
+    assert set(benchmarks.keys()) == {benchmark.name for benchmark in BENCHMARKS}
+    assert all([stats['median_us'] > 0 and stats['peak_kb'] > 0 for stats in benchmarks.values()])
+    baseline = json.loads(json.dumps(results))
+    assert compare(results, baseline) == []
+    baseline['results']['generated_4x1']['GameState.action']['median_us'] *= 2
+    assert [name for _, name, _ in compare(results, baseline)] == ['GameState.action']
@@ -0,0 +1,14 @@
+import json
+import os
+
+from benchmarks.ingestion import write_synthetic_pack
+
+def test_copies_are_renamed_once(tmp_path):
+    assert write_synthetic_pack(str(tmp_path), 'pack', 3) > 0
+    rooms = f"{tmp_path}/pack/rooms"
+    original = sorted([file for file in os.listdir(rooms) if file.endswith('.json') and not file[0].isdigit()])[0]
+    with open(f"{rooms}/{original}") as contents:
+        name = json.load(contents)['name']
+    for copy in range(3):
+        with open(f"{rooms}/{copy}_{original}") as contents:
+            assert json.load(contents)['name'] == f"{name} {copy}"
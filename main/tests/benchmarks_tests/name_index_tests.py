@@ -0,0 +1,10 @@
+from benchmarks.name_index import compare_freeze, time_fuzzy
+
+def test_compare_freeze():
+    report = compare_freeze(rooms=25, items_per_room=2)
+    assert report['aliases'] > 50
+    assert 0 < report['frozen_bytes'] < report['tree_bytes']
+
+def test_time_fuzzy():
+    report = time_fuzzy(aliases=2000, lookups=50)
+    assert report['median_us'] > 0
@@ -0,0 +1,12 @@
+from benchmarks.object_model import compare_object_model, compare_children
+
+def test_compare_object_model():
+    report = compare_object_model(rooms=25, items_per_room=2, repeats=2)
+    assert report['named'] > 50
+    assert 0 < report['object_bytes'] < report['read_bytes']
+    assert report['same_ns'] > 0 and report['equal_ns'] > 0
+
+def test_compare_children():
+    report = compare_children(rooms=25, items_per_room=2)
+    assert report['containers'] > 50
+    assert 0 < report['collection_bytes'] < report['finder_bytes']
@@ -4,9 +4,20 @@ from typing import Any
 from utils.relator          import NameFinder
 from factories.factories    import CharacterControlFactory
 from factories.data_read_in import read_in_game
+import factories.snapshot as snapshot
 
 from tests.test_constants import GAME_TO_TEST
 
+@pytest.fixture(scope='session')
+def snapshot_folder(tmp_path_factory) -> str:
+    return str(tmp_path_factory.mktemp("cache"))
+
+@pytest.fixture(autouse=True)
+def keep_snapshots_out_of_the_tree(snapshot_folder, monkeypatch) -> None:
+    """Snapshots made by tests go to a temporary folder, also in worker processes (through the environment)"""
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_FOLDER', snapshot_folder)
+    monkeypatch.setenv('SNAPSHOT_FOLDER', snapshot_folder)
+
 @pytest.fixture
 def game() -> tuple[NameFinder, NameFinder, CharacterControlFactory, dict[str,Any]]:
     return read_in_game(GAME_TO_TEST)
@@ -0,0 +1,34 @@
+from controls.batch_runner import run_batch, run_session
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_run_session(tmp_path):
+    script = tmp_path / "walk.txt"
+    script.write_text("# comment\nlook\n\nsouth\nnorth\n")
+    out = tmp_path / "out"
+    out.mkdir()
+    result = run_session(GAME_TO_TEST, str(script), str(out))
+    assert result['turns'] >= 3
+    assert script.read_text() == "# comment\nlook\n\nsouth\nnorth\n"
+    transcript = (out / "walk.transcript.txt").read_text()
+    assert "> south" in transcript and "> north" in transcript
+
+def test_transcript_next_to_its_script(tmp_path):
+    script = tmp_path / "walk.txt"
+    script.write_text("look\nsouth\n")
+    run_session(GAME_TO_TEST, str(script), str(tmp_path))
+    assert script.read_text() == "look\nsouth\n"
+    assert "> south" in (tmp_path / "walk.transcript.txt").read_text()
+    summary = run_batch(GAME_TO_TEST, str(tmp_path), str(tmp_path)) # the transcript isn't played as a script
+    assert summary['sessions'] == 1
+    assert script.read_text() == "look\nsouth\n"
+
+def test_run_batch(tmp_path):
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    for i in range(3):
+        (scripts / f"{i}.txt").write_text("look\nwait\n")
+    summary = run_batch(GAME_TO_TEST, str(scripts), str(tmp_path / "out"))
+    assert summary['sessions'] == 3
+    assert summary['turns'] > 0
+    assert len(list((tmp_path / "out").iterdir())) == 3
@@ -0,0 +1,69 @@
+from factories.data_read_in     import read_in_game
+from controls.completion        import complete_input
+from controls.character_control import CommandLineController
+import controls.character_control as character_control
+from controls.game_control      import GameState
+from utils.relator              import FlatNameFinder
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_complete_input():
+    for name_finder in [None, FlatNameFinder]:
+        game = read_in_game(GAME_TO_TEST) if name_finder is None else read_in_game(GAME_TO_TEST, name_finder=name_finder)
+        name_space, _, _, controllers, _ = game
+        player = [actor for actor, controller in controllers.characters.items() if isinstance(controller, CommandLineController)][0]
+        assert 'take' in complete_input("ta", name_space, player)
+        assert complete_input("take o", name_space, player) == ['off', 'out']
+        assert 'north' in complete_input("go nor", name_space, player)
+        visible = [child for child in player.get_top_parent().children.get_from_name() if child.is_visible_to(player) and child is not player]
+        word = visible[0].get_aliases()[0].lower().split(" ")[0]
+        assert word in complete_input(f"look at the {word[:2]}", name_space, player)
+        assert complete_input("xq", name_space, player) == []
+
+def test_name_finders_complete_the_same():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    flat = FlatNameFinder()
+    flat.add_many(list(name_space.by_id.values()))
+    flat.enable_fuzzy()
+    for text in ["", "t", "take ", "rusty ", "n", "zz"]:
+        for category in [None, 'action', ['target', 'direction']]:
+            assert flat.complete(text, category) == name_space.complete(text, category)
+
+def test_game_state_sets_completer():
+    name_space, _, every_turn, controllers, details = read_in_game(GAME_TO_TEST)
+    GameState(details, name_space, [], controllers, every_turn)
+    player, controller = [(actor, controller) for actor, controller in controllers.characters.items() if isinstance(controller, CommandLineController)][0]
+    assert controller.completer("take o") == complete_input("take o", name_space, player)
+
+def test_completions_are_ranked():
+    name_space, _, _, controllers, _ = read_in_game(GAME_TO_TEST)
+    player = [actor for actor, controller in controllers.characters.items() if isinstance(controller, CommandLineController)][0]
+    completions = name_space.complete("t")
+    assert completions == sorted(completions, key=lambda word: (-name_space.fuzzy.counts[word], word))
+    assert completions != sorted(completions)
+    room = player.get_top_parent()
+    directions = name_space.complete("", 'direction')
+    in_room = [word for word in name_space.complete("", 'target', location=room, allowed=lambda named: named.is_visible_to(player)) if word not in directions]
+    completions = complete_input("look at ", name_space, player)
+    assert completions.index(in_room[0]) < completions.index(directions[0])
+
+def test_readline_set_up_once(monkeypatch):
+    calls = list[str]()
+    class FakeReadline:
+        def set_completer_delims(self, delims): calls.append('delims')
+        def set_completer(self, completer): calls.append('completer')
+        def parse_and_bind(self, binding): calls.append('bind')
+        def get_line_buffer(self): return "take o"
+        def get_endidx(self): return 6
+    monkeypatch.setattr(character_control, 'readline', FakeReadline())
+    monkeypatch.setattr(character_control, '_readline_ready', False)
+    monkeypatch.setattr(character_control, '_reading', None)
+    monkeypatch.setattr('builtins.input', lambda prompt: "look")
+    first, second = CommandLineController(), CommandLineController()
+    first.set_completer(lambda line: ['first'])
+    second.set_completer(lambda line: ['second'])
+    assert calls == ['delims', 'completer', 'bind']
+    for controller in [first, second, first]:
+        assert controller.make_move() == "look"
+        assert character_control._complete_reading("o", 0) == ('first' if controller is first else 'second')
+    assert calls == ['delims', 'completer', 'bind']
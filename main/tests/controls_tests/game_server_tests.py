@@ -0,0 +1,65 @@
+import asyncio
+import logging
+
+from controls.game_server  import GameServer, GameSession
+from benchmarks.server_load import load_level
+
+from tests.test_constants import GAME_TO_TEST
+
+async def __serve_and_run(commands:list[str], sessions:int):
+    server = GameServer(GAME_TO_TEST)
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    idle_reader, idle_writer = await asyncio.open_connection('127.0.0.1', port) # never sends anything
+    try:
+        result = await load_level(sessions, commands, port=port)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await reader.readuntil(b"> ")
+        writer.write(b"look\n")
+        response = await reader.readuntil(b"> ")
+        writer.close()
+    finally:
+        idle_writer.close()
+        listener.close()
+        await listener.wait_closed()
+    return result, response
+
+def test_game_server():
+    result, response = asyncio.run(__serve_and_run(['look', 'south', 'north'], 5))
+    assert result['sessions'] == 5
+    assert result['errors'] == 0
+    assert result['commands/sec'] > 0
+    assert len(response) > 2
+
+async def __fail_one_session(fail:str):
+    server = GameServer(GAME_TO_TEST)
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await reader.readuntil(b"> ")
+        writer.write(f"{fail}\n".encode())
+        closed = await asyncio.wait_for(reader.read(), 10) # read to the end, the server closes the connection
+        writer.close()
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await reader.readuntil(b"> ")
+        writer.write(b"look\n")
+        response = await reader.readuntil(b"> ")
+        writer.close()
+    finally:
+        listener.close()
+        await listener.wait_closed()
+    return closed, response
+
+def test_game_error_closes_only_its_session(monkeypatch, caplog):
+    respond = GameSession.respond
+    async def failing(self, user_input:str):
+        if user_input == 'fail':
+            raise RuntimeError("broken game")
+        return await respond(self, user_input)
+    monkeypatch.setattr(GameSession, 'respond', failing)
+    with caplog.at_level(logging.ERROR, logger='controls.game_server'):
+        closed, response = asyncio.run(__fail_one_session('fail'))
+    assert b"> " not in closed
+    assert len(response) > 2
+    assert any(["broken game" in record.exc_text for record in caplog.records if record.name == 'controls.game_server' and record.exc_text is not None])
@@ -0,0 +1,53 @@
+from models.actors          import Actor, Target, LocationDetail
+from models.requirement     import ActionRequirement, HappenedRequirement, ItemsHeldRequirement
+from utils.change_log       import ChangeLog
+from utils.requirement_watcher import RequirementWatcher
+
+from tests.requirement_helpers import CountingRequirement, small_world
+
+def __world(requirements:list[ActionRequirement]) -> tuple[Actor,Target,Target,LocationDetail,RequirementWatcher]:
+    character, key, stone, room = small_world()
+    change_log = ChangeLog()
+    change_log.attach([room, character, key, stone] + requirements)
+    watcher = RequirementWatcher(requirements, [character])
+    change_log.watchers.append(watcher.changed)
+    return character, key, stone, room, watcher
+
+def test_checked_when_changed():
+    inner = CountingRequirement({})
+    happened = HappenedRequirement(inner)
+    character, key, stone, room, watcher = __world([happened])
+    inner.items_needed[key] = (True, None)
+    watcher.check()
+    watcher.check()
+    assert inner.checks == 1 and character not in happened.already_happened
+    character.add_to_inventory(stone)
+    watcher.check()
+    assert inner.checks == 1
+    character.add_to_inventory(key)
+    watcher.check()
+    assert character in happened.already_happened
+    room.add_child(key) # once it happened it stays happened
+    watcher.check()
+    assert inner.checks == 2 and happened.meets_requirement(character)[0]
+
+def test_unknown_dependencies():
+    class Always(ActionRequirement):
+        def meets_requirement(self, character:Actor):
+            self.checked = getattr(self, 'checked', 0) + 1
+            return False, None
+    always = Always()
+    happened = HappenedRequirement(always)
+    _, _, _, _, watcher = __world([happened])
+    for _ in range(3):
+        watcher.check()
+    assert always.checked == 3
+
+def test_added_later():
+    requirements = list[ActionRequirement]()
+    character, key, _, _, watcher = __world(requirements)
+    watcher.check()
+    happened = HappenedRequirement(ItemsHeldRequirement({key: (False, None)}))
+    requirements.append(happened)
+    watcher.check()
+    assert character in happened.already_happened
@@ -0,0 +1,101 @@
+import io
+
+import pytest
+
+from factories.data_read_in import read_in_game
+from factories.fork         import GameTemplate
+from controls.game_control  import GameState
+from controls.save_game     import save_game, restore_game, SaveError, MAGIC, SAVE_VERSION, HEADER, COUNT, SHORT
+from models.requirement     import AllRequirement, HappenedRequirement
+
+from tests.test_constants import GAME_TO_TEST
+
+def __game_state(template:GameTemplate) -> GameState:
+    name_space, _, every_turn, controllers, details = template.fork()
+    return GameState(details, name_space, [], controllers, every_turn)
+
+def __placements(game_state:GameState) -> dict[str,str]:
+    return {named.get_id(): (None if named.get_parent() is None else named.get_parent().get_id()) for named in game_state.name_space.get_from_name(category=['target', 'actor'])}
+
+def __string(string:str) -> bytes:
+    return SHORT.pack(len(string.encode())) + string.encode()
+
+def __save(moved:dict[str,list[str]]=None, states:dict[str,list[str]]=None, achieved:dict[str,list[str]]=None) -> io.BytesIO:
+    """A save with the given moves, states (a state group id per graph, no time in it) and achievements"""
+    data = HEADER.pack(MAGIC, SAVE_VERSION, 5, 5)
+    data += COUNT.pack(len(moved or {})) + b"".join([__string(id) + SHORT.pack(len(path)) + b"".join(map(__string, path)) for id, path in (moved or {}).items()])
+    data += COUNT.pack(len(states or {})) + b"".join([__string(id) + SHORT.pack(len(groups)) + b"".join([__string(group) + COUNT.pack(0) for group in groups]) for id, groups in (states or {}).items()])
+    data += COUNT.pack(0)
+    data += COUNT.pack(len(achieved or {})) + b"".join([__string(id) + SHORT.pack(len(ids)) + b"".join(map(__string, ids)) for id, ids in (achieved or {}).items()])
+    data += COUNT.pack(0)
+    return io.BytesIO(data)
+
+def test_save_and_restore():
+    template = GameTemplate(read_in_game(GAME_TO_TEST))
+    played = __game_state(template)
+    actor = played.name_space.get_from_name(category='actor')[0]
+    item = [target for target in played.name_space.get_from_name(category='target') if not target.is_in(actor)][0]
+    actor.add_to_inventory(item)
+    targets = [target for target in played.name_space.get_from_name(category='target') if len(target.states.state_graphs) > 0]
+    for target in targets:
+        for action in target.get_actions_as_target():
+            target.perform_action_as_target(action)
+    actor.complete_achievement(played.name_space.get_from_name(category='achievement')[0])
+    played.current_turn, played.moves = 7, 9
+
+    out = io.BytesIO()
+    save_game(played, out)
+    assert len(out.getvalue()) < 4096
+
+    restored = __game_state(template)
+    restore_game(restored, io.BytesIO(out.getvalue()))
+    assert __placements(restored) == __placements(played)
+    assert restored.name_space.get_from_id(item.get_id()).is_in(restored.name_space.get_from_id(actor.get_id()))
+    for target in targets:
+        assert restored.name_space.get_from_id(target.get_id()).get_current_state() == target.get_current_state()
+    assert restored.name_space.get_from_id(actor.get_id()).achievements == actor.achievements
+    assert (restored.current_turn, restored.moves) == (7, 9)
+
+    again = io.BytesIO()
+    save_game(restored, again)
+    assert len(again.getvalue()) == len(out.getvalue())
+
+def test_restore_rejects_bad_data():
+    template = GameTemplate(read_in_game(GAME_TO_TEST))
+    with pytest.raises(SaveError):
+        restore_game(__game_state(template), io.BytesIO(b"not a save"))
+
+def test_restore_rejects_unknown_requirements():
+    template = GameTemplate(read_in_game(GAME_TO_TEST))
+    name_space, _, every_turn, controllers, details = template.fork()
+    happened = HappenedRequirement(AllRequirement([]), id='somewhere happened 0')
+    played = GameState(details, name_space, [], controllers, every_turn + [happened])
+    happened._happened(played.name_space.get_from_name(category='actor')[0])
+    out = io.BytesIO()
+    save_game(played, out)
+    with pytest.raises(SaveError):
+        restore_game(__game_state(template), io.BytesIO(out.getvalue()))
+
+def test_failed_restore_changes_nothing():
+    template = GameTemplate(read_in_game(GAME_TO_TEST))
+    game_state = __game_state(template)
+    placements = __placements(game_state)
+    actor = game_state.name_space.get_from_name(category='actor')[0]
+    item = [target for target in game_state.name_space.get_from_name(category='target') if not target.is_in(actor)][0]
+    stateful = [target for target in game_state.name_space.get_from_name(category='target') if len(target.states.state_graphs) > 0][0]
+    moved = {item.get_id(): [actor.get_id()]}
+    bad_saves = [
+        __save(moved, achieved={actor.get_id(): ['no such achievement']}),
+        __save(moved, states={stateful.get_id(): ['no such state'] * len(stateful.states.state_graphs)}),
+        __save({**moved, 'no such item': []}),
+        __save({**moved, item.get_id(): [actor.get_id(), 'no such child']}),
+        __save({**moved, 'inside mug': []}), # a Target doesn't give up what it holds
+    ]
+    for save in bad_saves:
+        with pytest.raises(SaveError):
+            restore_game(game_state, save)
+        assert __placements(game_state) == placements
+        assert (game_state.current_turn, game_state.moves) != (5, 5)
+    assert game_state.name_space.get_from_id('inside mug').get_parent().get_id() == 'mug'
+    restore_game(game_state, __save(moved))
+    assert item.is_in(actor)
@@ -0,0 +1,28 @@
+from factories.data_read_in import read_in_game
+from controls.character_control import ScriptedController
+from controls.translate     import get_input_translator, _corrected
+from models.named           import Action
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_typos_are_corrected():
+    name_space, _, _, controllers, _ = read_in_game(GAME_TO_TEST)
+    translator = get_input_translator()
+    player = list(controllers.characters.keys())[0]
+    look, _ = translator.interpret("look", name_space, player, ScriptedController([]))
+    assert isinstance(look, Action)
+    assert translator.interpret("lokk", name_space, player, ScriptedController([]))[0] is look
+    take, targets = translator.interpret("take the lantrn", name_space, player, ScriptedController([]))
+    assert take.get_name() == 'take' and [target.get_id() for target in targets] == ['lantern']
+    assert translator.interpret("xqzzv", name_space, player, ScriptedController([]))[0] == "error"
+
+def test_no_correction_without_index():
+    name_space, _, _, controllers, _ = read_in_game(GAME_TO_TEST, fuzzy=False)
+    player = list(controllers.characters.keys())[0]
+    assert get_input_translator().interpret("lokk", name_space, player, ScriptedController([]))[0] == "error"
+
+def test_only_the_failed_word_is_corrected():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    assert _corrected(['lokk'], name_space, {}) == ['look']
+    assert _corrected(['honey', 'jra'], name_space, {}) == ['honey', 'jar']
+    assert _corrected(['lantern', 'lokk'], name_space, {}) is None # no alias goes on from lantern, lantern is what didn't fit
@@ -0,0 +1,56 @@
+import random
+
+from factories.data_read_in import read_in_game
+from models.actors          import HasLocation, Actor, Target, LocationDetail
+from models.response        import StaticResponse
+
+from tests.test_constants import GAME_TO_TEST
+
+def __contains(holder:HasLocation, item:HasLocation) -> bool:
+    # what contains_item did before it followed the parents
+    return any([child == item or __contains(child, item) for child in holder.children.get_from_name()])
+
+def test_parents_match_children():
+    rng = random.Random(0)
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    holders = [named for named in name_space.by_id.values() if isinstance(named, HasLocation) and not isinstance(named, Target)]
+    items = [named for named in name_space.by_id.values() if isinstance(named, Target) and not isinstance(named, Actor)]
+    for _ in range(200):
+        item, holder = rng.choice(items), rng.choice(holders)
+        if not holder.is_in(item):
+            holder.add_child(item)
+    for holder in holders:
+        for child in holder.children.get_from_name():
+            assert child.get_parent() is holder
+        for item in items:
+            assert holder.contains_item(item) == __contains(holder, item)
+
+def test_visible_path():
+    character = Actor('someone', StaticResponse("someone"), 'player', None, None)
+    outer, inner = LocationDetail('outer'), LocationDetail('inner', hidden=True)
+    item = Target('ring', StaticResponse("ring"), None)
+    outer.add_child(inner)
+    inner.add_child(item)
+    assert outer.contains_item(item) and not item.contains_item(item)
+    assert not outer.contains_item_visible_to(item, character)
+    inner.hidden = False
+    assert outer.contains_item_visible_to(item, character)
+    assert inner.remove_child(item)[0]
+    assert item.get_parent() is None and not outer.contains_item(item)
+
+def test_deep_nesting():
+    holders = [LocationDetail(f"box {i}") for i in range(5000)]
+    for outer, inner in zip(holders, holders[1:]):
+        outer.add_child(inner)
+    assert holders[-1].get_top_parent() is holders[0]
+    assert holders[-1].is_in(holders[0]) and not holders[0].is_in(holders[-1])
+    assert holders[0].contains_item(holders[-1])
+
+def test_held_items():
+    character = Actor('someone', StaticResponse("someone"), 'player', None, None)
+    key, ring = Target('key', StaticResponse("key"), None), Target('ring', StaticResponse("ring"), None)
+    assert character.get_inventory().get_parent() is character and character.get_inventory(inventory='wearing').get_parent() is character
+    character.get_inventory().add_child(key)
+    character.get_inventory(inventory='wearing').add_child(ring)
+    assert character.contains_item(key) and character.contains_item(ring) and character.is_wearing(ring)
+    assert key.is_in(character) and key.get_top_parent() is character
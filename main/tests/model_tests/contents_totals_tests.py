@@ -0,0 +1,57 @@
+import random
+
+from pytest import approx
+
+from factories.data_read_in import read_in_game
+from models.actors          import HasLocation, Target, LocationDetail, ItemLimit
+from models.response        import StaticResponse
+
+from tests.test_constants import GAME_TO_TEST
+
+def __recursive(holder:HasLocation) -> tuple[float,float,float]:
+    # what get_weight/get_value/get_size returned before their totals were kept
+    weight = sum([__recursive(child)[0] for child in holder.children.get_from_name()])
+    value  = sum([__recursive(child)[1] for child in holder.children.get_from_name()])
+    size   = sum([__recursive(child)[2] for child in holder.children.get_from_name()])
+    if isinstance(holder, Target):
+        return weight + holder.weight, value + holder.value, holder.size
+    return weight, value, size
+
+def __check(holders:list[HasLocation]) -> None:
+    for holder in holders:
+        assert (holder.get_weight(), holder.get_value(), holder.get_size()) == approx(__recursive(holder))
+
+def test_moves_keep_totals():
+    rng = random.Random(0)
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    holders = [named for named in name_space.by_id.values() if isinstance(named, HasLocation) and not isinstance(named, Target)]
+    items = [named for named in name_space.by_id.values() if isinstance(named, Target) and named.get_parent() is not None and not named.children.contains(named)]
+    __check(holders)
+    for _ in range(200):
+        item, holder = rng.choice(items), rng.choice(holders)
+        if item.is_in(holder) or holder.is_in(item):
+            continue
+        if rng.random() < 0.5:
+            item.set_location(holder)
+        else:
+            holder.add_child(item)
+        __check([holder, item.get_top_parent()])
+    __check(holders)
+
+def test_limits():
+    box = LocationDetail('box', item_limit=ItemLimit(weight_limit=3, size_limit=10))
+    bag = Target('bag', StaticResponse("bag"), None, weight=1, size=2)
+    bag_inside = LocationDetail('inside')
+    bag._set_children([bag_inside])
+    assert box.add_child(bag)[0]
+    assert box.get_weight() == 1 and box.get_size() == 2
+    for i in range(2):
+        assert bag_inside.add_child(Target(f"stone {i}", StaticResponse("stone"), None, weight=1, size=5))[0]
+    # the stones are in the bag, they count for its weight but not its size
+    assert box.get_weight() == 3 and box.get_size() == 2
+    assert not box.add_child(Target("feather", StaticResponse("feather"), None, weight=0.5))[0]
+    stone = bag_inside.children.get_from_name('stone 0')[0]
+    assert bag_inside.remove_child(stone)[0]
+    assert box.get_weight() == 2
+    stone.set_location(box)
+    assert box.get_weight() == 3 and box.get_size() == 7
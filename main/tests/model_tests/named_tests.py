@@ -0,0 +1,34 @@
+import pickle
+import sys
+
+from factories.data_read_in import read_in_game
+from models.named           import Named, Action, attributes_of
+from models.actors          import HasLocation, Target, Actor, Location, Path, LocationDetail
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_equality():
+    look = Action('Look', id='LOOK')
+    assert look.get_id() == 'look'
+    assert look.get_id() is sys.intern('look')
+    assert look == Action('look') and look == Named('other name', id='Look')
+    assert hash(look) == hash(Named('look'))
+    assert look != 'look' and look != Action('take')
+    assert {look: 1}[Named('LOOK')] == 1
+
+def test_slotted():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    for cls in [Named, HasLocation, Target, Actor, Location, Path, LocationDetail]:
+        assert len([named for named in name_space.by_id.values() if isinstance(named, cls)]) > 0
+        for named in name_space.by_id.values():
+            if isinstance(named, cls):
+                assert not hasattr(named, '__dict__')
+
+def test_pickle():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    copied = pickle.loads(pickle.dumps(name_space))
+    for id, named in name_space.by_id.items():
+        if isinstance(named, Named):
+            copy = copied.get_from_id(id)
+            assert copy == named and hash(copy) == hash(named)
+            assert sorted(attributes_of(copy).keys()) == sorted(attributes_of(named).keys())
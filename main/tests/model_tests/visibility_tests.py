@@ -0,0 +1,59 @@
+import random
+
+from factories.data_read_in import read_in_game
+from models.actors          import HasLocation, Actor, Target, LocationDetail, SingleEndPath
+from models.requirement     import ActionRequirement, ItemsHeldRequirement
+from models.response        import StaticResponse
+
+from tests.test_constants      import GAME_TO_TEST
+from tests.requirement_helpers import CountingRequirement, small_world
+
+def test_remembered_until_changed():
+    character, key, stone, room = small_world()
+    requirement = CountingRequirement({key: (True, None)})
+    door = LocationDetail('door', visible_requirements=[requirement])
+    room.add_child(door)
+    assert not door.is_visible_to(character) and not door.is_visible_to(character)
+    assert requirement.checks == 1
+    character.get_inventory().add_child(stone)
+    assert not door.is_visible_to(character)
+    assert requirement.checks == 1
+    character.get_inventory().add_child(key)
+    assert door.is_visible_to(character) and door.is_visible_to(character)
+    assert requirement.checks == 2
+    character.get_inventory().set_location(room) # moving what holds the key moves the key
+    assert not door.is_visible_to(character)
+    assert requirement.checks == 3
+
+def test_unknown_dependencies():
+    character, _, _, room = small_world()
+    class Always(ActionRequirement):
+        def meets_requirement(self, character:Actor):
+            self.checked = getattr(self, 'checked', 0) + 1
+            return True, None
+    always = Always()
+    detail = LocationDetail('detail', visible_requirements=[always])
+    assert detail.is_visible_to(character) and detail.is_visible_to(character)
+    assert always.checked == 2
+
+def test_hidden_when_locked():
+    character, key, _, room = small_world()
+    path = SingleEndPath('door', StaticResponse("door"), end=room, passing_requirements=[ItemsHeldRequirement({key: (True, None)})], hidden_when_locked=True)
+    assert not path.is_visible_to(character)
+    character.add_to_inventory(key)
+    assert path.is_visible_to(character)
+
+def test_same_as_checking():
+    rng = random.Random(0)
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    holders = [named for named in name_space.by_id.values() if isinstance(named, HasLocation) and not isinstance(named, Target)]
+    items = [named for named in name_space.by_id.values() if isinstance(named, Target) and not isinstance(named, Actor)]
+    actors = [named for named in name_space.by_id.values() if isinstance(named, Actor)]
+    checked = [named for named in name_space.by_id.values() if isinstance(named, HasLocation) and named._visibility_varies()]
+    for _ in range(100):
+        item, holder = rng.choice(items), rng.choice(holders)
+        if not holder.is_in(item):
+            holder.add_child(item)
+        for named in checked:
+            for actor in actors:
+                assert named.is_visible_to(actor) == (not named.hidden and named._check_visible(actor))
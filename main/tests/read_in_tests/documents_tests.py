@@ -0,0 +1,22 @@
+from factories.data_read_in import GameDocuments, GAME_CATEGORIES, read_in_game
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_single_pass():
+    documents = GameDocuments(GAME_TO_TEST)
+    read_in_game(GAME_TO_TEST, documents=documents)
+    construct = documents.stats['construct']
+    update    = documents.stats['update']
+    assert construct['files'] > 0 and construct['bytes'] > 0
+    assert update['files'] == 0 and update['bytes'] == 0
+    assert update['reused'] > 0
+    assert len(documents.documents) == 0
+
+def test_parallel_matches_serial():
+    serial = GameDocuments(GAME_TO_TEST)
+    serial.prefetch(GAME_CATEGORIES)
+    threaded = GameDocuments(GAME_TO_TEST, workers=4)
+    threaded.prefetch(GAME_CATEGORIES)
+    assert threaded.documents == serial.documents
+    name_space = read_in_game(GAME_TO_TEST, documents=GameDocuments(GAME_TO_TEST, workers=4))[0]
+    assert list(name_space.by_id.keys()) == list(read_in_game(GAME_TO_TEST)[0].by_id.keys())
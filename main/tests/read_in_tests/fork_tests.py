@@ -0,0 +1,34 @@
+from factories.data_read_in import read_in_game
+from factories.fork         import GameTemplate
+from models.actors          import Target, Location
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_fork_shares_content():
+    template = GameTemplate(read_in_game(GAME_TO_TEST))
+    first, second = template.fork(), template.fork()
+    assert first[0] is not second[0]
+    assert set(first[0].by_id.keys()) == set(template.game[0].by_id.keys())
+    look = first[0].get_from_name('look', 'action')[0]
+    assert look is second[0].get_from_name('look', 'action')[0]
+    assert first[0].by_name['action'] is second[0].by_name['action']
+    actor = first[0].get_from_name(category='actor')[0]
+    assert actor is not second[0].get_from_id(actor.get_id())
+    assert first[3].get_controller(actor) is not None
+
+def test_fork_is_independent():
+    template = GameTemplate(read_in_game(GAME_TO_TEST))
+    first, second = template.fork(), template.fork()
+    actor = first[0].get_from_name(category='actor')[0]
+    item = [target for target in first[0].get_from_name(category='target') if target.get_parent() is not None][0]
+    room = [location for location in first[0].get_from_name(category='location') if location != item.get_top_parent()][0]
+    achievement = min(first[0].get_from_name(category='achievement'), key=lambda achievement: achievement.get_id())
+    item.set_location(room)
+    actor.complete_achievement(achievement)
+    assert item.is_in(room)
+    assert not second[0].get_from_id(item.get_id()).is_in(second[0].get_from_id(room.get_id()))
+    assert not second[0].get_from_id(room.get_id()).children.contains(item)
+    assert actor.has_completed_achievement(achievement)
+    assert not second[0].get_from_id(actor.get_id()).has_completed_achievement(second[0].get_from_id(achievement.get_id()))
+    assert isinstance(template.game[0].get_from_id(item.get_id()), Target)
+    assert isinstance(room, Location)
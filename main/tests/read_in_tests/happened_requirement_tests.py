@@ -0,0 +1,34 @@
+from factories.data_read_in import read_in_game
+from factories.factories    import requirements_from_dict
+from models.requirement     import ActionRequirement, AllRequirement, HappenedRequirement
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_ids_follow_the_owner():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    items = [item.get_id() for item in name_space.get_from_name(category='target')][:2]
+    happened = {'happened_requirements': {'items_held_requirements': {item: True for item in items},
+                                          'happened_requirements': {'items_held_requirements': {items[0]: False}}}}
+    owners = [('door', 'door going north in cellar'), ('door', 'door going north in attic')]
+    eager = list[ActionRequirement]()
+    for name, owner in owners:
+        requirements_from_dict(name, happened, name_space, eager, owner=owner)
+    lazy = list[ActionRequirement]() # each owner read on its own, in any order, as the RoomPager reads rooms
+    for name, owner in reversed(owners):
+        every_turn = list[ActionRequirement]()
+        requirements_from_dict(name, happened, name_space, every_turn, owner=owner)
+        lazy.extend(every_turn)
+    assert sorted([req.id for req in eager]) == sorted([req.id for req in lazy])
+    assert len({req.id for req in eager}) == 4
+    assert {req.id for req in eager if req.id.startswith('door going north in attic')} == {'door going north in attic happened 0', 'door going north in attic happened 1'}
+    outer = [req for req in eager if isinstance(req.requirement, AllRequirement)][0]
+    assert isinstance(outer, HappenedRequirement) and len(outer.requirement.requirements) == 2
+
+def test_ids_count_on_over_one_owners_calls():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    item = [item.get_id() for item in name_space.get_from_name(category='target')][0]
+    happened = {'happened_requirements': {'items_held_requirements': {item: True}}}
+    every_turn, ordinals = list[ActionRequirement](), dict[str,int]()
+    for _ in range(2): # like a path's visible and passing requirements
+        requirements_from_dict('door', happened, name_space, every_turn, owner='door going north in attic', ordinals=ordinals)
+    assert [req.id for req in every_turn] == ['door going north in attic happened 0', 'door going north in attic happened 1']
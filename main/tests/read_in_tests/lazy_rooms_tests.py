@@ -0,0 +1,38 @@
+from factories.data_read_in import read_in_game
+from models.actors          import Location
+from models.requirement     import AllRequirement, HappenedRequirement
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_lazy_rooms():
+    name_space, _, _, _, _ = read_in_game(GAME_TO_TEST, lazy=True)
+    rooms = name_space.get_from_name(category='location')
+    pager = rooms[0].pager
+    assert 0 < len(pager.loaded) < len(rooms)
+    unloaded = sorted([room for room in rooms if not pager.is_loaded(room)], key=lambda room: room.get_id())
+    for room in unloaded:
+        assert name_space.get_from_name(room.get_aliases()[0], 'location') == [room]
+        assert len(room.paths) > 0 # reading the paths loads the room, every room of the test game has a way in or out
+        assert pager.is_loaded(room)
+    unloaded = [room for room in unloaded if not pager.is_touched(room)][0] # rooms with characters in them stay loaded
+    path_count = len(unloaded.paths)
+    assert pager.evict(unloaded)
+    assert not pager.is_loaded(unloaded)
+    assert len(unloaded.paths) == path_count
+    for room in rooms:
+        assert isinstance(room, Location)
+
+def test_happened_keeps_room_loaded():
+    name_space, _, _, _, _ = read_in_game(GAME_TO_TEST, lazy=True)
+    rooms = name_space.get_from_name(category='location')
+    pager = rooms[0].pager
+    for room in rooms:
+        len(room.paths)
+    room = sorted([room for room in rooms if not pager.is_touched(room)], key=lambda room: room.get_id())[0]
+    happened = HappenedRequirement(AllRequirement([]), id=f"{room.get_id()} happened 0")
+    pager.loaded[room][1].append(happened)
+    pager.every_turn.append(happened)
+    assert not pager.is_touched(room)
+    happened._happened(name_space.get_from_name(category='actor')[0])
+    assert pager.is_touched(room) and not pager.evict(room)
+    assert happened in pager.every_turn
@@ -0,0 +1,32 @@
+import os
+
+from factories.snapshot  import read_in_game_snapshot, snapshot_path
+import factories.snapshot as snapshot
+from models.actors       import Actor, Location
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_snapshot_round_trip(tmp_path):
+    fresh  = read_in_game_snapshot(GAME_TO_TEST, snapshot_folder=str(tmp_path))
+    assert os.path.exists(snapshot_path(GAME_TO_TEST, str(tmp_path)))
+    cached = read_in_game_snapshot(GAME_TO_TEST, snapshot_folder=str(tmp_path))
+    assert fresh[0] is not cached[0]
+    assert set(fresh[0].by_id.keys()) == set(cached[0].by_id.keys())
+    assert fresh[4] == cached[4]
+    for character in cached[0].get_from_name(category='actor'):
+        assert isinstance(character, Actor)
+        assert cached[3].get_controller(character) is not None
+        assert isinstance(character.get_top_parent(), Location)
+
+def test_snapshot_stale(tmp_path):
+    path = snapshot_path(GAME_TO_TEST, str(tmp_path))
+    read_in_game_snapshot(GAME_TO_TEST, snapshot_folder=str(tmp_path))
+    with open(path, 'r+b') as snapshot:
+        snapshot.write(b'\x00')
+    loaded = read_in_game_snapshot(GAME_TO_TEST, snapshot_folder=str(tmp_path))
+    assert len(loaded[0].get_from_name(category='location')) > 0
+
+def test_default_folder_is_configurable(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_FOLDER', str(tmp_path))
+    read_in_game_snapshot(GAME_TO_TEST)
+    assert os.path.exists(tmp_path / f"{GAME_TO_TEST}.snapshot")
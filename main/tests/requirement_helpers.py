@@ -0,0 +1,22 @@
+from models.actors      import Actor, Target, LocationDetail
+from models.requirement import ItemsHeldRequirement
+from models.response    import StaticResponse
+
+class CountingRequirement(ItemsHeldRequirement):
+    """An ItemsHeldRequirement that counts how often it is checked"""
+    def __init__(self, items_needed:dict):
+        super().__init__(items_needed)
+        self.checks = 0
+
+    def meets_requirement(self, character:Actor):
+        self.checks += 1
+        return super().meets_requirement(character)
+
+def small_world() -> tuple[Actor,Target,Target,LocationDetail]:
+    """A room with a character, a key and a stone in it"""
+    room = LocationDetail('room')
+    character = Actor('someone', StaticResponse("someone"), 'player', None, None)
+    key, stone = Target('key', StaticResponse("key"), None), Target('stone', StaticResponse("stone"), None)
+    for child in [character, key, stone]:
+        room.add_child(child)
+    return character, key, stone, room
@@ -0,0 +1,26 @@
+from factories.data_read_in import read_in_game
+from models.actors          import HasLocation, Target, Actor, Location, LocationDetail
+from models.named           import Action
+from utils.relator          import FlatNameFinder, categories_of, category_of
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_categories_of():
+    assert category_of(LocationDetail) == 'locationdetail'
+    assert categories_of(None) is None
+    assert categories_of('Target') == ('target',)
+    assert categories_of(Target) == ('target', 'actor')
+    assert categories_of([Action, 'LOCATION', Location]) == ('action', 'location')
+    assert set(categories_of(HasLocation)) >= {'haslocation', 'target', 'actor', 'location', 'locationdetail', 'singleendpath', 'multiendpath'}
+
+def test_class_categories_cover_subclasses():
+    for name_finder in [None, FlatNameFinder]:
+        name_space = read_in_game(GAME_TO_TEST) if name_finder is None else read_in_game(GAME_TO_TEST, name_finder=name_finder)
+        name_space = name_space[0]
+        targets = name_space.get_from_name(category=Target)
+        assert set(targets) == set(name_space.get_from_name(category=['target', 'actor']))
+        assert any([isinstance(target, Actor) for target in targets])
+        assert set(name_space.get_from_name(category='target')) == set([target for target in targets if not isinstance(target, Actor)])
+        actor = [target for target in targets if isinstance(target, Actor)][0]
+        assert name_space.get_from_id(actor.get_id(), Target) is actor
+        assert name_space.get_from_input(actor.get_name().split(" "), Target)[0][0] is actor
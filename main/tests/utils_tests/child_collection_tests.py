@@ -0,0 +1,55 @@
+import pickle
+
+from factories.data_read_in import read_in_game
+from models.actors          import HasLocation, LocationDetail, Target, Actor
+from models.response        import StaticResponse
+from utils.relator          import ChildCollection
+
+from tests.test_constants import GAME_TO_TEST
+
+def __item(name:str, aliases:list[str]=None) -> Target:
+    return Target(name, StaticResponse(name), None, aliases=aliases)
+
+def test_scan_and_index_agree():
+    items = [__item(f"box {i}", [f"box {i}", "box", f"{i}"]) for i in range(ChildCollection.INDEX_SIZE + 10)]
+    items.append(LocationDetail('on'))
+    small, big = ChildCollection['HasLocation'](), ChildCollection['HasLocation']()
+    small.add_many(items[:5] + items[-1:])
+    big.add_many(items)
+    assert big._index() is not None and small._index() is None
+    for collection, held in [(small, items[:5] + items[-1:]), (big, items)]:
+        assert collection.get_from_name() == held
+        assert set(collection.get_from_name('BOX')) == set([item for item in held if isinstance(item, Target)])
+        assert collection.get_from_name('box 3') == [items[3]]
+        assert collection.get_from_name('box', 'locationdetail') == []
+        assert collection.get_from_name('nothing') == []
+        matches = collection.get_from_input(['box', '3', 'with', 'it'], Target)
+        assert (items[3], ['box', '3'], ['with', 'it']) in matches
+        assert len(matches) == len([item for item in held if isinstance(item, Target)]) + 1
+        assert collection.get_special('on') is items[-1]
+    assert big.remove(items[3])
+    assert big.get_from_name('box 3') == [] and not big.contains(items[3])
+    assert not big.remove(items[3])
+
+def test_special_children():
+    collection = ChildCollection['HasLocation']()
+    assert collection.get_special('inside') is None
+    first, second = LocationDetail('inside', id='first'), LocationDetail('inside', id='second')
+    collection.add(first)
+    assert collection.get_special('inside') is first
+    collection.add(second)
+    assert collection.get_special('inside') is None
+    collection.remove(first)
+    assert collection.get_special('inside') is second
+
+def test_in_game():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    for named in name_space.by_id.values():
+        if isinstance(named, HasLocation):
+            assert isinstance(named.children, ChildCollection)
+            for child in named.children.get_from_name():
+                assert named.get_special_child(child.get_name()) in [None, child]
+        if isinstance(named, Actor):
+            assert named.get_inventory() is not None and named.get_inventory(inventory='wearing') is not None
+    collection = pickle.loads(pickle.dumps(next(named.children for named in name_space.by_id.values() if isinstance(named, Actor))))
+    assert collection.names is None and collection.get_special('inventory') is not None
@@ -0,0 +1,45 @@
+from factories.data_read_in import read_in_game
+from factories.fork         import GameTemplate
+from utils.relator          import NameFinder, FlatNameFinder
+
+from tests.test_constants import GAME_TO_TEST
+
+def __ids(matches:list) -> list:
+    return sorted([(match.get_id(), used, leftover) for match, used, leftover in matches])
+
+def test_same_as_name_finder():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    flat = FlatNameFinder()
+    flat.add_many(list(name_space.by_id.values()))
+    for named in name_space.by_id.values():
+        for alias in named.get_aliases():
+            words = alias.lower().split(" ")
+            for category in [None, 'target', ['action', 'direction'], ['location', 'actor', 'target']]:
+                assert __ids(flat.get_from_input(words+['with', 'it'], category)) == __ids(name_space.get_from_input(words+['with', 'it'], category))
+            category = flat._category(named)
+            assert set(flat.get_from_name(alias, category)) == set(name_space.get_from_name(alias, category))
+    for category in ['target', 'action', 'location']:
+        assert set(flat.get_from_name(category=category)) == set(name_space.get_from_name(category=category))
+    assert flat.get_from_input(['nothing', 'called', 'this']) == []
+    assert flat.get_from_name('nothing called this') == []
+
+def test_add_and_remove():
+    name_space = read_in_game(GAME_TO_TEST, name_finder=FlatNameFinder)[0]
+    assert isinstance(name_space, FlatNameFinder)
+    look = name_space.get_from_name('look', 'action')[0]
+    assert name_space.remove(look)
+    assert name_space.get_from_name('look', 'action') == []
+    assert name_space.get_from_input(['look']) == []
+    assert name_space.add(look)
+    assert name_space.get_from_input(['look', 'around'], 'action')[0][0] is look
+    assert not name_space.add(look)
+
+def test_fork_shares_index():
+    template = GameTemplate(read_in_game(GAME_TO_TEST, name_finder=FlatNameFinder))
+    first, second = template.fork(), template.fork()
+    assert first[0].index is second[0].index
+    look = first[0].get_from_name('look', 'action')[0]
+    first[0].remove(look)
+    assert first[0].index is not second[0].index
+    assert first[0].get_from_name('look', 'action') == []
+    assert second[0].get_from_name('look', 'action')[0] is look
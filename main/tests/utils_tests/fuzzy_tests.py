@@ -0,0 +1,35 @@
+import random
+import string
+
+from utils.fuzzy import FuzzyIndex, edit_distance
+
+def test_edit_distance():
+    assert edit_distance('trowel', 'trowel', 2) == 0
+    assert edit_distance('trowel', 'trowl', 2) == 1
+    assert edit_distance('take', 'tkae', 2) == 1
+    assert edit_distance('lantern', 'lanturn', 2) == 1
+    assert edit_distance('abc', 'xyz', 1) == 2
+
+def test_correct():
+    index = FuzzyIndex(['trowel', 'take', 'lantern', 'rusty', 'north', 'north', 'nooth'])
+    assert index.correct('trowel') == 'trowel'
+    assert index.correct('trowl') == 'trowel'
+    assert index.correct('tkae') == 'take'
+    assert index.correct('lanturn') == 'lantern'
+    assert index.correct('noth') == 'north' # north is used more than nooth
+    assert index.correct('xyzzy') is None
+    assert index.correct('in') is None
+    index.remove('north')
+    assert index.knows('north')
+    index.remove('north')
+    assert not index.knows('north')
+    assert index.correct('noth') == 'nooth'
+
+def test_large_index():
+    rng = random.Random(0)
+    words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) for _ in range(20000)]
+    index = FuzzyIndex(words)
+    for word in words[:200]:
+        typo = word[:1] + word[2:] if len(word) > 5 else word[:-1] + 'q'
+        corrected = index.correct(typo)
+        assert corrected is not None and edit_distance(corrected, typo, 2) <= edit_distance(word, typo, 2)
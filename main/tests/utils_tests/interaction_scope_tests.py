@@ -0,0 +1,59 @@
+import random
+
+from factories.data_read_in import read_in_game
+from models.actors          import HasLocation, Actor, Target, Location, LocationDetail
+from models.requirement     import ItemsHeldRequirement
+from models.response        import StaticResponse
+from utils.change_log       import ChangeLog
+from utils.interaction_scope import InteractionScope, InteractionScopes
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_same_as_checking():
+    rng = random.Random(0)
+    name_space, _, _, controllers, _ = read_in_game(GAME_TO_TEST)
+    named = list(name_space.by_id.values())
+    holders = [one for one in named if isinstance(one, HasLocation) and not isinstance(one, Target)]
+    items = [one for one in named if isinstance(one, Target) and not isinstance(one, Actor)]
+    everything = [one for one in named if isinstance(one, HasLocation)]
+    change_log, scopes = ChangeLog(), InteractionScopes()
+    change_log.attach(everything)
+    change_log.watchers.append(scopes.changed)
+    player = list(controllers.characters.keys())[0]
+    scope = scopes.of(player)
+    rooms = [one for one in holders if isinstance(one, Location)]
+    for _ in range(100):
+        moving, holder = rng.choice(items), rng.choice(holders + [player.get_inventory()])
+        if not holder.is_in(moving):
+            holder.add_child(moving)
+        if rng.random() < 0.1:
+            player.set_location(rng.choice(rooms))
+        room = player.get_top_parent()
+        if isinstance(room, Location):
+            for one in everything:
+                assert scope.can_interact_with(one) == room.can_interact_with(player, one), one
+    assert scope.walks < 100
+
+def test_moves_walk_only_what_moved():
+    room = Location('room', StaticResponse("room"), {})
+    character = Actor('someone', StaticResponse("someone"), 'player', None, None)
+    key, box = Target('key', StaticResponse("key"), None), LocationDetail('box')
+    door = LocationDetail('door', visible_requirements=[ItemsHeldRequirement({key: (True, None)})])
+    stones = [Target(f"stone {i}", StaticResponse("stone"), None) for i in range(3)]
+    change_log, scopes = ChangeLog(), InteractionScopes()
+    change_log.attach([room, character, key, box, door] + stones)
+    change_log.watchers.append(scopes.changed)
+    for child in [character, key, box, door] + stones:
+        room.add_child(child)
+    scope = scopes.of(character)
+    assert scope.can_interact_with(key) and not scope.can_interact_with(door)
+    for stone in stones:
+        character.add_to_inventory(stone)
+        assert scope.can_interact_with(stone)
+    box.add_child(stones[0])
+    assert scope.can_interact_with(stones[0]) and scope.walks == 1
+    box.hidden = True # not something the game changes, so it has to be forgotten by hand
+    scope.forget()
+    assert not scope.can_interact_with(stones[0])
+    character.add_to_inventory(key) # the door's visibility read where the key is
+    assert scope.can_interact_with(door) and scope.walks == 3
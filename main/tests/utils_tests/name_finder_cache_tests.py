@@ -0,0 +1,42 @@
+from factories.data_read_in import read_in_game
+from controls.game_control  import GameState
+from utils.relator          import NameFinder, FlatNameFinder
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_cache_hits_and_misses():
+    for name_finder in [NameFinder, FlatNameFinder]:
+        name_space = read_in_game(GAME_TO_TEST, name_finder=name_finder)[0]
+        stats = name_space.cache_stats()
+        look = name_space.get_from_name('look', 'action')
+        assert name_space.get_from_name('LOOK', ['Action']) == look
+        assert name_space.get_from_name('look', 'action') == look
+        assert name_space.cache_stats()['misses'] == stats['misses'] + 1
+        assert name_space.cache_stats()['hits'] == stats['hits'] + 2
+        inputs = name_space.get_from_input(['look', 'around'])
+        assert name_space.get_from_input(['Look', 'around']) == inputs
+        assert name_space.cache_stats()['hits'] == stats['hits'] + 3
+
+def test_add_and_remove_start_a_new_generation():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    targets = name_space.get_from_name(category='target')
+    removed = min(targets, key=lambda target: target.get_id())
+    generation = name_space.cache_stats()['generation']
+    name_space.remove(removed)
+    assert name_space.cache_stats()['generation'] == generation + 1
+    assert removed not in name_space.get_from_name(category='target')
+    assert len(name_space.get_from_name(category='target')) == len(targets) - 1
+    name_space.add(removed)
+    assert removed in name_space.get_from_name(category='target')
+    assert name_space.get_from_input(removed.get_name().split(" "), 'target')[0][0] is not None
+
+def test_results_are_copies():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    name_space.get_from_name(category='action').clear()
+    assert len(name_space.get_from_name(category='action')) > 0
+
+def test_game_state_uses_cache():
+    name_space, _, every_turn, controllers, details = read_in_game(GAME_TO_TEST)
+    GameState(details, name_space, [], controllers, every_turn)
+    assert name_space.cache_stats()['hits'] > 0
+    assert NameFinder().cache_stats() == {'hits': 0, 'misses': 0, 'size': 0, 'generation': 0}
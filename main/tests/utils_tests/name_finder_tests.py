@@ -0,0 +1,15 @@
+from factories.data_read_in import read_in_game
+from utils.relator          import FrozenWordTree
+
+from tests.test_constants import GAME_TO_TEST
+
+def test_frozen_name_space_thaws_on_write():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    assert all([isinstance(tree, FrozenWordTree) for tree in name_space.by_name.values()])
+    look = name_space.get_from_name('look', 'action')[0]
+    name_space.remove(look)
+    assert not isinstance(name_space.by_name['action'], FrozenWordTree)
+    assert isinstance(name_space.by_name['target'], FrozenWordTree)
+    assert name_space.get_from_input(['look'], 'action') == []
+    name_space.add(look)
+    assert name_space.get_from_input(['look'], 'action')[0][0] is look
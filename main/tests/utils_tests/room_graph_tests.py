@@ -0,0 +1,59 @@
+from collections import deque
+
+from factories.data_read_in import read_in_game
+from models.named           import Direction
+from models.actors          import Actor, Target, Location, SingleEndPath
+from models.requirement     import ItemsHeldRequirement
+from models.response        import StaticResponse
+from utils.room_graph       import RoomGraph
+
+from tests.test_constants import GAME_TO_TEST
+
+def __distances(actor:Actor, start:Location) -> dict[Location,int]:
+    # walking the paths the way WalkAction would
+    distances = {start: 0}
+    to_visit = deque([start])
+    while len(to_visit) > 0:
+        room = to_visit.popleft()
+        for path in room.paths.values():
+            if path.is_visible_to(actor) and path.can_pass(actor)[0]:
+                end = path.get_end(actor)
+                if end is not None and end not in distances:
+                    distances[end] = distances[room] + 1
+                    to_visit.append(end)
+    return distances
+
+def __corridor(length:int, key:Target) -> list[Location]:
+    rooms = [Location(f"room {i}", StaticResponse(""), {}) for i in range(length)]
+    east, west = Direction('east'), Direction('west')
+    for i, (room, next_room) in enumerate(zip(rooms, rooms[1:])):
+        locked = [ItemsHeldRequirement({key: (True, None)})] if i == length//2 else None
+        room.paths[east] = SingleEndPath(f"door {i} east", StaticResponse(""), end=next_room, passing_requirements=locked)
+        next_room.paths[west] = SingleEndPath(f"door {i} west", StaticResponse(""), end=room)
+    return rooms
+
+def test_locked_route():
+    key, stone = Target('key', StaticResponse("key"), None), Target('stone', StaticResponse("stone"), None)
+    rooms = __corridor(10, key)
+    actor = Actor('someone', StaticResponse("someone"), 'player', None, None)
+    rooms[0].add_child(actor)
+    graph = RoomGraph()
+    assert graph.get_route(actor, rooms[0], rooms[-1]) is None and graph.get_distance(actor, rooms[0], rooms[3]) == 3
+    actor.add_to_inventory(stone)
+    actor.set_location(rooms[1])
+    assert graph.get_distance(actor, rooms[0], rooms[4]) == 4 and graph.searches == 1
+    actor.add_to_inventory(key)
+    route = graph.get_route(actor, rooms[0], rooms[-1])
+    assert [room for _, room in route] == rooms[1:] and all([direction.get_name() == 'east' for direction, _ in route])
+    assert graph.get_distance(actor, rooms[-1], rooms[0]) == 9 and graph.searches == 3
+    rooms[0].add_child(key)
+    assert graph.get_distance(actor, rooms[0], rooms[-1]) is None
+
+def test_same_as_walking():
+    name_space, _, _, controllers, _ = read_in_game(GAME_TO_TEST)
+    actor = list(controllers.characters.keys())[0]
+    graph = RoomGraph()
+    for start in name_space.get_from_name(category='location'):
+        assert graph.get_distances(actor, start) == __distances(actor, start)
+        for end, distance in graph.get_distances(actor, start).items():
+            assert len(graph.get_route(actor, start, end)) == distance
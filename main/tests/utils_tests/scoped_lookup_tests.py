@@ -0,0 +1,34 @@
+from factories.data_read_in import read_in_game
+from models.actors          import HasLocation
+from utils.relator          import FlatNameFinder
+
+from tests.test_constants import GAME_TO_TEST
+
+def __filtered(name_space, inputs, category, location):
+    return sorted([(match.get_id(), used, leftover) for match, used, leftover in name_space.get_from_input(inputs, category)
+                   if isinstance(match, HasLocation) and match.is_in(location)])
+
+def test_scoped_lookups_match_filtering():
+    for name_finder in [None, FlatNameFinder]:
+        name_space = read_in_game(GAME_TO_TEST) if name_finder is None else read_in_game(GAME_TO_TEST, name_finder=name_finder)
+        name_space = name_space[0]
+        locations = name_space.get_from_name(category='location')
+        for location in locations:
+            everything = [named for named in name_space.by_id.values() if isinstance(named, HasLocation) and named.is_in(location)]
+            assert set(name_space.get_from_name(location=location)) == set(everything)
+            assert set(name_space.get_from_name(category='target', location=location)) == set([named for named in everything if name_space._category(named) == 'target'])
+            for named in everything:
+                for alias in named.get_aliases():
+                    inputs = alias.split(" ") + ['on', 'table']
+                    for category in [None, 'target', ['target', 'actor']]:
+                        found = sorted([(match.get_id(), used, leftover) for match, used, leftover in name_space.get_from_input(inputs, category, location)])
+                        assert found == __filtered(name_space, inputs, category, location)
+
+def test_scoped_lookups_follow_moves():
+    name_space = read_in_game(GAME_TO_TEST)[0]
+    item = [target for target in name_space.get_from_name(category='target') if target.get_parent() is not None][0]
+    room = [location for location in name_space.get_from_name(category='location') if not item.is_in(location)][0]
+    assert item not in name_space.get_from_name(item.get_name(), location=room)
+    item.set_location(room)
+    assert item in name_space.get_from_name(item.get_name(), location=room)
+    assert name_space.get_from_input(item.get_name().split(" "), 'target', room)[0][0] is item
@@ -31,4 +31,54 @@ def test_get_possible():
     
     assert word_tree.get_possible(['a','b']) == [(4, ['a','b'], [])]
     assert word_tree.get_possible(['a','b','x','y','z']) == [(4, ['a','b'], ['x','y','z']), (2, ['a','b','x','y'], ['z'])]
-    assert word_tree.get_possible(['a'])     == []
\ No newline at end of file
+    assert word_tree.get_possible(['a'])     == []
+
+
+def test_frozen():
+    word_tree = WordTree[int]()
+    word_tree.add(['a','b','c','d'], 1)
+    word_tree.add(['a','b','x','y'], 2)
+    word_tree.add(['x','y','z'],     3)
+    word_tree.add(['a','b'],         4)
+    word_tree.add(['a','b'],         5)
+    frozen = word_tree.freeze()
+
+    for words in [['a','b'], ['a','b','x','y','z'], ['a'], ['q'], ['x','y','z','a'], []]:
+        assert sorted(frozen.get_possible(words)) == sorted(word_tree.get_possible(words))
+    assert sorted(frozen.get_exactly(['a','b'])) == [4,5]
+    assert frozen.get_exactly(['a']) == []
+    with pytest.raises(KeyError):
+        frozen.get_exactly(['a','q'])
+    assert sorted(frozen.all()) == [1,2,3,4,5]
+
+    thawed = frozen.thaw()
+    thawed.add(['q'], 6)
+    thawed.remove(['a','b'], 4)
+    assert thawed.get_exactly(['q']) == [6]
+    assert thawed.get_exactly(['a','b']) == [5]
+    assert sorted(frozen.get_exactly(['a','b'])) == [4,5]
+
+def test_complete():
+    word_tree = WordTree[int]()
+    word_tree.add(['rusty','trowel'], 1)
+    word_tree.add(['rusty','tin'],    2)
+    word_tree.add(['rusty','key'],    3)
+    word_tree.add(['rug'],            4)
+    for tree in [word_tree, word_tree.freeze()]:
+        assert sorted(tree.complete([], 'ru')) == ['rug', 'rusty']
+        assert sorted(tree.complete(['rusty'], 't')) == ['tin', 'trowel']
+        assert sorted(tree.complete(['rusty'], '')) == ['key', 'tin', 'trowel']
+        assert tree.complete(['rug'], '') == []
+        assert tree.complete(['shiny'], '') == []
+
+def test_remove_keeps_longer_names():
+    word_tree = WordTree[str]()
+    word_tree.add(['honey'],        'honey')
+    word_tree.add(['honey','jar'],  'honey jar')
+    word_tree.add(['old','jar'],    'old jar')
+    word_tree.remove(['honey'], 'honey')
+    assert word_tree.get_exactly(['honey','jar']) == ['honey jar']
+    assert word_tree.get_exactly(['honey']) == []
+    word_tree.remove(['honey','jar'], 'honey jar')
+    word_tree.remove(['old','jar'], 'old jar')
+    assert word_tree.tree == {}
@@ -0,0 +1,50 @@
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from models.actors      import HasLocation, Target, Actor
+    from models.requirement import HappenedRequirement
+
+class ChangeLog:
+    """Records which objects of one game have changed since it was read in, so saving only visits what changed.
+    Objects report to the ChangeLog they were attached to, objects without one (templates, tests) report nothing.
+    Every change is also passed on to the watchers (see RequirementWatcher).
+    """
+
+    def __init__(self):
+        self.moved    = dict[str,'HasLocation']()
+        self.states   = dict[str,'Target']()
+        self.skills   = dict[str,'Actor']()
+        self.achieved = dict[str,'Actor']()
+        self.happened = dict[str,'HappenedRequirement']()
+        self.watchers = list[Callable[[object],None]]()
+
+    def attach(self, changeable:list['HasLocation|HappenedRequirement']) -> None:
+        for obj in changeable:
+            obj.change_log = self
+
+    def __changed(self, changed:object) -> None:
+        for watcher in self.watchers:
+            watcher(changed)
+
+    def moved_item(self, item:'HasLocation') -> None:
+        self.moved[item.get_id()] = item
+        self.__changed(item)
+
+    def changed_state(self, target:'Target') -> None:
+        self.states[target.get_id()] = target
+        self.__changed(target)
+
+    def changed_skill(self, actor:'Actor') -> None:
+        self.skills[actor.get_id()] = actor
+        self.__changed(actor)
+
+    def completed_achievement(self, actor:'Actor') -> None:
+        self.achieved[actor.get_id()] = actor
+        self.__changed(actor)
+
+    def requirement_happened(self, requirement:'HappenedRequirement') -> None:
+        self.happened[requirement.id] = requirement
+        self.__changed(requirement)
+
+    def size(self) -> int:
+        return len(self.moved) + len(self.states) + len(self.skills) + len(self.achieved) + len(self.happened)
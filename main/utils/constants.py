@@ -2,4 +2,5 @@ DEBUG_INPUT    = False
 DEBUG_TAKE     = False
 DEBUG_READIN   = False
 DEBUG_RESPONSE = False
-DEBUG_RESPONSES= False
\ No newline at end of file
+DEBUG_RESPONSES= False
+DATA_FOLDER    = "main/data"
@@ -0,0 +1,115 @@
+from typing import Iterable
+
+class FuzzyIndex:
+    """Finds the closest known word to a mistyped one without comparing it to every word (SymSpell).
+    Every known word is stored under each string its first PREFIX letters become with up to MAX_DISTANCE letters deleted,
+    so the words close to a mistyped word are the ones stored under the deletions of the mistyped word.
+    Those few candidates are then checked with the real (Damerau-Levenshtein) edit distance.
+    Like the NameFinder indexes, copies share the index until one of them changes it.
+    """
+    MAX_DISTANCE = 2
+    PREFIX       = 7
+    MIN_LENGTH   = 3 # shorter words (and numbers) are never corrected, almost anything is close to them
+
+    def __init__(self, words:Iterable[str]=None):
+        self.counts  = dict[str,int]()      # word -> how many aliases use it
+        self.deletes = dict[str,set[str]]() # deletion of a word's prefix -> the words
+        self.owned   = True
+        if words is not None:
+            for word in words:
+                self.add(word)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop('owned', None)
+        return state
+
+    def __setstate__(self, state:dict) -> None:
+        self.__dict__.update(state)
+        self.owned = False
+
+    def _to_change(self) -> None:
+        if not self.owned:
+            self.counts  = dict(self.counts)
+            self.deletes = {deleted: set(words) for deleted, words in self.deletes.items()}
+            self.owned   = True
+
+    def _deletions(self, word:str, max_distance:int) -> set[str]:
+        found = {word[:self.PREFIX]}
+        edge = found
+        for _ in range(max_distance):
+            edge = {deleted[:i] + deleted[i+1:] for deleted in edge if len(deleted) > 1 for i in range(len(deleted))}
+            found = found | edge
+        return found
+
+    def _max_distance(self, word:str) -> int:
+        if len(word) < self.MIN_LENGTH or word.isdigit():
+            return 0
+        return 1 if len(word) < 6 else self.MAX_DISTANCE
+
+    def add(self, word:str) -> None:
+        self._to_change()
+        self.counts[word] = self.counts.get(word, 0) + 1
+        if self.counts[word] > 1 or len(word) < self.MIN_LENGTH or word.isdigit():
+            return
+        for deleted in self._deletions(word, self.MAX_DISTANCE):
+            words = self.deletes.get(deleted, None)
+            if words is None:
+                self.deletes[deleted] = {word}
+            else:
+                words.add(word)
+
+    def remove(self, word:str) -> None:
+        if word not in self.counts:
+            return
+        self._to_change()
+        self.counts[word] -= 1
+        if self.counts[word] > 0:
+            return
+        del self.counts[word]
+        for deleted in self._deletions(word, self.MAX_DISTANCE):
+            words = self.deletes.get(deleted, None)
+            if words is not None:
+                words.discard(word)
+                if len(words) == 0:
+                    del self.deletes[deleted]
+
+    def knows(self, word:str) -> bool:
+        return word in self.counts
+
+    def correct(self, word:str) -> str|None:
+        """The known word closest to word (the most used one on a tie), None if there is none close enough"""
+        if word in self.counts:
+            return word
+        max_distance = self._max_distance(word)
+        if max_distance == 0:
+            return None
+        candidates = set[str]()
+        for deleted in self._deletions(word, max_distance):
+            candidates.update(self.deletes.get(deleted, ()))
+        best, best_key = None, None
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            distance = edit_distance(word, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            key = (distance, -self.counts[candidate], candidate)
+            if best_key is None or key < best_key:
+                best, best_key = candidate, key
+        return best
+
+def edit_distance(first:str, second:str, max_distance:int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance, anything over max_distance is returned as max_distance+1"""
+    before, last = None, list(range(len(second)+1))
+    for i in range(1, len(first)+1):
+        row = [i] + [0]*len(second)
+        for j in range(1, len(second)+1):
+            cost = 0 if first[i-1] == second[j-1] else 1
+            row[j] = min(last[j] + 1, row[j-1] + 1, last[j-1] + cost)
+            if before is not None and j > 1 and first[i-1] == second[j-2] and first[i-2] == second[j-1]:
+                row[j] = min(row[j], before[j-2] + 1)
+        if min(row) > max_distance:
+            return max_distance + 1
+        before, last = last, row
+    return min(last[-1], max_distance + 1)
@@ -0,0 +1,175 @@
+import json
+import math
+import os
+import random
+import shutil
+from typing import Any
+
+from utils.constants import *
+
+# Content every generated game takes unchanged from the template game
+SHARED_CATEGORIES = ['directions', 'actions', 'achievements', 'states', 'state_graphs', 'skills', 'skill_sets']
+GRID_DIRECTIONS   = {'north': (0, -1), 'south': (0, 1), 'west': (-1, 0), 'east': (1, 0)}
+EXTRA_DIRECTIONS  = ['northeast', 'northwest', 'southeast', 'southwest', 'up', 'down']
+# Aliases items draw from when their alias collides with other items'
+SHARED_ALIASES    = ['thing', 'object', 'box', 'book', 'stone', 'jar', 'old thing', 'small box', 'red book', 'stone jar']
+
+class GameSettings:
+    """Tunable shape of a generated game. Every rate is a probability between 0 and 1.
+
+    :param rooms: Number of rooms, laid out on a square grid joined by north/south/east/west paths
+    :param items_per_room: Item density, loose items on each room's table
+    :param connectivity: Chance of each extra direction (diagonals, up, down) of a room leading to a random room
+    :param nesting_depth: How many containers deep a nested chain goes
+    :param nesting_rate: Chance of a room holding a nested chain of containers
+    :param alias_collision: Chance of an item also having an alias that other items share
+    :param requirement_density: Chance of a path needing a key, the key is put in a random room
+    :param state_chain_length: Number of state groups in the generated 'chain' state graph, 0 for no chain
+    :param state_chain_rate: Chance of an item having the chain state graph
+    :param documents_per_file: Items or rooms written into each json file
+    """
+    def __init__(self, *, rooms:int=100, items_per_room:int=2, connectivity:float=0.0, nesting_depth:int=0, nesting_rate:float=0.0,
+                 alias_collision:float=0.0, requirement_density:float=0.0, state_chain_length:int=0, state_chain_rate:float=0.0,
+                 documents_per_file:int=1):
+        self.rooms               = rooms
+        self.items_per_room      = items_per_room
+        self.connectivity        = connectivity
+        self.nesting_depth       = nesting_depth
+        self.nesting_rate        = nesting_rate
+        self.alias_collision     = alias_collision
+        self.requirement_density = requirement_density
+        self.state_chain_length  = state_chain_length
+        self.state_chain_rate    = state_chain_rate
+        self.documents_per_file  = documents_per_file
+
+# 10k rooms holding 100k items, for stress testing the engine at scale
+STRESS_SETTINGS = GameSettings(rooms=10000, items_per_room=9, connectivity=0.1, nesting_depth=8, nesting_rate=0.15,
+                               alias_collision=0.3, requirement_density=0.1, state_chain_length=20, state_chain_rate=0.2,
+                               documents_per_file=500)
+
+def __write_json(path:str, document:object) -> None:
+    with open(path, 'w') as out:
+        json.dump(document, out, indent=4)
+
+def __write_documents(folder:str, prefix:str, documents:list[dict[str,Any]], per_file:int) -> None:
+    if per_file <= 1:
+        for document in documents:
+            __write_json(f"{folder}/{document['name'].replace(' ', '_')}.json", document)
+        return
+    for start in range(0, len(documents), per_file):
+        __write_json(f"{folder}/{prefix}_{start//per_file:06d}.json", documents[start:start+per_file])
+
+def __room_name(room:int) -> str:
+    return f"Room {room}"
+
+def __item_document(name:str, settings:GameSettings, rng:random.Random, *, container:bool=False) -> dict[str,Any]:
+    graphs = ["takeable"]
+    if settings.state_chain_length > 0 and rng.random() < settings.state_chain_rate:
+        graphs.append("chain")
+    document = {
+        "name"        : name,
+        "description" : f"a {name.lower()}",
+        "state"       : {
+            "states"  : ["visible"],
+            "graphs"  : graphs
+        },
+        "weight"      : rng.randint(1, 5),
+        "value"       : rng.randint(0, 10),
+        "size"        : rng.randint(1, 3)
+    }
+    if rng.random() < settings.alias_collision:
+        document["aliases"] = [name.lower(), rng.choice(SHARED_ALIASES)]
+    if container:
+        document["details"] = [{"name": "inside"}]
+    return document
+
+def __chain_graph(length:int) -> list[dict[str,Any]]:
+    groups = [{"name": f"chain stage {stage}", "states": ["on" if stage % 2 == 0 else "off"]} for stage in range(length)]
+    return [
+        {"state_groups": groups},
+        {
+            "name"          : "chain",
+            "current_state" : "chain stage 0",
+            "target_graph"  : {f"chain stage {stage}": {"toggle": f"chain stage {stage+1}"} for stage in range(length-1)}
+        }
+    ]
+
+def generate_game(data_folder:str, game:str, settings:GameSettings=None, *, seed:int=0, template:str='aagame1', **kwargs) -> str:
+    """Writes a complete game in the data/<game> layout to data_folder/game, shaped by settings
+    (or GameSettings(**kwargs) when settings is not given). The template's player starts in the first room.
+    The same settings and seed always write the same game. Returns the game's folder
+    """
+    settings = GameSettings(**kwargs) if settings is None else settings
+    rng = random.Random(seed)
+    source = f"{DATA_FOLDER}/{template}"
+    folder = f"{data_folder}/{game}"
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+    for category in SHARED_CATEGORIES:
+        shutil.copytree(f"{source}/{category}", f"{folder}/{category}")
+    shutil.copy(f"{source}/game_details.json", f"{folder}/game_details.json")
+    for category in ['items', 'rooms', 'characters', 'character_control']:
+        os.makedirs(f"{folder}/{category}", exist_ok=True)
+    if settings.state_chain_length > 0:
+        __write_json(f"{folder}/state_graphs/generated_state_graphs.json", __chain_graph(settings.state_chain_length))
+
+    with open(f"{source}/characters/Player.json") as player_file:
+        player = json.load(player_file)
+    __write_json(f"{folder}/characters/Player.json", player)
+    __write_json(f"{folder}/character_control/character_control.json", [{"character": player['name'], "controller": "user"}])
+
+    items = list[dict[str,Any]]()
+    room_documents = list[dict[str,Any]]()
+    room_contents = [list[str]() for _ in range(settings.rooms)]
+    width = max(1, math.ceil(math.sqrt(settings.rooms)))
+    for room in range(settings.rooms):
+        x, y = room % width, room // width
+        paths = dict[str,dict[str,Any]]()
+        ends = [(direction, y*width + x + dx + dy*width) for direction, (dx, dy) in GRID_DIRECTIONS.items()
+                if 0 <= x+dx < width and 0 <= y+dy and (y+dy)*width + x+dx < settings.rooms]
+        ends.extend([(direction, rng.randrange(settings.rooms)) for direction in EXTRA_DIRECTIONS if rng.random() < settings.connectivity])
+        for direction, end in ends:
+            path = {
+                "name"        : f"Exit {len(paths)+1}",
+                "description" : f"A passage leads {direction}.",
+                "end"         : __room_name(end)
+            }
+            if rng.random() < settings.requirement_density:
+                key = f"Key {room} {direction}"
+                items.append(__item_document(key, settings, rng))
+                room_contents[rng.randrange(settings.rooms)].append(key)
+                path["passing_requirements"] = {"items_held_requirements": {key.lower(): [True, f"You need the {key.lower()}."]}}
+            paths[direction] = path
+
+        on_table = [f"Item {room} {i}" for i in range(settings.items_per_room)]
+        items.extend([__item_document(item, settings, rng) for item in on_table])
+        if settings.nesting_depth > 0 and rng.random() < settings.nesting_rate:
+            nested = [f"Box {room} {level}" for level in range(settings.nesting_depth)]
+            for level, box in enumerate(nested):
+                document = __item_document(box, settings, rng, container=True)
+                if level+1 < len(nested):
+                    document["details"][0]["contents"] = [nested[level+1]]
+                items.append(document)
+            on_table.append(nested[0])
+        room_documents.append({
+            "name"        : __room_name(room),
+            "description" : f"You are in room {room}.",
+            "paths"       : paths,
+            "details"     : [{
+                "name"        : "table",
+                "description" : {
+                    "type"    : "contents",
+                    "full"    : "On a table you find",
+                    "empty"   : "There is an empty table"
+                },
+                "contents"    : on_table
+            }]
+        })
+    room_contents[0].append(player['name'])
+    room_documents[0]["start"] = True
+    for room, contents in zip(room_documents, room_contents):
+        if len(contents) > 0:
+            room["contents"] = contents
+    __write_documents(f"{folder}/items", "items", items, settings.documents_per_file)
+    __write_documents(f"{folder}/rooms", "rooms", room_documents, settings.documents_per_file)
+    return folder
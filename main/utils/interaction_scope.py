@@ -0,0 +1,104 @@
+from models.actors      import HasLocation, Location, Actor
+from models.requirement import placement_dependencies
+
+class InteractionScope:
+    """Everything one character can interact with from where they are (see Location.can_interact_with), worked out in one walk
+    and kept until something in it changes, so a command naming many things doesn't walk the room for each of them.
+    Changes come through the game's ChangeLog (see InteractionScopes):
+    something moving in or out of it only walks what moved, the character changing place or anything its visibility read forgets all of it.
+    """
+
+    def __init__(self, character:Actor):
+        self.character = character
+        self.reachable:set[HasLocation]|None = None # None until it is worked out (again)
+        self.open   = dict[HasLocation,bool]()      # holder -> whether its children have to be visible to be reachable
+        self.place  = tuple[HasLocation,...]()      # the character and everything they are in, when it was worked out
+        self.read   = set[object]()                 # what the visibility of everything in it read
+        self.polled = False                         # some visibility didn't know what it read, any change can change it
+        self.walks  = 0
+
+    def get_reachable(self) -> set[HasLocation]:
+        if self.reachable is None:
+            self.__walk_all()
+        return self.reachable
+
+    def can_interact_with(self, item:object) -> bool:
+        return item in self.get_reachable()
+
+    def forget(self) -> None:
+        self.reachable = None
+
+    def changed(self, changed:object) -> None:
+        if self.reachable is None:
+            return
+        if self.polled or changed in self.read:
+            self.forget()
+        elif changed in self.place:
+            if tuple(placement_dependencies(self.character)) != self.place:
+                self.forget()
+        elif isinstance(changed, HasLocation) and (changed in self.reachable or changed.parent in self.open):
+            self.__moved(changed)
+
+    def __visible(self, item:HasLocation) -> bool:
+        if item.hidden:
+            return False
+        if item._visibility_varies():
+            dependencies = item._visibility_dependencies(self.character)
+            if dependencies is None:
+                self.polled = True
+            else:
+                self.read.update(dependencies)
+        return item.is_visible_to(self.character)
+
+    def __walk(self, holder:HasLocation, visible_only:bool) -> None:
+        to_walk = [holder]
+        while len(to_walk) > 0:
+            holder = to_walk.pop()
+            self.open[holder] = visible_only
+            for child in holder.children.get_from_name():
+                if visible_only and not self.__visible(child):
+                    continue
+                self.reachable.add(child)
+                if child is not self.character: # what the character holds is walked without looking at visibility
+                    to_walk.append(child)
+
+    def __walk_all(self) -> None:
+        self.walks += 1
+        self.reachable, self.open, self.read, self.polled = set[HasLocation](), dict[HasLocation,bool](), set[object](), False
+        self.place = tuple(placement_dependencies(self.character))
+        room = self.place[-1]
+        self.__walk(room, True)
+        if isinstance(room, Location):
+            for path in room.paths.values():
+                if self.__visible(path):
+                    self.reachable.add(path)
+                    self.__walk(path, True)
+        self.__walk(self.character, False)
+
+    def __moved(self, item:HasLocation) -> None:
+        to_forget = [item]
+        while len(to_forget) > 0:
+            holder = to_forget.pop()
+            self.reachable.discard(holder)
+            self.open.pop(holder, None)
+            to_forget.extend(holder.children.get_from_name())
+        visible_only = self.open.get(item.parent, None)
+        if visible_only is not None and (not visible_only or self.__visible(item)):
+            self.reachable.add(item)
+            self.__walk(item, visible_only)
+
+class InteractionScopes:
+    """The InteractionScope of every character in one game, each told about everything the game's ChangeLog records"""
+
+    def __init__(self):
+        self.scopes = dict[Actor,InteractionScope]()
+
+    def of(self, character:Actor) -> InteractionScope:
+        scope = self.scopes.get(character, None)
+        if scope is None:
+            scope = self.scopes[character] = InteractionScope(character)
+        return scope
+
+    def changed(self, changed:object) -> None:
+        for scope in self.scopes.values():
+            scope.changed(changed)
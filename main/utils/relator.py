@@ -1,4 +1,9 @@
-from typing import TYPE_CHECKING, TypeVar
+from typing import TYPE_CHECKING, TypeVar, Callable, Iterable
+from array  import array
+from bisect import bisect_left
+import copy
+
+from utils.fuzzy import FuzzyIndex
 
 if TYPE_CHECKING:
     from models.actors import HasLocation
@@ -10,6 +15,11 @@ class WordTree[T]:
         self.tree = dict[str,WordTree]()
         self.value = set[T]()
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop('__orig_class__', None)
+        return state
+
     def add(self, words:list[str], value:T) -> None:
         if len(words) == 0:
             self.value.add(value)
@@ -36,14 +46,13 @@ class WordTree[T]:
         else:
             if len(words) == 0:
                 self.value.remove(value)
-            elif len(words) == 1:
-                self.tree[words[0]].remove([], value)
-                if len(self.tree[words[0]].value) == 0:
-                    del self.tree[words[0]]
             else:
                 first, rest = words[0], words[1:]
                 if first in self.tree:
                     self.tree[first].remove(rest, value)
+                    # only a node nothing else goes through can go, 'honey' is still on the way to 'honey jar'
+                    if len(self.tree[first].value) == 0 and len(self.tree[first].tree) == 0:
+                        del self.tree[first]
 
     def get_exactly(self, words:list[str]) -> list[T]:
         if len(words) == 0:
@@ -66,6 +75,141 @@ class WordTree[T]:
             result.extend(child.all())
         return result
 
+    def complete(self, words:list[str], partial:str) -> list[str]:
+        """The words that come after words and start with partial"""
+        node = self
+        for word in words:
+            if word not in node.tree:
+                return []
+            node = node.tree[word]
+        return [word for word in node.tree.keys() if word.startswith(partial)]
+
+    def freeze(self) -> 'FrozenWordTree[T]':
+        return FrozenWordTree(self)
+
+class FrozenWordTree[T]:
+    """A read only WordTree packed into a few flat arrays instead of a dict and a set per node.
+    Nodes are numbered breadth first, node i's edges are edge_words/edge_ends[edge_start[i]:edge_start[i+1]]
+    (sorted by word so they are binary searched) and its values are values[value_start[i]:value_start[i+1]].
+    Lookups give the same results as the WordTree it was frozen from, thaw() gives back a WordTree to change.
+    """
+    __slots__ = ('edge_start', 'edge_words', 'edge_ends', 'value_start', 'values')
+
+    def __init__(self, tree:WordTree[T]):
+        nodes = list[WordTree]([tree])
+        edge_start, edge_words, edge_ends = array('I', [0]), list[str](), array('I')
+        value_start, values = array('I', [0]), list[T]()
+        for node in nodes: # nodes grows as the loop goes, so every node is visited breadth first
+            for word in sorted(node.tree.keys()):
+                edge_words.append(word)
+                edge_ends.append(len(nodes))
+                nodes.append(node.tree[word])
+            edge_start.append(len(edge_words))
+            values.extend(node.value)
+            value_start.append(len(values))
+        self.edge_start  = edge_start
+        self.edge_words  = tuple(edge_words)
+        self.edge_ends   = edge_ends
+        self.value_start = value_start
+        self.values      = tuple(values)
+
+    def __getstate__(self) -> tuple:
+        return (self.edge_start, self.edge_words, self.edge_ends, self.value_start, self.values)
+
+    def __setstate__(self, state:tuple) -> None:
+        self.edge_start, self.edge_words, self.edge_ends, self.value_start, self.values = state
+
+    def _child(self, node:int, word:str) -> int:
+        start, end = self.edge_start[node], self.edge_start[node+1]
+        edge = bisect_left(self.edge_words, word, start, end)
+        if edge < end and self.edge_words[edge] == word:
+            return self.edge_ends[edge]
+        return -1
+
+    def _values(self, node:int) -> tuple[T,...]:
+        return self.values[self.value_start[node]:self.value_start[node+1]]
+
+    def get_exactly(self, words:list[str]) -> list[T]:
+        node = 0
+        for word in words:
+            node = self._child(node, word)
+            if node < 0:
+                raise KeyError(word)
+        return list(self._values(node))
+
+    def get_possible(self, words:list[str], used_words:list[str]=None) -> list[tuple[T,list[str],list[str]]]:
+        used_words = list[str]() if used_words is None else used_words
+        possible = list[tuple[T,list[str],list[str]]]()
+        node = 0
+        for used in range(len(words)+1):
+            possible.extend([(value, used_words+words[:used], words[used:]) for value in self._values(node)])
+            if used == len(words):
+                break
+            node = self._child(node, words[used])
+            if node < 0:
+                break
+        return possible
+
+    def all(self) -> list[T]:
+        return list(self.values)
+
+    def complete(self, words:list[str], partial:str) -> list[str]:
+        """The words that come after words and start with partial, found by binary search on the sorted edges"""
+        node = 0
+        for word in words:
+            node = self._child(node, word)
+            if node < 0:
+                return []
+        start, end = self.edge_start[node], self.edge_start[node+1]
+        first = bisect_left(self.edge_words, partial, start, end)
+        last = bisect_left(self.edge_words, partial + '\U0010ffff', first, end)
+        return list(self.edge_words[first:last])
+
+    def thaw(self) -> WordTree[T]:
+        nodes = [WordTree[T]() for _ in range(len(self.value_start)-1)]
+        for node, tree in enumerate(nodes):
+            tree.value.update(self._values(node))
+            for edge in range(self.edge_start[node], self.edge_start[node+1]):
+                tree.tree[self.edge_words[edge]] = nodes[self.edge_ends[edge]]
+        return nodes[0]
+
+# CATEGORIES
+
+_category_names  = dict[type,str]()
+_category_groups = dict[object,tuple[str,...]]()
+
+def category_of(cls:type) -> str:
+    """The category of every instance of cls, its lowercased class name"""
+    name = _category_names.get(cls, None)
+    if name is None:
+        name = _category_names[cls] = cls.__name__.lower()
+    return name
+
+def __with_subclasses(cls:type) -> list[type]:
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(__with_subclasses(subclass))
+    return classes
+
+def categories_of(category:'str|type|list[str|type]') -> tuple[str,...]|None:
+    """The categories a category argument stands for, None for every category.
+    A name stands for that category only, a class for its own category and those of all its subclasses (Target covers Actor).
+    Worked out once per argument, so classes must be defined before they are first searched for.
+    """
+    if category is None:
+        return None
+    key = tuple(category) if isinstance(category, list) else category
+    categories = _category_groups.get(key, None)
+    if categories is None:
+        names = list[str]()
+        for cat in (category if isinstance(category, list) else [category]):
+            if isinstance(cat, type):
+                names.extend([category_of(cls) for cls in __with_subclasses(cat)])
+            else:
+                names.append(cat.lower())
+        categories = _category_groups[key] = tuple(dict.fromkeys(names))
+    return categories
+
 T = TypeVar("T", bound="Named")
 class NameFinder[T]:
     """Stores Items/Objects/Characters/Actions/ anything in the game namespace for quick access.
@@ -73,24 +217,118 @@ class NameFinder[T]:
         id - Each object has a unique id
         name/alias - Each object can have multiple names/aliases. These are not unique and may be shared by multiple objects.
         category/location limit - Each object has a category (Item/Character/Action/Room/...) and may have a location (HasLocation). By limiting the scope, fewer items can be returned from the first two types of access.
+        A category can be given by name ('target'), by class (Target, which also covers subclasses like Actor) or as a list of either (see categories_of).
+    Location limited lookups don't search the whole name space, they search the ChildCollections of the location and of
+    everything under it (which set_location/add_child/remove_child keep up to date), so they cost as much as the location holds.
+    The name indexes only hold ids, so copies of a NameFinder (forks, snapshots) can share them until one of the copies changes a category.
+    With cache on, name and input lookups (not location limited ones) are remembered along with the generation they were made in.
+    Every add/remove starts a new generation, so a remembered result is only used while nothing has been added or removed.
     """
-    def __init__(self):
-        self.by_name = dict[str,WordTree[T]]()
+    CACHE_SIZE = 4096
+
+    def __init__(self, *, cache:bool=False):
+        self.by_name = dict[str,WordTree[str]|FrozenWordTree[str]]()
         self.by_id   = dict[str,T]()
+        self.owned   = set[str]() # categories whose WordTree is not shared with another NameFinder
+        self.cache   = dict[tuple,tuple[int,list]]() if cache else None
+        self.fuzzy:FuzzyIndex = None
+        self.generation = 0
+        self.hits    = 0
+        self.misses  = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop('__orig_class__', None)
+        state.pop('owned', None)
+        if state['cache'] is not None:
+            state['cache'] = dict[tuple,tuple[int,list]]()
+        return state
+
+    def __setstate__(self, state:dict) -> None:
+        self.__dict__.update(state)
+        self.owned = set[str]()
+
+    # CACHE
+
+    def enable_cache(self) -> None:
+        if self.cache is None:
+            self.cache = dict[tuple,tuple[int,list]]()
+
+    def cache_stats(self) -> dict[str,int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': 0 if self.cache is None else len(self.cache), 'generation': self.generation}
+
+    def _changed(self, named:'T|Named', added:bool) -> None:
+        self.generation += 1
+        if self.fuzzy is not None:
+            for name in named.get_aliases():
+                for word in name.lower().split(" "):
+                    if added:
+                        self.fuzzy.add(word)
+                    else:
+                        self.fuzzy.remove(word)
+
+    def _cached(self, key:tuple, lookup) -> list:
+        entry = self.cache.get(key, None)
+        if entry is not None and entry[0] == self.generation:
+            self.hits += 1
+            return list(entry[1])
+        self.misses += 1
+        result = lookup()
+        if len(self.cache) >= self.CACHE_SIZE:
+            self.cache.clear()
+        self.cache[key] = (self.generation, result)
+        return list(result)
 
     def _category(self, named:T) -> str:
-        return str(type(named)).lower().split(".")[-1][:-2]
+        return category_of(type(named))
+
+    def shared_indexes(self) -> list[object]:
+        """The name indexes copies of this NameFinder may share (see _tree_to_change)"""
+        return list(self.by_name.values()) + self._fuzzy_indexes()
+
+    # SPELLING
+
+    def enable_fuzzy(self) -> None:
+        """Indexes every word of every alias so mistyped words can be corrected (see FuzzyIndex)"""
+        if self.fuzzy is None:
+            self.fuzzy = FuzzyIndex([word for named in self.by_id.values() for name in named.get_aliases() for word in name.lower().split(" ")])
+
+    def _fuzzy_indexes(self) -> list[object]:
+        return [] if self.fuzzy is None else [self.fuzzy.counts, self.fuzzy.deletes]
+
+    def knows(self, word:str) -> bool:
+        """Whether word is in any alias, always True without the fuzzy index"""
+        return self.fuzzy is None or self.fuzzy.knows(word.lower())
+
+    def correct(self, word:str) -> str|None:
+        """The alias word closest to word, None when there is none close enough or no fuzzy index"""
+        return None if self.fuzzy is None else self.fuzzy.correct(word.lower())
+
+    def freeze(self) -> None:
+        """Packs every name index into a FrozenWordTree, the first change to a category thaws its index again"""
+        for category, tree in self.by_name.items():
+            if isinstance(tree, WordTree):
+                self.by_name[category] = tree.freeze()
+
+    def _tree_to_change(self, category:str) -> WordTree[str]:
+        if category not in self.by_name:
+            self.by_name[category] = WordTree[str]()
+        elif isinstance(self.by_name[category], FrozenWordTree):
+            self.by_name[category] = self.by_name[category].thaw()
+        elif category not in self.owned:
+            self.by_name[category] = copy.deepcopy(self.by_name[category])
+        self.owned.add(category)
+        return self.by_name[category]
 
     def add(self, named:'T|Named') -> bool:
         if named.get_id() in self.by_id:
             return False
+        self._changed(named, True)
         self.by_id[named.get_id()] = named
-        category = self._category(named)
-        if category not in self.by_name:
-            self.by_name[category] = WordTree[T]()
+        tree = self._tree_to_change(self._category(named))
         for name in named.get_aliases():
             name = name.lower().split(" ")
-            self.by_name[category].add(name, named)
+            tree.add(name, named.get_id())
         return True
     
     def add_many(self, to_add:list[T]) -> list[bool]:
@@ -101,72 +339,373 @@ class NameFinder[T]:
             del self.by_id[named.get_id()]
         else:
             return False
+        self._changed(named, False)
         category = self._category(named)
         if category in self.by_name:
+            tree = self._tree_to_change(category)
             for name in named.get_aliases():
                 name = name.lower().split(" ")
-                self.by_name[category].remove(name, named)
+                tree.remove(name, named.get_id())
         return True
 
-    def get_from_name(self, name:str=None, category:str|list[str]=None, location:'HasLocation'=None) -> list[T]:
-        matches = set[T]()
-        if isinstance(category, str):
-            category = category.lower()
-            if category in self.by_name:
-                if name is None:
-                    matches.update(set(self.by_name[category].all()))
-                else:
-                    name = name.lower().split(" ")
-                    matches.update(set(self.by_name[category].get_exactly(name)))
-        elif isinstance(category, list):
-            for cat in category:
-                cat = cat.lower()
-                if cat in self.by_name:
-                    if name is None:
-                        matches.update(set(self.by_name[cat].all()))
-                    else:
-                        name = name.lower().split(" ")
-                        matches.update(set(self.by_name[cat].get_exactly(name)))
-        else: # category is None
-            for cat in self.by_name.keys():
-                if name is None:
-                    matches.update(set(self.by_name[cat].all()))
-                else:
-                    name = name.lower().split(" ")
-                    matches.update(set(self.by_name[cat].get_exactly(name)))
-        matches = list[T](matches)
+    def get_from_name(self, name:str=None, category:'str|type|list[str|type]'=None, location:'HasLocation'=None) -> list[T]:
         if location is not None:
-            matches = [match for match in matches if isinstance(match, HasLocation) and match.is_in(location)]
-        return matches
+            return self._get_from_name_within(name, category, location)
+        if self.cache is None:
+            return self._find_by_name(name, category)
+        key = ('name', None if name is None else name.lower(), categories_of(category))
+        return self._cached(key, lambda: self._find_by_name(name, category))
+
+    def _find_by_name(self, name:str, category:'str|type|list[str|type]') -> list[T]:
+        categories = categories_of(category)
+        words = None if name is None else name.lower().split(" ")
+        matches = set[str]()
+        for cat in (self.by_name.keys() if categories is None else categories):
+            if cat in self.by_name:
+                if words is None:
+                    matches.update(self.by_name[cat].all())
+                else:
+                    matches.update(self.by_name[cat].get_exactly(words))
+        return [self.by_id[id] for id in matches]
     
-    def get_from_id(self, id:str, category:str|list[str]=None) -> T:
+    def get_from_id(self, id:str, category:'str|type|list[str|type]'=None) -> T:
         id = id.lower()
-        if id in self.by_id:
-            if category is None or \
-            (isinstance(category, str)  and self._category(self.by_id[id]) == category.lower()) or \
-            (isinstance(category, list) and self._category(self.by_id[id]) in [cat.lower() for cat in category]):
-                return self.by_id[id]
+        if id in self.by_id and self._in_category(self.by_id[id], category):
+            return self.by_id[id]
         raise ValueError(f"\"{id}\" not found in category {category}")
     
     def contains(self, named:'T|Named') -> bool:
         return named.get_id() in self.by_id
     
-    def get_from_input(self, inputs:list[str], category:str|list[str]=None, location:'HasLocation'=None) -> list[tuple[T,list[str],list[str]]]:
-        matches = list[tuple[T,list[str],list[str]]]()
+    def get_from_input(self, inputs:list[str], category:'str|type|list[str|type]'=None, location:'HasLocation'=None) -> list[tuple[T,list[str],list[str]]]:
+        if location is not None:
+            return self._get_from_input_within(inputs, category, location)
+        if self.cache is None:
+            return self._find_by_input(inputs, category)
+        key = ('input', tuple([input.lower() for input in inputs]), categories_of(category))
+        return self._cached(key, lambda: self._find_by_input(inputs, category))
+
+    def _find_by_input(self, inputs:list[str], category:'str|type|list[str|type]') -> list[tuple[T,list[str],list[str]]]:
+        categories = categories_of(category)
         inputs = [input.lower() for input in inputs]
-        if category is None:
-            for cat in self.by_name.keys():
+        matches = list[tuple[str,list[str],list[str]]]()
+        for cat in (self.by_name.keys() if categories is None else categories):
+            if cat in self.by_name:
                 matches.extend(self.by_name[cat].get_possible(inputs))
-        elif isinstance(category, str):
-            category = category.lower()
-            if category in self.by_name:
-                matches.extend(self.by_name[category].get_possible(inputs))
-        elif isinstance(category, list):
-            for cat in category:
-                cat = cat.lower()
-                matches.extend(self.by_name[cat].get_possible(inputs))
-        else:
-            raise RuntimeError()
-        if location is not None:
-            matches = [(match,used,leftover) for match,used,leftover in matches if isinstance(match, HasLocation) and match.is_in(location)]
-        return matches
\ No newline at end of file
+        return [(self.by_id[id],used,leftover) for id,used,leftover in matches]
+
+    # COMPLETION
+
+    def complete(self, text:str, category:'str|type|list[str|type]'=None, location:'HasLocation'=None, allowed:Callable[[T],bool]=None) -> list[str]:
+        """Completes the last, partly typed, word of text to the words that can follow the rest of text in an alias.
+        Ranked by how many aliases use each word (see _ranked), then alphabetically.
+        Without location or allowed the name indexes are walked, which costs about as much as text is long.
+        Otherwise the aliases of what is under location (and allowed) are checked, which costs as much as location holds.
+        """
+        words = text.lower().split(" ")
+        words, partial = words[:-1], words[-1]
+        if location is None and allowed is None:
+            completions = set[str]()
+            categories = categories_of(category)
+            for cat in (self.by_name.keys() if categories is None else categories):
+                if cat in self.by_name:
+                    completions.update(self.by_name[cat].complete(words, partial))
+            return self._ranked(completions)
+        uses = dict[str,int]()
+        named = self.get_from_name(category=category, location=location)
+        for match in (named if allowed is None else [match for match in named if allowed(match)]):
+            for alias in match.get_aliases():
+                alias = alias.lower().split(" ")
+                if len(alias) > len(words) and alias[:len(words)] == words and alias[len(words)].startswith(partial):
+                    uses[alias[len(words)]] = uses.get(alias[len(words)], 0) + 1
+        return self._ranked(uses.keys(), uses)
+
+    def _ranked(self, completions:Iterable[str], uses:dict[str,int]=None) -> list[str]:
+        """completions with the ones used by the most aliases first, counted in uses or else over the whole name space.
+        The whole name space is counted by the fuzzy index, without it completions are only sorted alphabetically.
+        """
+        if uses is None:
+            uses = {} if self.fuzzy is None else self.fuzzy.counts
+        return sorted(completions, key=lambda word: (-uses.get(word, 0), word))
+
+    # LOCATION LIMITED
+
+    def _in_category(self, named:T, category:'str|type|list[str|type]') -> bool:
+        categories = categories_of(category)
+        return categories is None or self._category(named) in categories
+
+    def _indexes_within(self, location:'HasLocation') -> list[tuple['HasLocation','ChildCollection']]:
+        """location and everything under it, each with its ChildCollection"""
+        indexes = list[tuple['HasLocation',ChildCollection]]()
+        to_visit = list['HasLocation']([location])
+        while len(to_visit) > 0:
+            current = to_visit.pop()
+            indexes.append((current, current.children))
+            to_visit.extend([child for child in current.children.by_id.values() if child.parent is current])
+        return indexes
+
+    def _held(self, named:T, parent:'HasLocation') -> bool:
+        # a child whose parent was changed directly (while reading in) can still be in its old parent's children
+        return named.parent is parent and self.by_id.get(named.get_id(), None) is named
+
+    def _get_from_name_within(self, name:str, category:'str|type|list[str|type]', location:'HasLocation') -> list[T]:
+        matches = list[T]()
+        if self._in_category(location, category) and self.by_id.get(location.get_id(), None) is location and \
+            (name is None or name.lower() in [alias.lower() for alias in location.get_aliases()]):
+            matches.append(location)
+        for parent, index in self._indexes_within(location):
+            matches.extend([named for named in index.get_from_name(name, category) if self._held(named, parent)])
+        return list(dict.fromkeys(matches))
+
+    def _get_from_input_within(self, inputs:list[str], category:'str|type|list[str|type]', location:'HasLocation') -> list[tuple[T,list[str],list[str]]]:
+        inputs = [input.lower() for input in inputs]
+        matches = list[tuple[T,list[str],list[str]]]()
+        if self._in_category(location, category) and self.by_id.get(location.get_id(), None) is location:
+            for alias in location.get_aliases():
+                words = alias.lower().split(" ")
+                if inputs[:len(words)] == words:
+                    matches.append((location, inputs[:len(words)], inputs[len(words):]))
+        for parent, index in self._indexes_within(location):
+            matches.extend([match for match in index.get_from_input(inputs, category) if self._held(match[0], parent)])
+        return matches
+
+class FlatNameFinder(NameFinder[T]):
+    """A NameFinder with a single flat index instead of one WordTree per category.
+    Every word of every alias is interned to an int, each alias is stored once as its tuple of word ids, mapped to
+    the ids of the objects with that alias and the bit of their category. Searching categories is a mask test, so
+    a lookup costs one dict probe per input word however many categories are searched.
+    Like NameFinder, copies share the index until one of them changes it.
+    """
+    def __init__(self, *, cache:bool=False):
+        super().__init__(cache=cache)
+        self.tokens        = dict[str,int]()                      # word -> interned word id
+        self.category_bits = dict[str,int]()                      # category -> bit
+        self.id_bits       = dict[str,int]()                      # object id -> bit of its category
+        self.index         = dict[tuple[int,...],dict[str,int]]() # alias -> {object id: bit of its category}
+        self.prefixes      = dict[tuple[int,...],int]()           # alias prefix -> number of aliases starting with it
+        self.masks         = dict[tuple[str,...],int]()           # categories -> their bits
+        self.completions:tuple[int,dict[str,list[str]]] = None    # generation, category -> its sorted aliases
+
+    def shared_indexes(self) -> list[object]:
+        return [self.tokens, self.category_bits, self.id_bits, self.index, self.prefixes] + self._fuzzy_indexes()
+
+    def _index_to_change(self) -> None:
+        if 'index' in self.owned:
+            return
+        self.tokens        = dict(self.tokens)
+        self.category_bits = dict(self.category_bits)
+        self.id_bits       = dict(self.id_bits)
+        self.index         = {alias: dict(ids) for alias, ids in self.index.items()}
+        self.prefixes      = dict(self.prefixes)
+        self.owned.add('index')
+
+    def _intern(self, name:str) -> tuple[int,...]:
+        words = list[int]()
+        for word in name.lower().split(" "):
+            if word not in self.tokens:
+                self.tokens[word] = len(self.tokens)
+            words.append(self.tokens[word])
+        return tuple(words)
+
+    def _mask(self, category:'str|type|list[str|type]') -> int:
+        categories = categories_of(category)
+        if categories is None:
+            return -1
+        mask = self.masks.get(categories, None)
+        if mask is None:
+            mask = 0
+            for cat in categories:
+                mask |= self.category_bits.get(cat, 0)
+            self.masks[categories] = mask
+        return mask
+
+    def add(self, named:'T|Named') -> bool:
+        if named.get_id() in self.by_id:
+            return False
+        self._changed(named, True)
+        self._index_to_change()
+        self.by_id[named.get_id()] = named
+        category = self._category(named)
+        if category not in self.category_bits:
+            self.category_bits[category] = 1 << len(self.category_bits)
+            self.masks = dict[tuple[str,...],int]()
+        bit = self.id_bits[named.get_id()] = self.category_bits[category]
+        for name in named.get_aliases():
+            alias = self._intern(name)
+            self.index.setdefault(alias, dict[str,int]())[named.get_id()] = bit
+            for end in range(1, len(alias)+1):
+                self.prefixes[alias[:end]] = self.prefixes.get(alias[:end], 0) + 1
+        return True
+
+    def remove(self, named:'T|Named') -> bool:
+        if named.get_id() not in self.by_id:
+            return False
+        self._changed(named, False)
+        self._index_to_change()
+        del self.by_id[named.get_id()]
+        del self.id_bits[named.get_id()]
+        for name in named.get_aliases():
+            alias = self._intern(name)
+            ids = self.index.get(alias, {})
+            ids.pop(named.get_id(), None)
+            if len(ids) == 0:
+                self.index.pop(alias, None)
+            for end in range(1, len(alias)+1):
+                self.prefixes[alias[:end]] -= 1
+                if self.prefixes[alias[:end]] == 0:
+                    del self.prefixes[alias[:end]]
+        return True
+
+    def _find_by_name(self, name:str, category:'str|type|list[str|type]') -> list[T]:
+        mask = self._mask(category)
+        if name is None:
+            return [self.by_id[id] for id, bit in self.id_bits.items() if bit & mask]
+        alias = tuple([self.tokens.get(word, -1) for word in name.lower().split(" ")])
+        return [self.by_id[id] for id, bit in self.index.get(alias, {}).items() if bit & mask]
+
+    def _find_by_input(self, inputs:list[str], category:'str|type|list[str|type]') -> list[tuple[T,list[str],list[str]]]:
+        mask = self._mask(category)
+        matches = list[tuple[T,list[str],list[str]]]()
+        inputs = [input.lower() for input in inputs]
+        alias = tuple[int,...]()
+        for end, word in enumerate(inputs, 1):
+            alias += (self.tokens.get(word, -1),)
+            if alias not in self.prefixes:
+                break
+            for id, bit in self.index.get(alias, {}).items():
+                if bit & mask:
+                    matches.append((self.by_id[id], inputs[:end], inputs[end:]))
+        return matches
+
+    def complete(self, text:str, category:'str|type|list[str|type]'=None, location:'HasLocation'=None, allowed:Callable[[T],bool]=None) -> list[str]:
+        """Like NameFinder.complete, the aliases of each category are kept sorted (until the next add/remove) and binary searched"""
+        if location is not None or allowed is not None:
+            return super().complete(text, category, location, allowed)
+        if self.completions is None or self.completions[0] != self.generation:
+            words_of = {token: word for word, token in self.tokens.items()}
+            categories_of_bit = {bit: cat for cat, bit in self.category_bits.items()}
+            aliases = dict[str,set[str]]()
+            for alias, ids in self.index.items():
+                for bit in set(ids.values()):
+                    aliases.setdefault(categories_of_bit[bit], set[str]()).add(" ".join([words_of[token] for token in alias]))
+            self.completions = (self.generation, {cat: sorted(names) for cat, names in aliases.items()})
+        text = text.lower()
+        words = text.split(" ")[:-1]
+        categories = categories_of(category)
+        completions = set[str]()
+        for cat, aliases in self.completions[1].items():
+            if categories is not None and cat not in categories:
+                continue
+            for alias in aliases[bisect_left(aliases, text):]:
+                if not alias.startswith(text):
+                    break
+                alias = alias.split(" ")
+                if len(alias) > len(words):
+                    completions.add(alias[len(words)])
+        return self._ranked(completions)
+
+class ChildCollection[T]:
+    """The children of a HasLocation, in the order they were added, by id.
+    Most containers hold a handful of things and are never searched by name, so they don't get their own name indexes:
+    small collections are scanned, bigger ones build a NameFinder the first time they are searched by name and keep it up to date.
+    The special children (on, inside, inventory, wearing) are kept apart so HasLocation.get_special_child doesn't search at all.
+    """
+    __slots__ = ('by_id', 'special', 'names')
+    INDEX_SIZE    = 32 # collections with more children than this build a NameFinder to search by name
+    SPECIAL_NAMES = ('on', 'inside', 'inventory', 'wearing')
+
+    def __init__(self):
+        self.by_id:dict[str,T] = dict[str,T]()
+        self.special:dict[str,list[T]] = None # special name -> the children with that alias, made on the first special child
+        self.names:NameFinder[T] = None
+
+    def __getstate__(self) -> tuple:
+        return self.by_id, self.special
+
+    def __setstate__(self, state:tuple) -> None:
+        self.by_id, self.special = state
+        self.names = None
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def add(self, named:'T|Named') -> bool:
+        if named.get_id() in self.by_id:
+            return False
+        self.by_id[named.get_id()] = named
+        for alias in named.get_aliases():
+            if alias in self.SPECIAL_NAMES:
+                if self.special is None:
+                    self.special = dict[str,list[T]]()
+                self.special.setdefault(alias, list[T]()).append(named)
+        if self.names is not None:
+            self.names.add(named)
+        return True
+
+    def add_many(self, to_add:list[T]) -> list[bool]:
+        return [self.add(named) for named in to_add]
+
+    def remove(self, named:'T|Named') -> bool:
+        if self.by_id.pop(named.get_id(), None) is None:
+            return False
+        if self.special is not None:
+            for alias in named.get_aliases():
+                if alias in self.special and named in self.special[alias]:
+                    self.special[alias].remove(named)
+        if self.names is not None:
+            self.names.remove(named)
+        return True
+
+    def contains(self, named:'T|Named') -> bool:
+        return named.get_id() in self.by_id
+
+    def get_from_id(self, id:str, category:'str|type|list[str|type]'=None) -> T:
+        named = self.by_id.get(id.lower(), None)
+        if named is not None and self._in_category(named, category):
+            return named
+        raise ValueError(f"\"{id}\" not found in category {category}")
+
+    def get_special(self, name:str) -> T|None:
+        """The only child called name (one of SPECIAL_NAMES), None if there is none or more than one"""
+        found = None if self.special is None else self.special.get(name, None)
+        return found[0] if found is not None and len(found) == 1 else None
+
+    def _in_category(self, named:T, category:'str|type|list[str|type]') -> bool:
+        categories = categories_of(category)
+        return categories is None or category_of(type(named)) in categories
+
+    def _index(self) -> 'NameFinder[T]|None':
+        if self.names is None and len(self.by_id) > self.INDEX_SIZE:
+            self.names = NameFinder[T]()
+            self.names.add_many(list(self.by_id.values()))
+        return self.names
+
+    def get_from_name(self, name:str=None, category:'str|type|list[str|type]'=None) -> list[T]:
+        if name is None:
+            return [named for named in self.by_id.values() if self._in_category(named, category)]
+        name = name.lower()
+        if self._index() is not None:
+            words = name.split(" ")
+            categories = categories_of(category)
+            ids = list[str]()
+            for cat, tree in self.names.by_name.items():
+                if categories is None or cat in categories:
+                    try:
+                        ids.extend(tree.get_exactly(words))
+                    except KeyError: # nothing in this category has the name
+                        continue
+            return [self.by_id[id] for id in dict.fromkeys(ids)]
+        return [named for named in self.by_id.values() if name in named.get_aliases() and self._in_category(named, category)]
+
+    def get_from_input(self, inputs:list[str], category:'str|type|list[str|type]'=None) -> list[tuple[T,list[str],list[str]]]:
+        inputs = [input.lower() for input in inputs]
+        if self._index() is not None:
+            return self.names.get_from_input(inputs, category)
+        matches = list[tuple[T,list[str],list[str]]]()
+        for named in self.by_id.values():
+            if self._in_category(named, category):
+                for alias in named.get_aliases():
+                    words = alias.split(" ")
+                    if inputs[:len(words)] == words:
+                        matches.append((named, inputs[:len(words)], inputs[len(words):]))
+        return matches
@@ -0,0 +1,63 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.actors import Actor
+from models.requirement import ActionRequirement, HappenedRequirement
+
+class RequirementWatcher:
+    """Checks the HappenedRequirements of a game for each character only when something they read has changed.
+    After a requirement is checked for a character the pair is filed under every object it read (see ActionRequirement.dependencies),
+    a change to one of those (reported through the ChangeLog) makes the pair pending again and check only checks the pending pairs.
+    Requirements that don't know what they read are checked every turn.
+    """
+
+    def __init__(self, requirements:list[ActionRequirement], characters:list['Actor']):
+        # both lists are watched as they are, rooms loaded later add their requirements to it
+        self.requirements = requirements
+        self.characters   = characters
+        self.seen         = (list[ActionRequirement](), list['Actor']()) # the lists as they were last synced
+        self.known        = dict[HappenedRequirement,None]()
+        self.known_characters = dict['Actor',None]()
+        self.watching     = dict[object,set[tuple[HappenedRequirement,'Actor']]]() # object -> the pairs that read it
+        self.pending      = dict[tuple[HappenedRequirement,'Actor'],None]()        # in the order they became pending
+        self.polled       = list[tuple[HappenedRequirement,'Actor']]()
+        self.checks       = 0
+
+    def changed(self, changed:object) -> None:
+        for pair in self.watching.pop(changed, ()):
+            self.pending[pair] = None
+
+    def __sync(self) -> None:
+        requirements = dict[HappenedRequirement,None].fromkeys([requirement for requirement in self.requirements if isinstance(requirement, HappenedRequirement)])
+        characters   = dict['Actor',None].fromkeys(self.characters)
+        new_requirements = [requirement for requirement in requirements if requirement not in self.known]
+        new_characters   = [character for character in characters if character not in self.known_characters]
+        for requirement in new_requirements:
+            for character in characters:
+                self.pending[(requirement, character)] = None
+        for character in new_characters:
+            for requirement in requirements:
+                self.pending[(requirement, character)] = None
+        self.known, self.known_characters = requirements, characters
+        self.seen = (list(self.requirements), list(self.characters))
+
+    def check(self) -> None:
+        """Checks the pending pairs (and the ones that can't be watched), the ones that happened are left alone from then on"""
+        if self.seen != (self.requirements, self.characters):
+            self.__sync()
+        pairs = list(self.pending.keys()) + self.polled
+        self.pending, self.polled = dict[tuple[HappenedRequirement,'Actor'],None](), list[tuple[HappenedRequirement,'Actor']]()
+        for pair in pairs:
+            requirement, character = pair
+            if requirement not in self.known or character not in self.known_characters or character in requirement.already_happened:
+                continue
+            self.checks += 1
+            requirement._check_every_turn(character)
+            if character in requirement.already_happened:
+                continue
+            dependencies = requirement.requirement.dependencies(character)
+            if dependencies is None:
+                self.polled.append(pair)
+                continue
+            for dependency in dependencies:
+                self.watching.setdefault(dependency, set[tuple[HappenedRequirement,'Actor']]()).add(pair)
@@ -0,0 +1,108 @@
+from collections import OrderedDict, deque
+
+from models.named  import Direction
+from models.actors import Actor, Location, Path, SingleEndPath
+
+class RoomGraph:
+    """Which rooms lead to which through their paths, for shortest route and distance questions.
+    The exits of a room are read once (again when the RoomPager builds it again) and everything reachable from a start is searched once per actor.
+    Paths anyone can always take are the same for everyone, the others are locks: what each one read for an actor is kept with its version,
+    and the routes of that actor are only searched again once a lock they met opens, shuts or leads somewhere else.
+    GameState doesn't keep one, whatever needs routes (a route finding NPC, a "go to" command) builds its own.
+    """
+
+    def __init__(self, *, max_routes:int=64):
+        # room -> (version it was read at, its exits as (direction, path, whether it is a lock, where it always leads when it isn't))
+        self.exits  = dict[Location,tuple[int,list[tuple[Direction,Path,bool,Location|None]]]]()
+        # (actor, start) -> room -> (distance, direction taken into it, room it was entered from), least recently used first
+        self.routes = OrderedDict[tuple[Actor,Location],dict[Location,tuple[int,Direction|None,Location|None]]]()
+        self.locks  = dict[Actor,dict[Path,tuple[Location|None,tuple|None]]]() # actor -> lock -> (where it takes them, what it read and the versions)
+        self.max_routes = max_routes
+        self.searches   = 0
+
+    def get_distances(self, actor:Actor, start:Location) -> dict[Location,int]:
+        return {room: found[0] for room, found in self.__routes(actor, start).items()}
+
+    def get_distance(self, actor:Actor, start:Location, end:Location) -> int|None:
+        found = self.__routes(actor, start).get(end, None)
+        return None if found is None else found[0]
+
+    def get_route(self, actor:Actor, start:Location, end:Location) -> list[tuple[Direction,Location]]|None:
+        """The directions actor can go from start to get to end the quickest with the room each of them leads to, None when end can't be reached"""
+        routes = self.__routes(actor, start)
+        if end not in routes:
+            return None
+        route = list[tuple[Direction,Location]]()
+        _, direction, previous = routes[end]
+        while previous is not None:
+            route.append((direction, end))
+            end = previous
+            _, direction, previous = routes[end]
+        route.reverse()
+        return route
+
+    def forget(self, actor:Actor) -> None:
+        for key in [key for key in self.routes.keys() if key[0] == actor]:
+            del self.routes[key]
+        self.locks.pop(actor, None)
+
+    def __exits(self, room:Location) -> list[tuple[Direction,Path,bool,Location|None]]:
+        known = self.exits.get(room, None)
+        if known is None or known[0] != room.version:
+            exits = list[tuple[Direction,Path,bool,Location|None]]() # reading the paths builds the room if it isn't yet, which changes its version
+            for direction, path in room.paths.items():
+                if isinstance(path, SingleEndPath) and len(path.passing_requirements) == 0 and not path._visibility_varies():
+                    exits.append((direction, path, False, None if path.hidden else path.end))
+                else:
+                    exits.append((direction, path, True, None))
+            known = self.exits[room] = (room.version, exits)
+        return known[1]
+
+    def __end(self, actor:Actor, path:Path) -> Location|None:
+        """Where the lock path takes actor, None when they can't take it"""
+        known = self.locks.get(actor, {}).get(path, None)
+        if known is not None and known[1] is not None and all([needed.version == version for needed, version in known[1]]):
+            return known[0]
+        return self.__open(actor, path)
+
+    def __open(self, actor:Actor, path:Path) -> Location|None:
+        end = path.get_end(actor) if path.is_visible_to(actor) and path.can_pass(actor)[0] else None
+        visibility, passing = path._visibility_dependencies(actor), path._passing_dependencies(actor)
+        read = None if visibility is None or passing is None else tuple([(needed, needed.version) for needed in visibility + passing])
+        self.locks.setdefault(actor, dict[Path,tuple[Location|None,tuple|None]]())[path] = (end, read)
+        return end
+
+    def __check_locks(self, actor:Actor) -> None:
+        for path, (end, read) in list(self.locks.get(actor, {}).items()):
+            if read is not None and all([needed.version == version for needed, version in read]):
+                continue
+            if self.__open(actor, path) != end:
+                self.forget(actor)
+                return
+
+    def __search(self, actor:Actor, start:Location) -> dict[Location,tuple[int,Direction|None,Location|None]]:
+        self.searches += 1
+        found = {start: (0, None, None)}
+        to_visit = deque[Location]([start])
+        while len(to_visit) > 0:
+            room = to_visit.popleft()
+            distance = found[room][0] + 1
+            for direction, path, lock, end in self.__exits(room):
+                if lock:
+                    end = self.__end(actor, path)
+                if end is not None and end not in found:
+                    found[end] = (distance, direction, room)
+                    to_visit.append(end)
+        return found
+
+    def __routes(self, actor:Actor, start:Location) -> dict[Location,tuple[int,Direction|None,Location|None]]:
+        self.__check_locks(actor)
+        key = (actor, start)
+        routes = self.routes.get(key, None)
+        if routes is None:
+            routes = self.routes[key] = self.__search(actor, start)
+            if len(self.routes) > self.max_routes:
+                self.routes.popitem(last=False)
+        else:
+            self.routes.move_to_end(key)
+        return routes